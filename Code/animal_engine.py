@@ -0,0 +1,254 @@
+# animal_engine.py
+# Motor de animales en arreglos paralelos (struct-of-arrays): todos los
+# animales de una escena se guardan como columnas NumPy (posición, dirección,
+# vida, temporizadores, especie) y cada tick corre pasadas vectorizadas de
+# deambular, persecución, ataque y muerte. Misma lógica que Animal.update,
+# pensado para miles de animales por escena.
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import random
+
+from animals import LOS_MEMORY, Animal, AnimalSpec, draw_animal
+from sim_types import Vec2
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # sin NumPy se usa la ruta por objetos de AnimalManager
+    np = None
+
+# Columnas del estado: (nombre, tipo, valor vacío)
+_FIELDS: List[Tuple[str, str, object]] = [
+    ("x", "float", 0.0),
+    ("y", "float", 0.0),
+    ("px", "float", 0.0),         # posición del tick anterior (interpolación)
+    ("py", "float", 0.0),
+    ("dx", "float", 0.0),         # dirección de deambular
+    ("dy", "float", 0.0),
+    ("hp", "float", 0.0),
+    ("wander_t", "float", 0.0),
+    ("attack_t", "float", 0.0),
+    ("alert_t", "float", 0.0),    # memoria de la última vez que vio al jugador
+    ("spec", "int", 0),           # índice en AnimalEngine.specs
+]
+
+
+class AnimalEngine:
+    """
+    Animales de una escena como columnas. Las filas [0, count) están todas
+    vivas: los muertos se compactan al final de cada pasada de daño, así que
+    el índice de fila de un animal puede cambiar.
+    """
+
+    def __init__(self, capacity: int = 64, seed: Optional[int] = None) -> None:
+        if np is None:
+            raise ImportError("[animal_engine] AnimalEngine requiere NumPy")
+        self.capacity = 0
+        self.count = 0
+        self.specs: List[AnimalSpec] = []
+        self._spec_code: Dict[int, int] = {}   # id(spec) -> índice
+        self._tables_dirty = True
+        # RNG propio sembrado desde el global: deterministas con la semilla de Game
+        self._rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+        self._grow(max(1, capacity))
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ----- Alta -----
+
+    def add(self, spec: AnimalSpec, pos: Vec2, hp: Optional[float] = None) -> int:
+        """Agrega un animal y devuelve su fila actual."""
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        self.x[i] = self.px[i] = pos.x
+        self.y[i] = self.py[i] = pos.y
+        self.dx[i] = self.dy[i] = 0.0
+        self.hp[i] = spec.max_hp if hp is None else hp
+        self.wander_t[i] = 0.0
+        self.attack_t[i] = 0.0
+        self.alert_t[i] = 0.0
+        self.spec[i] = self._code_for(spec)
+        return i
+
+    def add_animal(self, animal: Animal) -> int:
+        """Pasa un Animal existente (p. ej. de la ruta por objetos) al motor."""
+        return self.add(animal.spec, animal.pos, animal.hp)
+
+    # ----- Simulación -----
+
+    def update(self, dt: float, player_pos: Vec2, flow: Any = None, los: Any = None) -> List[float]:
+        """
+        Un tick para todos; devuelve los daños al jugador (uno por golpe).
+        Con 'flow' (FlowField) los que persiguen siguen el campo de flujo; con
+        'los' (LineOfSight) solo persiguen los que ven al jugador (una consulta
+        en lote para los hostiles en rango).
+        """
+        n = self.count
+        if n == 0:
+            return []
+        self._ensure_tables()
+        x, y = self.x[:n], self.y[:n]
+        dx, dy = self.dx[:n], self.dy[:n]
+        sp = self.spec[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+
+        tdx = player_pos.x - x
+        tdy = player_pos.y - y
+        dist = np.hypot(tdx, tdy)
+        chase = ~self._t_friendly[sp] & (dist <= self._t_detect[sp])
+        # La memoria se consume siempre; solo verlo dentro del rango la renueva
+        al = self.alert_t[:n]
+        np.subtract(al, dt, out=al, where=al > 0.0)
+        if los is not None:
+            ri = np.flatnonzero(chase)
+            if ri.size:
+                seen = np.array(los.visible_many(x[ri].tolist(), y[ri].tolist(),
+                                                 player_pos.x, player_pos.y), dtype=np.bool_)
+                al[ri[seen]] = LOS_MEMORY
+                unseen = ri[~seen]
+                chase[unseen[al[unseen] <= 0.0]] = False
+
+        # Deambular: amistosos y hostiles que no ven al jugador
+        wi = np.flatnonzero(~chase)
+        if wi.size:
+            wt = self.wander_t
+            wt[wi] -= dt
+            re = wi[wt[wi] <= 0.0]
+            if re.size:
+                rng = self._rng
+                wt[re] = 0.8 + rng.integers(0, 121, re.size) / 100.0  # 0.8..2.0 s
+                dx[re] = rng.integers(-100, 101, re.size) / 100.0
+                dy[re] = rng.integers(-100, 101, re.size) / 100.0
+            step = self._t_speed[sp[wi]] * (0.45 * dt)
+            x[wi] += dx[wi] * step
+            y[wi] += dy[wi] * step
+
+        ci = np.flatnonzero(chase)
+        if ci.size == 0:
+            return []
+
+        # Persecución: avanza hacia el jugador sin pasarse
+        d = dist[ci]
+        step = self._t_speed[sp[ci]] * dt
+        f = np.where(d > 1e-2, np.minimum(step / np.maximum(d, 1e-9), 1.0), 0.0)
+        mx = tdx[ci] * f
+        my = tdy[ci] * f
+        if flow is not None:
+            # Pocos persiguen a la vez: la consulta al campo es por animal
+            for k, (ax, ay) in enumerate(zip(x[ci].tolist(), y[ci].tolist())):
+                fdir = flow.direction(ax, ay)
+                if fdir is not None:
+                    mx[k] = fdir[0] * step[k]
+                    my[k] = fdir[1] * step[k]
+        x[ci] += mx
+        y[ci] += my
+
+        # Ataque: enfriamiento solo corre dentro del rango (distancia previa al paso)
+        at = self.attack_t
+        in_range = d <= self._t_attack[sp[ci]]
+        at[ci[~in_range]] = 0.0
+        ai = ci[in_range]
+        if ai.size == 0:
+            return []
+        at[ai] -= dt
+        hit = ai[at[ai] <= 0.0]
+        if hit.size == 0:
+            return []
+        s = sp[hit]
+        at[hit] = np.maximum(0.2, self._t_cooldown[s])
+        dmg = np.maximum(0.0, self._t_dps[s])
+        return dmg[dmg > 0.0].tolist()
+
+    def damage_in_radius(self, center: Vec2, radius: float, damage: float) -> int:
+        """Daño a los animales en el radio; los muertos se retiran. Devuelve impactos."""
+        n = self.count
+        if n == 0:
+            return 0
+        self._ensure_tables()
+        reach = radius + self._t_size[self.spec[:n]] * 0.5
+        hit = np.hypot(self.x[:n] - center.x, self.y[:n] - center.y) <= reach
+        hits = int(np.count_nonzero(hit))
+        if hits:
+            self.hp[:n][hit] -= max(0.0, damage)
+            self.remove_dead()
+        return hits
+
+    def remove_dead(self) -> int:
+        """Compacta las filas con hp <= 0. Devuelve cuántos se retiraron."""
+        n = self.count
+        keep = self.hp[:n] > 0.0
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return 0
+        for name, _, _ in _FIELDS:
+            col = getattr(self, name)
+            col[:k] = col[:n][keep]
+        self.count = k
+        return n - k
+
+    # ----- Consultas / dibujo -----
+
+    def positions(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Vistas (x, y) de las filas vivas (no modificar)."""
+        return self.x[:self.count], self.y[:self.count]
+
+    def to_animals(self) -> List[Animal]:
+        """Copia a objetos Animal (guardado, depuración)."""
+        out: List[Animal] = []
+        for i in range(self.count):
+            a = Animal(self.specs[int(self.spec[i])], Vec2(float(self.x[i]), float(self.y[i])))
+            a.hp = float(self.hp[i])
+            out.append(a)
+        return out
+
+    def draw(self, alpha: float = 1.0) -> None:
+        n = self.count
+        if n == 0:
+            return
+        xs = self.px[:n] + (self.x[:n] - self.px[:n]) * alpha
+        ys = self.py[:n] + (self.y[:n] - self.py[:n]) * alpha
+        specs = self.specs
+        for x, y, hp, s in zip(xs.tolist(), ys.tolist(), self.hp[:n].tolist(), self.spec[:n].tolist()):
+            draw_animal(specs[s], x, y, hp)
+
+    # ----- Internos -----
+
+    def _code_for(self, spec: AnimalSpec) -> int:
+        code = self._spec_code.get(id(spec))
+        if code is None:
+            code = len(self.specs)
+            self.specs.append(spec)
+            self._spec_code[id(spec)] = code
+            self._tables_dirty = True
+        return code
+
+    def _ensure_tables(self) -> None:
+        if not self._tables_dirty:
+            return
+        specs = self.specs
+        self._t_friendly = np.array([s.friendly for s in specs], dtype=np.bool_)
+        self._t_speed = np.array([s.speed for s in specs], dtype=np.float64)
+        self._t_detect = np.array([s.detect_range for s in specs], dtype=np.float64)
+        self._t_attack = np.array([s.attack_range for s in specs], dtype=np.float64)
+        self._t_dps = np.array([s.dps for s in specs], dtype=np.float64)
+        self._t_cooldown = np.array([s.hit_cooldown for s in specs], dtype=np.float64)
+        self._t_size = np.array([s.size for s in specs], dtype=np.float64)
+        self._tables_dirty = False
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name, kind, empty in _FIELDS:
+            dtype = np.float64 if kind == "float" else np.int64
+            col = np.full(extra, empty, dtype=dtype)
+            old = getattr(self, name, None)
+            setattr(self, name, col if old is None else np.concatenate((old, col)))
+        self.capacity = capacity
+
+
+# Exportar
+__all__ = ["AnimalEngine"]
@@ -0,0 +1,93 @@
+# animal_pool.py
+# Almacén de animales de una escena sin asignaciones en el bucle: la lista
+# 'active' es densa (solo índices [0, len)), los muertos se retiran con
+# swap-remove en el mismo lugar y sus objetos Animal pasan a una lista libre
+# que reutiliza el siguiente spawn. Lleva la marca de nivel máximo (high
+# water mark) para dimensionar y detectar fugas en sesiones largas. Cada
+# spawn recibe una fase propia (Animal.phase) que no cambia al compactar.
+from __future__ import annotations
+from typing import Dict, List
+
+from animals import Animal, AnimalSpec
+from sim_types import Vec2
+
+
+class AnimalPool:
+    """
+    Animales de una escena. El orden de 'active' cambia al compactar (el
+    último ocupa el hueco del muerto), así que no hay que guardar índices
+    ni escalonar por posición en la lista: para eso está Animal.phase.
+    """
+
+    __slots__ = ("active", "_free", "high_water", "created", "reused")
+
+    def __init__(self) -> None:
+        self.active: List[Animal] = []
+        self._free: List[Animal] = []
+        self.high_water = 0   # máximo de animales activos a la vez
+        self.created = 0      # objetos Animal construidos
+        self.reused = 0       # spawns servidos desde la lista libre
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
+
+    def spawn(self, spec: AnimalSpec, pos: Vec2) -> Animal:
+        """Activa un animal, reutilizando uno muerto si hay."""
+        if self._free:
+            a = self._free.pop()
+            a.reset(spec, pos)
+            self.reused += 1
+        else:
+            a = Animal(spec, pos)
+            self.created += 1
+        a.phase = self.created + self.reused   # número de spawn: fases consecutivas
+        act = self.active
+        act.append(a)
+        if len(act) > self.high_water:
+            self.high_water = len(act)
+        return a
+
+    def alive_count(self) -> int:
+        n = 0
+        for a in self.active:
+            if a.alive:
+                n += 1
+        return n
+
+    def compact(self) -> int:
+        """Retira los muertos con swap-remove (sin listas nuevas). Devuelve cuántos."""
+        act = self.active
+        free = self._free
+        removed = 0
+        i = 0
+        while i < len(act):
+            a = act[i]
+            if a.alive:
+                i += 1
+                continue
+            last = act.pop()
+            if last is not a:
+                act[i] = last   # se revisa 'last' en la misma posición
+            free.append(a)
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": len(self.active),
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+# Exportar
+__all__ = ["AnimalPool"]
@@ -1,11 +1,31 @@
 # animal_spawns.py
 from __future__ import annotations
-from typing import Dict, List
-from random import randint, choices
-from pyray import *
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import random
 from animals import Animal, AnimalSpec
+from animal_engine import AnimalEngine, np
+from animal_pool import AnimalPool
+from herding import HerdParams, apply_herding, herd_grids, herd_params
+from population_model import PopulationModel
+from sim_types import Vec2, RGBA
+
+# Nivel de detalle de la IA por distancia al jugador (px de mundo).
+#   cerca: IA completa cada tick
+#   media: 1/LOD_MID_STRIDE de la población por tick, con dt escalado
+#   lejos: solo deambular grueso, 1/LOD_FAR_STRIDE por tick
+LOD_NEAR = 1400.0
+LOD_FAR = 3200.0
+LOD_MID_STRIDE = 4
+LOD_FAR_STRIDE = 30
+LOD_VIEW_MARGIN = 200.0     # margen sobre el radio visible de la cámara
+LOD_PLAYER_SPEED = 260.0    # velocidad máxima del jugador (sprint), para la guarda de detección
+HERD_STRIDE = 3             # la manada recalcula el rumbo de 1/HERD_STRIDE animales por tick
+
+# Las vacas se mueven en grupos más amplios y compactos
+_COW_HERD = {"radius": 130.0, "separation_dist": 40.0, "cohesion": 0.9, "alignment": 1.0}
 
 # Especies por bioma/escena (índice de escena +1)
+# "herd": True activa la manada (ver herding.HerdParams); un dict ajusta sus parámetros.
 # Orden de AnimalSpec: name, friendly, color, size, max_hp, speed, detect_range=0, attack_range=0, dps=0, hit_cooldown=0.8
 ANIMAL_TABLES: Dict[int, dict] = {
     1: {  # genérico
@@ -13,60 +33,139 @@ ANIMAL_TABLES: Dict[int, dict] = {
         "repeat_count": (2, 4),
         "species": {
             # amistosos (granja)
-            "hen":   {"w": 6, "spec": AnimalSpec("Gallina", True,  Color(230,230,180,255), 18, 30.0, 70.0)},
-            "chick": {"w": 4, "spec": AnimalSpec("Pollo",   True,  Color(255,245,180,255), 12, 18.0, 60.0)},
-            "duck":  {"w": 3, "spec": AnimalSpec("Pato",    True,  Color(180,210,230,255), 18, 26.0, 70.0)},
-            "pig":   {"w": 3, "spec": AnimalSpec("Cerdo",   True,  Color(225,170,170,255), 22, 40.0, 55.0)},
-            "cow":   {"w": 2, "spec": AnimalSpec("Vaca",    True,  Color(170,170,150,255), 26, 60.0, 50.0)},
+            "hen":   {"w": 6, "herd": True, "spec": AnimalSpec("Gallina", True,  RGBA(230,230,180,255), 18, 30.0, 70.0)},
+            "chick": {"w": 4, "spec": AnimalSpec("Pollo",   True,  RGBA(255,245,180,255), 12, 18.0, 60.0)},
+            "duck":  {"w": 3, "herd": True, "spec": AnimalSpec("Pato",    True,  RGBA(180,210,230,255), 18, 26.0, 70.0)},
+            "pig":   {"w": 3, "spec": AnimalSpec("Cerdo",   True,  RGBA(225,170,170,255), 22, 40.0, 55.0)},
+            "cow":   {"w": 2, "herd": _COW_HERD, "spec": AnimalSpec("Vaca",    True,  RGBA(170,170,150,255), 26, 60.0, 50.0)},
             # salvajes
-            "boar":  {"w": 2, "spec": AnimalSpec("Jabalí", False, Color(110,80,70,255),   22, 55.0, 85.0, detect_range=220.0, attack_range=30.0, dps=12.0, hit_cooldown=0.7)},
-            "wolf":  {"w": 1, "spec": AnimalSpec("Lobo",   False, Color(120,120,120,255), 20, 45.0, 110.0, detect_range=260.0, attack_range=32.0, dps=10.0, hit_cooldown=0.55)},
+            "boar":  {"w": 2, "spec": AnimalSpec("Jabalí", False, RGBA(110,80,70,255),   22, 55.0, 85.0, detect_range=220.0, attack_range=30.0, dps=12.0, hit_cooldown=0.7)},
+            "wolf":  {"w": 1, "spec": AnimalSpec("Lobo",   False, RGBA(120,120,120,255), 20, 45.0, 110.0, detect_range=260.0, attack_range=32.0, dps=10.0, hit_cooldown=0.55)},
         }
     },
     2: {  # Alaska
         "first_count":  (7, 11),
         "repeat_count": (2, 4),
         "species": {
-            "duck":  {"w": 5, "spec": AnimalSpec("Pato", True,  Color(180,210,230,255), 18, 26.0, 70.0)},
-            "hen":   {"w": 4, "spec": AnimalSpec("Gallina", True, Color(230,230,180,255), 18, 30.0, 70.0)},
-            "moose": {"w": 2, "spec": AnimalSpec("Alce", False, Color(120,90,60,255), 28, 90.0, 75.0, detect_range=260.0, attack_range=34.0, dps=14.0, hit_cooldown=0.9)},
-            "wolf":  {"w": 2, "spec": AnimalSpec("Lobo", False, Color(120,120,120,255), 20, 45.0, 110.0, detect_range=280.0, attack_range=32.0, dps=10.0, hit_cooldown=0.55)},
+            "duck":  {"w": 5, "herd": True, "spec": AnimalSpec("Pato", True,  RGBA(180,210,230,255), 18, 26.0, 70.0)},
+            "hen":   {"w": 4, "herd": True, "spec": AnimalSpec("Gallina", True, RGBA(230,230,180,255), 18, 30.0, 70.0)},
+            "moose": {"w": 2, "spec": AnimalSpec("Alce", False, RGBA(120,90,60,255), 28, 90.0, 75.0, detect_range=260.0, attack_range=34.0, dps=14.0, hit_cooldown=0.9)},
+            "wolf":  {"w": 2, "spec": AnimalSpec("Lobo", False, RGBA(120,120,120,255), 20, 45.0, 110.0, detect_range=280.0, attack_range=32.0, dps=10.0, hit_cooldown=0.55)},
         }
     },
     3: {  # PPR / praderas
         "first_count":  (6, 10),
         "repeat_count": (2, 4),
         "species": {
-            "cow":   {"w": 4, "spec": AnimalSpec("Vaca", True,  Color(170,170,150,255), 26, 60.0, 50.0)},
-            "pig":   {"w": 3, "spec": AnimalSpec("Cerdo", True, Color(225,170,170,255), 22, 40.0, 55.0)},
-            "hen":   {"w": 3, "spec": AnimalSpec("Gallina", True, Color(230,230,180,255), 18, 30.0, 70.0)},
-            "coyote":{"w": 2, "spec": AnimalSpec("Coyote", False, Color(150,120,90,255), 18, 40.0, 105.0, detect_range=240.0, attack_range=30.0, dps=9.0, hit_cooldown=0.6)},
+            "cow":   {"w": 4, "herd": _COW_HERD, "spec": AnimalSpec("Vaca", True,  RGBA(170,170,150,255), 26, 60.0, 50.0)},
+            "pig":   {"w": 3, "spec": AnimalSpec("Cerdo", True, RGBA(225,170,170,255), 22, 40.0, 55.0)},
+            "hen":   {"w": 3, "herd": True, "spec": AnimalSpec("Gallina", True, RGBA(230,230,180,255), 18, 30.0, 70.0)},
+            "coyote":{"w": 2, "spec": AnimalSpec("Coyote", False, RGBA(150,120,90,255), 18, 40.0, 105.0, detect_range=240.0, attack_range=30.0, dps=9.0, hit_cooldown=0.6)},
         }
     },
     4: {  # Michigan / bosques y lagos
         "first_count":  (7, 11),
         "repeat_count": (2, 4),
         "species": {
-            "duck":  {"w": 4, "spec": AnimalSpec("Pato", True, Color(180,210,230,255), 18, 26.0, 70.0)},
-            "hen":   {"w": 3, "spec": AnimalSpec("Gallina", True, Color(230,230,180,255), 18, 30.0, 70.0)},
-            "deer":  {"w": 3, "spec": AnimalSpec("Ciervo", False, Color(155,120,90,255), 20, 50.0, 95.0, detect_range=220.0, attack_range=28.0, dps=8.0, hit_cooldown=0.7)},
-            "bear":  {"w": 1, "spec": AnimalSpec("Oso", False, Color(95,70,55,255), 28, 120.0, 80.0, detect_range=260.0, attack_range=36.0, dps=16.0, hit_cooldown=1.0)},
+            "duck":  {"w": 4, "herd": True, "spec": AnimalSpec("Pato", True, RGBA(180,210,230,255), 18, 26.0, 70.0)},
+            "hen":   {"w": 3, "herd": True, "spec": AnimalSpec("Gallina", True, RGBA(230,230,180,255), 18, 30.0, 70.0)},
+            "deer":  {"w": 3, "spec": AnimalSpec("Ciervo", False, RGBA(155,120,90,255), 20, 50.0, 95.0, detect_range=220.0, attack_range=28.0, dps=8.0, hit_cooldown=0.7)},
+            "bear":  {"w": 1, "spec": AnimalSpec("Oso", False, RGBA(95,70,55,255), 28, 120.0, 80.0, detect_range=260.0, attack_range=36.0, dps=16.0, hit_cooldown=1.0)},
         }
     },
 }
 
+# Mayor detect_range de las tablas (radio que debe cubrir el campo de flujo)
+MAX_DETECT_RANGE: float = max(
+    e["spec"].detect_range for tbl in ANIMAL_TABLES.values() for e in tbl["species"].values()
+)
+
+class EnterPlan(NamedTuple):
+    """Resultado de prepare_enter: altas (especie, posición) y bajas por especie."""
+    spawns: List[Tuple[AnimalSpec, Vec2]]
+    culls: Dict[str, int]
+
+
 class AnimalManager:
-    def __init__(self) -> None:
-        self.animals_by_scene: Dict[int, List[Animal]] = {}
+    def __init__(self, use_engine: bool = False) -> None:
+        # Un AnimalPool por escena: lista densa + reutilización de muertos
+        self.pools: Dict[int, AnimalPool] = {}
         self.visited: Dict[int, int] = {}
+        # Con use_engine cada escena se simula en un AnimalEngine (NumPy)
+        if use_engine and np is None:
+            print("[animal_spawns] Aviso: NumPy no disponible, se usan objetos Animal")
+        self.use_engine = use_engine and np is not None
+        self.engines: Dict[int, AnimalEngine] = {}
+        # LOD de IA (ruta por objetos)
+        self.lod_near = LOD_NEAR
+        self.lod_far = LOD_FAR
+        self.lod_mid_stride = LOD_MID_STRIDE
+        self.lod_far_stride = LOD_FAR_STRIDE
+        self.lod_counts = [0, 0, 0]   # animales en cada nivel en el último tick
+        # Manadas (ruta por objetos): parámetros y rejilla de vecinos por id(spec)
+        self.herd_params: Dict[int, HerdParams] = {}
+        for tbl in ANIMAL_TABLES.values():
+            for entry in tbl["species"].values():
+                hp = herd_params(entry)
+                if hp is not None:
+                    self.herd_params[id(entry["spec"])] = hp
+        self._herd_grids = herd_grids(self.herd_params)
+        self.herd_stride = HERD_STRIDE
+        self._herd_members: List[Animal] = []
+        # Población agregada de las escenas inactivas (ver population_model)
+        self.population = PopulationModel()
+        self._species_key: Dict[int, str] = {
+            id(e["spec"]): key for tbl in ANIMAL_TABLES.values() for key, e in tbl["species"].items()
+        }
+        self._herd_scratch: List[Animal] = []
+        self._damages: List[float] = []
+        self._tick = 0
 
-    def _random_inside(self, scene_size: Vector2, polygon=None) -> Vector2:
+    def _engine(self, scene_id: int) -> Optional[AnimalEngine]:
+        if not self.use_engine:
+            return None
+        eng = self.engines.get(scene_id)
+        if eng is None:
+            eng = self.engines[scene_id] = AnimalEngine()
+        return eng
+
+    def _pool(self, scene_id: int) -> AnimalPool:
+        pool = self.pools.get(scene_id)
+        if pool is None:
+            pool = self.pools[scene_id] = AnimalPool()
+        return pool
+
+    def animals(self, scene_id: int) -> List[Animal]:
+        """Animales activos de la escena (lista viva del pool, no modificar)."""
+        pool = self.pools.get(scene_id)
+        return pool.active if pool is not None else []
+
+    def alive_count(self, scene_id: int) -> int:
+        eng = self.engines.get(scene_id)
+        if eng is not None:
+            return eng.count
+        pool = self.pools.get(scene_id)
+        return pool.alive_count() if pool is not None else 0
+
+    def pool_report(self) -> str:
+        """Resumen por escena: activos, libres, máximo histórico y reutilizaciones."""
+        parts = []
+        for sid in sorted(self.pools):
+            st = self.pools[sid].stats()
+            parts.append(f"escena {sid}: {st['active']} activos, {st['free']} libres, "
+                         f"máx {st['high_water']}, creados {st['created']}, reusados {st['reused']}")
+        for sid in sorted(self.engines):
+            eng = self.engines[sid]
+            parts.append(f"escena {sid} (motor): {eng.count} activos, capacidad {eng.capacity}")
+        return "; ".join(parts) if parts else "sin animales"
+
+    def _random_inside(self, scene_size: Vec2, polygon=None, rng: Any = random) -> Vec2:
         # muestreo por rechazo simple si hay polígono
         for _ in range(400):
-            x = randint(20, int(scene_size.x) - 20)
-            y = randint(20, int(scene_size.y) - 20)
+            x = rng.randint(20, int(scene_size.x) - 20)
+            y = rng.randint(20, int(scene_size.y) - 20)
             if not polygon:
-                return Vector2(x, y)
+                return Vec2(x, y)
             # punto dentro del polígono (ray casting simple)
             inside = False
             n = len(polygon)
@@ -78,55 +177,206 @@ class AnimalManager:
                 if inter:
                     inside = not inside
             if inside:
-                return Vector2(x, y)
-        return Vector2(scene_size.x * 0.5, scene_size.y * 0.5)
+                return Vec2(x, y)
+        return Vec2(scene_size.x * 0.5, scene_size.y * 0.5)
 
-    def _roll_species(self, scene_id: int, count: int) -> List[AnimalSpec]:
+    def species_for(self, scene_id: int) -> List[AnimalSpec]:
+        """Especies que pueden aparecer en la escena (según su tabla)."""
+        tbl = ANIMAL_TABLES.get(scene_id, ANIMAL_TABLES[1])
+        return [e["spec"] for e in tbl["species"].values()]
+
+    def _roll_species(self, scene_id: int, count: int, rng: Any = random) -> List[AnimalSpec]:
         tbl = ANIMAL_TABLES.get(scene_id, ANIMAL_TABLES[1])
         entries = list(tbl["species"].values())
         weights = [e["w"] for e in entries]
         specs = [e["spec"] for e in entries]
-        picked = choices(specs, weights=weights, k=max(0, count))
+        picked = rng.choices(specs, weights=weights, k=max(0, count))
         return picked
 
-    def on_enter_scene(self, scene_id: int, scene_size: Vector2, polygon=None) -> None:
-        times = self.visited.get(scene_id, 0)
-        first = times == 0
-        self.visited[scene_id] = times + 1
-        lst = self.animals_by_scene.setdefault(scene_id, [])
-        existing = len([a for a in lst if a.alive])
+    def species_counts(self, scene_id: int) -> Dict[str, int]:
+        """Animales vivos de la escena por clave de especie ("hen", "wolf", ...)."""
+        counts: Dict[str, int] = {}
+        keys = self._species_key
+        eng = self.engines.get(scene_id)
+        if eng is not None:
+            if eng.count:
+                per_code = np.bincount(eng.spec[:eng.count], minlength=len(eng.specs))
+                for code, n in enumerate(per_code.tolist()):
+                    if n:
+                        key = keys.get(id(eng.specs[code]), eng.specs[code].name)
+                        counts[key] = counts.get(key, 0) + n
+            return counts
+        for a in self.animals(scene_id):
+            if a.alive:
+                key = keys.get(id(a.spec), a.spec.name)
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def on_leave_scene(self, scene_id: int, now: float) -> None:
+        """Congela la población de la escena que se deja ('now' en días de juego)."""
+        if self.visited.get(scene_id, 0) > 0:
+            self.population.freeze(scene_id, self.species_counts(scene_id), now)
+
+    def on_enter_scene(self, scene_id: int, scene_size: Vec2, polygon=None,
+                       now: Optional[float] = None) -> None:
+        self.commit_enter(scene_id, self.prepare_enter(scene_id, scene_size, polygon, now=now))
 
+    def prepare_enter(self, scene_id: int, scene_size: Vec2, polygon=None,
+                      rng: Any = random, now: Optional[float] = None) -> EnterPlan:
+        """
+        Altas y bajas al entrar, sin modificar el estado (apto para el hilo de
+        carga). Si la escena tiene población congelada y se da 'now' (días de
+        juego), se proyecta el modelo agregado; si no, se repone con las
+        tablas. Los Animal salen del pool en commit_enter.
+        """
+        first = self.visited.get(scene_id, 0) == 0
         tbl = ANIMAL_TABLES.get(scene_id, ANIMAL_TABLES[1])
-        rng = tbl["first_count"] if first else tbl["repeat_count"]
-        target = randint(rng[0], rng[1])
-        to_add = max(0, target - existing)
+
+        projected = None if first or now is None else self.population.project(scene_id, now, tbl)
+        if projected is not None:
+            current = self.species_counts(scene_id)
+            spawns: List[Tuple[AnimalSpec, Vec2]] = []
+            culls: Dict[str, int] = {}
+            for key, value in projected.items():
+                diff = value - current.get(key, 0)
+                if diff > 0:
+                    spec = tbl["species"][key]["spec"]
+                    spawns.extend((spec, self._random_inside(scene_size, polygon, rng)) for _ in range(diff))
+                elif diff < 0:
+                    culls[key] = -diff
+            return EnterPlan(spawns, culls)
+
+        rng_count = tbl["first_count"] if first else tbl["repeat_count"]
+        target = rng.randint(rng_count[0], rng_count[1])
+        to_add = max(0, target - self.alive_count(scene_id))
         if to_add <= 0:
+            return EnterPlan([], {})
+        return EnterPlan([(spec, self._random_inside(scene_size, polygon, rng))
+                          for spec in self._roll_species(scene_id, to_add, rng)], {})
+
+    def commit_enter(self, scene_id: int, plan: EnterPlan) -> None:
+        """Registra la visita y aplica lo calculado por prepare_enter."""
+        self.visited[scene_id] = self.visited.get(scene_id, 0) + 1
+        self.population.discard(scene_id)   # vuelve a simularse individuo por individuo
+        spawns, culls = plan
+        keys = self._species_key
+        eng = self._engine(scene_id)
+        if eng is not None:
+            if culls:
+                left = dict(culls)
+                for i in range(eng.count):
+                    spec = eng.specs[int(eng.spec[i])]
+                    key = keys.get(id(spec), spec.name)
+                    if left.get(key, 0) > 0:
+                        eng.hp[i] = 0.0
+                        left[key] -= 1
+                eng.remove_dead()
+            for spec, pos in spawns:
+                eng.add(spec, pos)
             return
+        pool = self._pool(scene_id)
+        if culls:
+            left = dict(culls)
+            for a in pool.active:
+                key = keys.get(id(a.spec), a.spec.name)
+                if a.alive and left.get(key, 0) > 0:
+                    a.alive = False
+                    left[key] -= 1
+        pool.compact()   # caídos y bajas vuelven a la lista libre
+        for spec, pos in spawns:
+            pool.spawn(spec, pos)
 
-        for spec in self._roll_species(scene_id, to_add):
-            pos = self._random_inside(scene_size, polygon)
-            lst.append(Animal(spec, pos))
+    def update(self, scene_id: int, dt: float, player_pos: Vec2, view_radius: float = 0.0,
+               flow: Any = None, los: Any = None) -> List[float]:
+        """
+        Actualiza y devuelve daños al jugador (lista por golpe, reutilizada:
+        válida hasta la siguiente llamada). La IA va por
+        niveles de distancia (ver LOD_*); 'view_radius' es el radio visible de
+        la cámara, que siempre corre a tasa completa. 'flow' es el FlowField
+        de la escena para perseguir rodeando obstáculos y 'los' su
+        LineOfSight (los hostiles solo detectan al jugador si lo ven).
+        """
+        eng = self.engines.get(scene_id)
+        if eng is not None:
+            return eng.update(dt, player_pos, flow, los)
+        pool = self.pools.get(scene_id)
+        if pool is None:
+            return []
+        lst = pool.active
+        damages = self._damages
+        damages.clear()
+        self._tick += 1
+        tick = self._tick
+
+        near = max(self.lod_near, view_radius + LOD_VIEW_MARGIN)
+        near2 = near * near
+        far2 = max(self.lod_far, near) ** 2
+        mid_n, far_n = self.lod_mid_stride, self.lod_far_stride
+        mid_phase, far_phase = tick % mid_n, tick % far_n
+        # Acercamiento máximo entre actualizaciones de nivel medio
+        closing = LOD_PLAYER_SPEED * dt * mid_n
+        px, py = player_pos.x, player_pos.y
+        n_near = n_mid = n_far = 0
+        any_dead = False
+        herd = self.herd_params
+        members = self._herd_members
+        members.clear()
 
-    def update(self, scene_id: int, dt: float, player_pos: Vector2) -> List[float]:
-        """Actualiza y devuelve daños al jugador (lista por golpe)."""
-        lst = self.animals_by_scene.get(scene_id, [])
-        damages: List[float] = []
         for a in lst:
-            hit, dmg = a.update(dt, player_pos)
+            if not a.alive:
+                any_dead = True
+                continue
+            dx = a.pos.x - px
+            dy = a.pos.y - py
+            d2 = dx*dx + dy*dy
+            if d2 > near2:
+                spec = a.spec
+                # Guarda de detección: un hostil que podría entrar en su
+                # detect_range antes de su próxima actualización va a tasa completa
+                guard = spec.detect_range + spec.speed * dt * mid_n + closing
+                if spec.friendly or d2 > guard * guard:
+                    if d2 <= far2:
+                        n_mid += 1
+                        if a.phase % mid_n == mid_phase:
+                            a.update(dt * mid_n, player_pos)  # fuera de rango de ataque
+                            a.prev.x, a.prev.y = a.pos.x, a.pos.y  # fuera de cámara: sin interpolar
+                    else:
+                        n_far += 1
+                        if a.phase % far_n == far_phase:
+                            a.drift(dt * far_n)
+                    continue
+            n_near += 1
+            hit, dmg = a.update(dt, player_pos, flow, los)
             if hit and dmg > 0:
                 damages.append(dmg)
-        # elimina caídos
-        self.animals_by_scene[scene_id] = [a for a in lst if a.alive]
+            if herd and id(a.spec) in herd:
+                members.append(a)
+
+        self.lod_counts[0], self.lod_counts[1], self.lod_counts[2] = n_near, n_mid, n_far
+        # Manada: el rumbo nuevo se usa en el próximo tick (solo nivel cercano)
+        if members:
+            apply_herding(members, herd, self._herd_grids, dt, self._herd_scratch,
+                          self.herd_stride, tick)
+        # retira caídos en el mismo lugar (el orden cambia, ver AnimalPool)
+        if any_dead:
+            pool.compact()
         return damages
 
-    def draw(self, scene_id: int) -> None:
-        for a in self.animals_by_scene.get(scene_id, []):
-            a.draw()
+    def draw(self, scene_id: int, alpha: float = 1.0) -> None:
+        eng = self.engines.get(scene_id)
+        if eng is not None:
+            eng.draw(alpha)
+            return
+        for a in self.animals(scene_id):
+            a.draw(alpha)
 
-    def damage_in_radius(self, scene_id: int, center: Vector2, radius: float, damage: float) -> int:
+    def damage_in_radius(self, scene_id: int, center: Vec2, radius: float, damage: float) -> int:
         """Aplica daño a animales en un radio y devuelve cuántos impactó."""
+        eng = self.engines.get(scene_id)
+        if eng is not None:
+            return eng.damage_in_radius(center, radius, damage)
         hit = 0
-        for a in self.animals_by_scene.get(scene_id, []):
+        for a in self.animals(scene_id):
             if not a.alive:
                 continue
             dx = a.pos.x - center.x
@@ -1,14 +1,21 @@
 # animals.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Tuple
-from pyray import *
+from typing import Any, Dict, Iterable, Tuple
+import random
+
+from sim_types import Vec2, RGBA, Rect, to_color
+
+try:
+    from pyray import *  # solo para dibujar
+except ImportError:
+    pass
 
 @dataclass
 class AnimalSpec:
     name: str
     friendly: bool
-    color: Color
+    color: RGBA
     size: int
     max_hp: float
     speed: float
@@ -17,22 +24,40 @@ class AnimalSpec:
     dps: float = 0.0            # daño por golpe (discreto)
     hit_cooldown: float = 0.8   # intervalo entre golpes
 
+# Segundos que un hostil sigue persiguiendo tras perder de vista al jugador
+LOS_MEMORY = 1.5
+
 class Animal:
     """Entidad animal muy liviana (rectángulo e IA básica)."""
-    __slots__ = ("spec","pos","hp","_wander_t","_attack_t","_dir","alive")
+    __slots__ = ("spec","pos","prev","hp","_wander_t","_attack_t","_alert_t","_dir","alive","phase")
 
-    def __init__(self, spec: AnimalSpec, pos: Vector2) -> None:
+    def __init__(self, spec: AnimalSpec, pos: Vec2) -> None:
+        self.pos = Vec2(pos.x, pos.y)
+        self.prev = Vec2(pos.x, pos.y)  # posición del tick anterior
+        self._dir = Vec2(0.0, 0.0)
+        self.phase = 0   # fase fija para escalonar actualizaciones (la asigna AnimalPool)
+        self.reset(spec, pos)
+
+    def reset(self, spec: AnimalSpec, pos: Vec2) -> None:
+        """Reinicia el animal en 'pos' reutilizando sus vectores (ver AnimalPool)."""
         self.spec = spec
-        self.pos = Vector2(pos.x, pos.y)
+        self.pos.x, self.pos.y = pos.x, pos.y
+        self.prev.x, self.prev.y = pos.x, pos.y
         self.hp = spec.max_hp
         self._wander_t = 0.0
         self._attack_t = 0.0
-        self._dir = Vector2(0.0, 0.0)
+        self._alert_t = 0.0
+        self._dir.x = self._dir.y = 0.0
         self.alive = True
 
-    def aabb(self) -> Rectangle:
+    @property
+    def heading(self) -> Vec2:
+        """Rumbo de deambular (mutable: lo ajusta herding.apply_herding)."""
+        return self._dir
+
+    def aabb(self) -> Rect:
         s = self.spec.size
-        return Rectangle(self.pos.x - s/2, self.pos.y - s/2, s, s)
+        return (self.pos.x - s/2, self.pos.y - s/2, s, s)
 
     def take_damage(self, dmg: float) -> None:
         self.hp -= max(0.0, dmg)
@@ -43,14 +68,14 @@ class Animal:
         # Cambia de dirección cada cierto tiempo
         self._wander_t -= dt
         if self._wander_t <= 0:
-            self._wander_t = 0.8 + get_random_value(0, 120) / 100.0  # 0.8..2.0 s
-            self._dir = Vector2((get_random_value(-100,100))/100.0,
-                                (get_random_value(-100,100))/100.0)
+            self._wander_t = 0.8 + random.randint(0, 120) / 100.0  # 0.8..2.0 s
+            self._dir.x = random.randint(-100, 100) / 100.0
+            self._dir.y = random.randint(-100, 100) / 100.0
         sp = self.spec.speed * 0.45
         self.pos.x += self._dir.x * sp * dt
         self.pos.y += self._dir.y * sp * dt
 
-    def _move_towards(self, target: Vector2, dt: float, speed: float) -> None:
+    def _move_towards(self, target: Vec2, dt: float, speed: float) -> None:
         dx = target.x - self.pos.x
         dy = target.y - self.pos.y
         d2 = dx*dx + dy*dy
@@ -65,10 +90,23 @@ class Animal:
             self.pos.x += vx * step
             self.pos.y += vy * step
 
-    def update(self, dt: float, player_pos: Vector2) -> Tuple[bool, float]:
-        """Devuelve (hit_player, damage) si ataca al jugador este frame."""
+    def drift(self, dt: float) -> None:
+        """Movimiento grueso (LOD lejano): solo deambula, sin IA ni interpolación."""
+        if not self.alive:
+            return
+        self._wander(dt)
+        self.prev.x, self.prev.y = self.pos.x, self.pos.y
+
+    def update(self, dt: float, player_pos: Vec2, flow: Any = None, los: Any = None) -> Tuple[bool, float]:
+        """
+        Devuelve (hit_player, damage) si ataca al jugador este frame. Con
+        'flow' (FlowField) la persecución rodea costa y celdas bloqueadas; con
+        'los' (LineOfSight) solo detecta al jugador si lo ve (o lo vio hace
+        menos de LOS_MEMORY s).
+        """
         if not self.alive:
             return (False, 0.0)
+        self.prev.x, self.prev.y = self.pos.x, self.pos.y
 
         hit_player = False
         damage = 0.0
@@ -79,8 +117,20 @@ class Animal:
             dx = player_pos.x - self.pos.x
             dy = player_pos.y - self.pos.y
             dist = (dx*dx + dy*dy) ** 0.5
-            if dist <= self.spec.detect_range:
-                self._move_towards(player_pos, dt, self.spec.speed)
+            # La memoria se consume siempre; solo verlo dentro del rango la renueva
+            if self._alert_t > 0.0:
+                self._alert_t -= dt
+            if (dist <= self.spec.detect_range and los is not None
+                    and los.visible(self.pos.x, self.pos.y, player_pos.x, player_pos.y)):
+                self._alert_t = LOS_MEMORY
+            if dist <= self.spec.detect_range and (los is None or self._alert_t > 0.0):
+                fdir = flow.direction(self.pos.x, self.pos.y) if flow is not None else None
+                if fdir is None:
+                    self._move_towards(player_pos, dt, self.spec.speed)
+                else:
+                    step = self.spec.speed * dt
+                    self.pos.x += fdir[0] * step
+                    self.pos.y += fdir[1] * step
                 if dist <= self.spec.attack_range:
                     self._attack_t -= dt
                     if self._attack_t <= 0.0:
@@ -94,55 +144,111 @@ class Animal:
 
         return (hit_player, damage)
 
-    def draw(self) -> None:
+    def draw(self, alpha: float = 1.0) -> None:
         if not self.alive:
             return
-        s = self.spec.size
-
-        # sombra
-        draw_ellipse(int(self.pos.x), int(self.pos.y), int(s*0.45), int(s*0.18), Color(0,0,0,50))
-        # cuerpo
-        draw_rectangle(int(self.pos.x - s/2), int(self.pos.y - s/2), s, s, self.spec.color)
-        draw_rectangle_lines(int(self.pos.x - s/2), int(self.pos.y - s/2), s, s, BLACK)
-
-        # barra de vida
-        hp_bar_h = 4
-        if self.hp < self.spec.max_hp:
-            w = s
-            h = hp_bar_h
-            ratio = max(0.0, min(1.0, self.hp / self.spec.max_hp))
-            draw_rectangle(int(self.pos.x - w/2), int(self.pos.y - s/2 - h - 3), w, h, Color(30,30,30,170))
-            draw_rectangle(int(self.pos.x - w/2 + 1), int(self.pos.y - s/2 - h - 2), int((w-2)*ratio), h-2, Color(210,70,70,220))
-
-        # === Etiqueta con icono ===
-        fs = max(12, int(s * 0.8))
-        icon = "🐾" if self.spec.friendly else "⚔️"
-        label = f"{icon} {self.spec.name}"
-        text_w = measure_text(label, fs)
-        pad_x, pad_y = 6, 4
-        box_w = text_w + pad_x * 2
-        box_h = fs + pad_y * 2
-
-        top_of_body = int(self.pos.y - s/2)
-        top_of_hpbar = top_of_body - (hp_bar_h + 6) if self.hp < self.spec.max_hp else top_of_body
-        box_x = int(self.pos.x - box_w / 2)
-        box_y = top_of_hpbar - box_h - 6
-
-        back = Color(25, 60, 30, 180) if self.spec.friendly else Color(60, 30, 30, 180)
-        border = Color(0, 0, 0, 200)
-        fg = RAYWHITE
-
-        try:
-            draw_rectangle_rounded(Rectangle(box_x, box_y, box_w, box_h), 0.35, 8, back)
-            draw_rectangle_rounded_lines(Rectangle(box_x, box_y, box_w, box_h), 0.35, 8, 2, border)
-        except Exception:
-            draw_rectangle(box_x, box_y, box_w, box_h, back)
-            draw_rectangle_lines(box_x, box_y, box_w, box_h, border)
-
-        tx = box_x + (box_w - text_w) // 2
-        ty = box_y + (box_h - fs) // 2
-        draw_text(label, tx + 1, ty + 1, fs, Color(0,0,0,120))
-        draw_text(label, tx, ty, fs, fg)
+        # Interpolada entre ticks de simulación
+        x = self.prev.x + (self.pos.x - self.prev.x) * alpha
+        y = self.prev.y + (self.pos.y - self.prev.y) * alpha
+        draw_animal(self.spec, x, y, self.hp)
+
+
+def draw_animal(spec: AnimalSpec, x: float, y: float, hp: float) -> None:
+    """Dibuja un animal (cuerpo, vida y etiqueta) en (x, y). Lo usan Animal y AnimalEngine."""
+    s = spec.size
+
+    # sombra
+    draw_ellipse(int(x), int(y), int(s*0.45), int(s*0.18), Color(0,0,0,50))
+    # cuerpo
+    draw_rectangle(int(x - s/2), int(y - s/2), s, s, to_color(spec.color))
+    draw_rectangle_lines(int(x - s/2), int(y - s/2), s, s, BLACK)
+
+    # barra de vida
+    hp_bar_h = 4
+    if hp < spec.max_hp:
+        w = s
+        h = hp_bar_h
+        ratio = max(0.0, min(1.0, hp / spec.max_hp))
+        draw_rectangle(int(x - w/2), int(y - s/2 - h - 3), w, h, Color(30,30,30,170))
+        draw_rectangle(int(x - w/2 + 1), int(y - s/2 - h - 2), int((w-2)*ratio), h-2, Color(210,70,70,220))
+
+    # === Etiqueta con icono (textura pre-renderizada por especie) ===
+    tex = _label_texture(spec, _label_size(spec))
+    top_of_body = int(y - s/2)
+    top_of_hpbar = top_of_body - (hp_bar_h + 6) if hp < spec.max_hp else top_of_body
+    draw_texture(tex, int(x - tex.width / 2), top_of_hpbar - tex.height - 6, WHITE)
+
+
+# Etiquetas (icono + nombre) ya dibujadas: (nombre, amistoso, tamaño de fuente) -> textura.
+# Todas las instancias de una especie comparten la suya; requieren la ventana abierta.
+_LABELS: Dict[Tuple[str, bool, int], Any] = {}
+
+
+def _label_size(spec: AnimalSpec) -> int:
+    return max(12, int(spec.size * 0.8))
+
+
+def warm_label_textures(specs: Iterable[AnimalSpec]) -> int:
+    """
+    Crea las etiquetas que falten de 'specs' (sube texturas: solo en el hilo
+    principal, p. ej. encolado con SceneJob.on_main). Retorna cuántas creó.
+    """
+    made = 0
+    for spec in specs:
+        key = (spec.name, spec.friendly, _label_size(spec))
+        if key not in _LABELS:
+            _LABELS[key] = _render_label(spec.name, spec.friendly, key[2])
+            made += 1
+    return made
+
+
+def _label_texture(spec: AnimalSpec, fs: int) -> Any:
+    key = (spec.name, spec.friendly, fs)
+    tex = _LABELS.get(key)
+    if tex is None:
+        tex = _LABELS[key] = _render_label(spec.name, spec.friendly, fs)
+    return tex
+
+
+def _render_label(name: str, friendly: bool, fs: int) -> Any:
+    """Caja redondeada con borde, sombra y texto, dibujada una sola vez en una imagen."""
+    icon = "🐾" if friendly else "⚔️"
+    label = f"{icon} {name}"
+    text_w = measure_text(label, fs)
+    pad_x, pad_y = 6, 4
+    box_w = text_w + pad_x * 2
+    box_h = fs + pad_y * 2
+
+    back = Color(25, 60, 30, 180) if friendly else Color(60, 30, 30, 180)
+    border = Color(0, 0, 0, 200)
+    img = gen_image_color(box_w, box_h, BLANK)
+    radius = max(2, int(min(box_w, box_h) * 0.35 / 2))
+    # Borde de 2 px: caja exterior en color de borde y la interior encima
+    _image_rounded_box(img, 0, 0, box_w, box_h, radius, border)
+    _image_rounded_box(img, 2, 2, box_w - 4, box_h - 4, max(1, radius - 2), back)
+
+    tx = (box_w - text_w) // 2
+    ty = (box_h - fs) // 2
+    image_draw_text(img, label, tx + 1, ty + 1, fs, Color(0,0,0,120))
+    image_draw_text(img, label, tx, ty, fs, RAYWHITE)
+    tex = load_texture_from_image(img)
+    unload_image(img)
+    return tex
+
+
+def _image_rounded_box(img: Any, x: int, y: int, w: int, h: int, r: int, color: Any) -> None:
+    image_draw_rectangle(img, x + r, y, w - 2*r, h, color)
+    image_draw_rectangle(img, x, y + r, r, h - 2*r, color)
+    image_draw_rectangle(img, x + w - r, y + r, r, h - 2*r, color)
+    for cx, cy in ((x + r, y + r), (x + w - r - 1, y + r), (x + r, y + h - r - 1), (x + w - r - 1, y + h - r - 1)):
+        image_draw_circle(img, cx, cy, r, color)
+
+
+def unload_label_textures() -> None:
+    """Libera las etiquetas cacheadas (al cerrar la ventana)."""
+    for tex in _LABELS.values():
+        unload_texture(tex)
+    _LABELS.clear()
 
 # Este módulo se importa desde game.py; no lo ejecutes directamente.
 if __name__ == "__main__":
@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 from typing import Optional
-from pyray import load_texture, unload_texture, unload_font, Font, Texture2D, get_random_value
+try:
+    from pyray import load_texture, unload_texture, unload_font, Font, Texture2D, get_random_value
+except ImportError:
+    pass  # sin raylib: AssetManager(load=False) en modo headless
 from game_config import LOADING_IMAGE_PATH
 
 class AssetManager:
     """Encapsula la lógica de carga y descarga de assets (texturas y fuentes)."""
     
-    def __init__(self) -> None:
+    def __init__(self, load: bool = True) -> None:
         self.custom_font: Optional[Font] = None
         self.loading_texture: Optional[Texture2D] = None
         self.spring_texture: Optional[Texture2D] = None
         self.loading_path = LOADING_IMAGE_PATH
-        self._load_assets()
+        if load:
+            self._load_assets()
 
     def _load_assets(self) -> None:
         try:
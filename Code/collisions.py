@@ -9,6 +9,7 @@ from typing import List, Tuple, Optional
 # API compatibles con escenas antiguas:
 #   - set_solid(col:int, row:int, solid:bool)
 #   - rect_collides(x, y, w, h, cell_w, cell_h) -> bool
+#   - version: contador de cambios de celdas bloqueadas
 # ---------------------------------------------------------------
 
 def _point_in_poly(px: float, py: float, poly: List[Tuple[float, float]]) -> bool:
@@ -34,6 +35,8 @@ class CollisionMap:
         self.cols: Optional[int] = None
         self.rows: Optional[int] = None
         self.blocked: set[tuple[int, int]] = set()
+        # Sube cada vez que cambian las celdas bloqueadas (invalida cachés de caminos)
+        self.version: int = 0
 
         # Datos de polígono / mundo (opcional)
         self.poly: Optional[List[Tuple[float, float]]] = None
@@ -59,17 +62,23 @@ class CollisionMap:
     # -------- API rejilla (compat.) --------
     def set_solid(self, ix: int, iy: int, solid: bool) -> None:
         """Compatibilidad con escenas antiguas: marca/desmarca celda sólida."""
+        cell = (int(ix), int(iy))
+        if solid == (cell in self.blocked):
+            return
         if solid:
-            self.blocked.add((int(ix), int(iy)))
+            self.blocked.add(cell)
         else:
-            self.blocked.discard((int(ix), int(iy)))
+            self.blocked.discard(cell)
+        self.version += 1
 
     # Utilidades equivalentes (por si las necesitas en otros lados)
     def block_cell(self, ix: int, iy: int, blocked: bool = True) -> None:
         self.set_solid(ix, iy, blocked)
 
     def clear_all_blocks(self) -> None:
-        self.blocked.clear()
+        if self.blocked:
+            self.blocked.clear()
+            self.version += 1
 
     # -------- Consulta colisión --------
     def rect_collides(self, x: float, y: float, w: float, h: float,
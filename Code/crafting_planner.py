@@ -0,0 +1,359 @@
+# crafting_planner.py
+# Planificador recursivo de crafteo: árbol completo, materia prima faltante y
+# orden de ejecución para cadenas de recetas (log → planks → workbench, ...).
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple, Optional, Set, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from recipe_registry import RecipeRegistry
+
+# Foto del inventario restringida a los items relevantes: ((item_id, cantidad), ...)
+Snapshot = Tuple[Tuple[str, int], ...]
+
+# Tope de crafteos que se exploran al buscar el máximo (evita bucles infinitos
+# con recetas que no consumen nada).
+MAX_CRAFTS_SEARCH = 9999
+
+
+@dataclass
+class CraftNode:
+    """Nodo del árbol de crafteo."""
+    item_id: str
+    qty: int                 # unidades pedidas de este item
+    from_stock: int = 0      # unidades tomadas del inventario
+    crafts: int = 0          # veces que se ejecuta la receta
+    missing: int = 0         # unidades sin stock ni receta (faltan)
+    children: List["CraftNode"] = field(default_factory=list)
+
+
+@dataclass
+class CraftPlan:
+    """Resultado de planificar un crafteo."""
+    target: str
+    qty: int
+    tree: CraftNode
+    steps: List[Tuple[str, int]]      # (id_receta, veces) en orden de ejecución
+    missing: Dict[str, int]           # materia prima que falta
+    consumed: Dict[str, int]          # unidades que salen del inventario
+    leftovers: Dict[str, int]         # sobrantes de intermedios
+
+    @property
+    def feasible(self) -> bool:
+        return not self.missing
+
+
+class CraftingPlanner:
+    """
+    Expande recetas de forma recursiva contra una foto del inventario.
+    Los resultados se memorizan por (item, foto) donde la foto solo incluye
+    los items que pueden intervenir en el árbol de ese item, así cambios en
+    items ajenos no invalidan la caché.
+
+    Si un item tiene varias recetas se reparte lo necesario entre ellas según
+    lo que alcance con el stock, probando primero las que no gastan items que
+    todavía necesita otra parte del árbol (workbench: las tablas salen de
+    log_small antes que de los log que pide la propia receta). Es una
+    heurística voraz: el faltante reportado es razonable, no necesariamente
+    el mínimo posible.
+    """
+
+    def __init__(self, registry: RecipeRegistry, max_cache: int = 512) -> None:
+        self.registry = registry
+        self.max_cache = max(16, max_cache)
+        self._closure: Dict[str, Tuple[str, ...]] = {}
+        self._recipe_closure: Dict[int, Tuple[str, ...]] = {}
+        self._pending_closure: Dict[Tuple[int, int], FrozenSet[str]] = {}
+        self._plans: Dict[Tuple[str, int, Snapshot], CraftPlan] = {}
+        self._max: Dict[Tuple[str, Snapshot], int] = {}
+        self._relevant: Optional[Tuple[str, ...]] = None
+        self._all_key: Optional[Snapshot] = None
+        self._all_max: Dict[str, int] = {}
+
+    # ----- API -----
+
+    def plan(self, target: str, qty: int, inventory: Any) -> CraftPlan:
+        """Planifica producir 'qty' unidades de 'target' con lo que hay en el inventario."""
+        counts = self._counts(inventory)
+        snap = self._snapshot(target, counts)
+        key = (target, qty, snap)
+        cached = self._plans.get(key)
+        if cached is not None:
+            return cached
+
+        stock = dict(snap)
+        steps: List[Tuple[str, int]] = []
+        missing: Dict[str, int] = {}
+        tree = self._expand(target, max(0, qty), stock, steps, missing, set(), use_stock=False, build=True)
+
+        consumed: Dict[str, int] = {}
+        leftovers: Dict[str, int] = {}
+        for item_id in self.closure(target):
+            delta = counts.get(item_id, 0) - stock.get(item_id, 0)
+            if delta > 0:
+                consumed[item_id] = delta
+            elif delta < 0:
+                leftovers[item_id] = -delta
+
+        plan = CraftPlan(target, qty, tree, steps, missing, consumed, leftovers)
+        self._remember(self._plans, key, plan)
+        return plan
+
+    def max_crafts(self, recipe_id: str, inventory: Any) -> int:
+        """Máximo de veces que se puede ejecutar la receta, crafteando intermedios si hace falta."""
+        r = self.registry.resolve(recipe_id)
+        if r is None:
+            return 0
+        return self._max_crafts(r, self._counts(inventory))
+
+    def max_crafts_all(self, inventory: Any) -> Dict[str, int]:
+        """Máximo crafteable (incluyendo intermedios) de todas las recetas a la vez."""
+        counts = self._counts(inventory)
+        relevant = self._relevant_items()
+        key = tuple((i, counts[i]) for i in relevant if counts.get(i, 0) > 0)
+        if key == self._all_key:
+            return self._all_max
+        result = {rid: self._max_crafts(r, counts) for r, rid in enumerate(self.registry.recipe_ids)}
+        self._all_key = key
+        self._all_max = result
+        return result
+
+    def closure(self, item_id: str) -> Tuple[str, ...]:
+        """Items (ordenados) que pueden aparecer en el árbol de 'item_id', incluido él mismo."""
+        cached = self._closure.get(item_id)
+        if cached is not None:
+            return cached
+        reg = self.registry
+        seen: Set[str] = set()
+        pending = [item_id]
+        while pending:
+            cur = pending.pop()
+            if cur in seen:
+                continue
+            seen.add(cur)
+            for r in reg.recipes_for(cur):
+                pending.extend(reg.item_ids[i] for i in reg.req_items[r])
+        result = tuple(sorted(seen))
+        self._closure[item_id] = result
+        return result
+
+    def clear_cache(self) -> None:
+        """Invalida todo (llamar si cambian las recetas)."""
+        self._closure.clear()
+        self._recipe_closure.clear()
+        self._pending_closure.clear()
+        self._plans.clear()
+        self._max.clear()
+        self._relevant = None
+        self._all_key = None
+        self._all_max = {}
+
+    # ----- Internos -----
+
+    @staticmethod
+    def _counts(inventory: Any) -> Dict[str, int]:
+        # Acepta un Inventory o un dict {item_id: cantidad} ya calculado
+        if isinstance(inventory, dict):
+            return inventory
+        return inventory.count_all()
+
+    def _snapshot(self, item_id: str, counts: Dict[str, int]) -> Snapshot:
+        return tuple((i, counts[i]) for i in self.closure(item_id) if counts.get(i, 0) > 0)
+
+    def _closure_of_recipe(self, r: int) -> Tuple[str, ...]:
+        cached = self._recipe_closure.get(r)
+        if cached is not None:
+            return cached
+        reg = self.registry
+        items: Set[str] = {reg.output_id(r)}
+        for i in reg.req_items[r]:
+            items.update(self.closure(reg.item_ids[i]))
+        result = tuple(sorted(items))
+        self._recipe_closure[r] = result
+        return result
+
+    def _closure_after(self, r: int, k: int) -> FrozenSet[str]:
+        """Items que pueden gastar los ingredientes de 'r' posteriores al k-ésimo."""
+        key = (r, k)
+        cached = self._pending_closure.get(key)
+        if cached is not None:
+            return cached
+        reg = self.registry
+        items: Set[str] = set()
+        for i in reg.req_items[r][k + 1:]:
+            items.update(self.closure(reg.item_ids[i]))
+        result = frozenset(items)
+        self._pending_closure[key] = result
+        return result
+
+    def _relevant_items(self) -> Tuple[str, ...]:
+        if self._relevant is None:
+            items: Set[str] = set()
+            for r in range(len(self.registry)):
+                items.update(self._closure_of_recipe(r))
+            self._relevant = tuple(sorted(items))
+        return self._relevant
+
+    def _remember(self, cache: dict, key, value) -> None:
+        if len(cache) >= self.max_cache:
+            cache.clear()
+        cache[key] = value
+
+    def _max_crafts(self, r: int, counts: Dict[str, int]) -> int:
+        snap = tuple((i, counts[i]) for i in self._closure_of_recipe(r) if counts.get(i, 0) > 0)
+        key = (self.registry.recipe_ids[r], snap)
+        cached = self._max.get(key)
+        if cached is not None:
+            return cached
+
+        # Búsqueda exponencial + binaria: la factibilidad es monótona en n
+        lo, hi = 0, 1
+        while hi <= MAX_CRAFTS_SEARCH and self._feasible(r, hi, snap):
+            lo, hi = hi, hi * 2
+        hi = min(hi, MAX_CRAFTS_SEARCH + 1)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self._feasible(r, mid, snap):
+                lo = mid
+            else:
+                hi = mid
+
+        self._remember(self._max, key, lo)
+        return lo
+
+    def _feasible(self, r: int, crafts: int, snap: Snapshot) -> bool:
+        missing: Dict[str, int] = {}
+        visiting = {self.registry.output_id(r)}
+        self._run_recipe(r, crafts, dict(snap), [], missing, visiting, None, build=False)
+        return not missing
+
+    def _split_alternatives(self, alts: List[int], need: int, stock: Dict[str, int], visiting: Set[str],
+                            pending: FrozenSet[str] = frozenset()) -> List[Tuple[int, int]]:
+        """
+        Reparte 'need' entre las recetas alternativas: cada una aporta lo máximo
+        que alcance con el stock (prueba sobre copias); la última cubre el resto.
+        Van primero las que no tocan 'pending' (items que aún necesita el resto
+        del árbol); entre iguales, el orden de declaración.
+        Devuelve [(receta, veces), ...].
+        """
+        out_qty = self.registry.out_qty
+        if len(alts) == 1:
+            return [(alts[0], -(-need // out_qty[alts[0]]))]
+        if pending:
+            alts = sorted(alts, key=lambda r: not pending.isdisjoint(self._closure_of_recipe(r)))
+
+        trial = dict(stock)
+        chosen: List[Tuple[int, int]] = []
+        remaining = need
+        for k, r in enumerate(alts):
+            if remaining <= 0:
+                break
+            wanted = -(-remaining // out_qty[r])
+            if k == len(alts) - 1:
+                crafts = wanted
+            else:
+                crafts = self._max_partial(r, wanted, trial, visiting)
+                if crafts <= 0:
+                    continue
+            self._run_recipe(r, crafts, trial, [], {}, set(visiting), None, build=False)
+            chosen.append((r, crafts))
+            remaining -= crafts * out_qty[r]
+        return chosen
+
+    def _max_partial(self, r: int, upper: int, stock: Dict[str, int], visiting: Set[str]) -> int:
+        # Mayor n <= upper que se puede ejecutar sin faltantes (búsqueda binaria)
+        def ok(n: int) -> bool:
+            missing: Dict[str, int] = {}
+            self._run_recipe(r, n, dict(stock), [], missing, set(visiting), None, build=False)
+            return not missing
+
+        if ok(upper):
+            return upper
+        lo, hi = 0, upper
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if ok(mid):
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def _run_recipe(
+        self,
+        r: int,
+        crafts: int,
+        stock: Dict[str, int],
+        steps: List[Tuple[str, int]],
+        missing: Dict[str, int],
+        visiting: Set[str],
+        node: Optional[CraftNode],
+        build: bool,
+        pending: FrozenSet[str] = frozenset(),
+    ) -> None:
+        reg = self.registry
+        for k, (idx, req_qty) in enumerate(zip(reg.req_items[r], reg.req_qty[r])):
+            # Lo que aún piden los ingredientes siguientes (y los ancestros) no se gasta en alternativas
+            after = self._closure_after(r, k)
+            child_pending = pending | after if pending and after else (pending or after)
+            child = self._expand(reg.item_ids[idx], req_qty * crafts, stock, steps, missing, visiting,
+                                 True, build, child_pending)
+            if node is not None:
+                node.children.append(child)
+        steps.append((reg.recipe_ids[r], crafts))
+
+    def _expand(
+        self,
+        item_id: str,
+        qty: int,
+        stock: Dict[str, int],
+        steps: List[Tuple[str, int]],
+        missing: Dict[str, int],
+        visiting: Set[str],
+        use_stock: bool = True,
+        build: bool = True,
+        pending: FrozenSet[str] = frozenset(),
+    ) -> Optional[CraftNode]:
+        node = CraftNode(item_id, qty) if build else None
+        need = qty
+
+        # 1) Tomar del inventario lo que haya
+        if use_stock:
+            have = stock.get(item_id, 0)
+            take = min(have, need)
+            if take > 0:
+                stock[item_id] = have - take
+                need -= take
+                if node is not None:
+                    node.from_stock = take
+        if need <= 0:
+            return node
+
+        # 2) Sin receta (o ciclo): es materia prima faltante
+        alts = self.registry.recipes_for(item_id)
+        if not alts or item_id in visiting:
+            missing[item_id] = missing.get(item_id, 0) + need
+            if node is not None:
+                node.missing = need
+            return node
+
+        # 3) Craftear lo que falta; primero los ingredientes
+        out_qty = self.registry.out_qty
+        produced = 0
+        crafts = 0
+        visiting.add(item_id)
+        for r, n in self._split_alternatives(alts, need, stock, visiting, pending):
+            self._run_recipe(r, n, stock, steps, missing, visiting, node, build, pending)
+            produced += n * out_qty[r]
+            crafts += n
+        visiting.discard(item_id)
+
+        surplus = produced - need
+        if surplus > 0:
+            stock[item_id] = stock.get(item_id, 0) + surplus
+        if node is not None:
+            node.crafts = crafts
+        return node
+
+
+# Exportar
+__all__ = ["CraftingPlanner", "CraftPlan", "CraftNode"]
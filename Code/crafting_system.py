@@ -1,80 +1,91 @@
 # crafting_system.py
 # Sistema de crafteo para mesa de trabajo
 from __future__ import annotations
-from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
+from typing import List, Dict, Tuple, Optional, Union, TYPE_CHECKING
+
+from crafting_planner import CraftingPlanner, CraftPlan
+from recipe_registry import RecipeRegistry
 
 if TYPE_CHECKING:
     from inventory import Inventory
 
 # ==================== RECETAS DE CRAFTEO ====================
-# Formato: "item_resultado": (cantidad_resultado, [(item_requerido, cantidad), ...])
+# Formato: ("item_resultado", cantidad_resultado, [(item_requerido, cantidad), ...])
 # 
-# EJEMPLOS DE CÃ"MO AGREGAR NUEVAS RECETAS:
+# EJEMPLOS DE CÓMO AGREGAR NUEVAS RECETAS:
 # 
-# "planks": (4, [("log", 1)]),  # 1 tronco → 4 tablas
-# "rope": (1, [("leaves", 10)]),  # 10 hojas → 1 soga
-# "chest_wood": (1, [("planks", 8), ("iron_ingot", 2)]),  # 8 tablas + 2 lingotes hierro → 1 cofre
+# ("planks", 4, [("log", 1)]),  # 1 tronco → 4 tablas
+# ("rope", 1, [("leaves", 10)]),  # 10 hojas → 1 soga
+# ("chest_wood", 1, [("planks", 8), ("iron_ingot", 2)]),  # 8 tablas + 2 lingotes hierro → 1 cofre
 #
 # Para agregar una nueva receta:
-# 1. Verifica que los items existan en items_registry.py
-# 2. Agrega una lÃ­nea siguiendo el formato arriba
+# 1. Verifica que los items existan en items_registry.py (se valida al cargar)
+# 2. Agrega una línea siguiendo el formato arriba
 # 3. El primer valor es el item resultante (debe existir en items_registry)
 # 4. El segundo valor es la cantidad que se produce
 # 5. El tercer valor es una lista de tuplas (item_requerido, cantidad_requerida)
+#
+# Un mismo item puede tener varias recetas: la primera usa el id del item como
+# id de receta ("planks") y las siguientes se numeran ("planks#2", ...).
 
-CRAFTING_RECIPES: Dict[str, Tuple[int, List[Tuple[str, int]]]] = {
+CRAFTING_RECIPES: List[Tuple[str, int, List[Tuple[str, int]]]] = [
     # Procesamiento básico
-    "planks": (4, [("log", 1)]),
-    "planks": (2, [("log_small", 1)]),
+    ("planks", 4, [("log", 1)]),
+    ("planks", 2, [("log_small", 1)]),
     
     # Herramientas básicas
-    "rope": (1, [("leaves", 10)]),
-    "rope_fiber": (1, [("leaves", 8)]),
-    "stake_wood": (4, [("wood_branch", 2)]),
+    ("rope", 1, [("leaves", 10)]),
+    ("rope_fiber", 1, [("leaves", 8)]),
+    ("stake_wood", 4, [("wood_branch", 2)]),
     
     # Herramientas mejoradas
-    "hoe_wood_improv": (1, [("wood_branch", 3), ("rope", 1)]),
-    "pick_wood_improv": (1, [("wood_branch", 3), ("rope", 1)]),
-    "shovel_wood": (1, [("wood_branch", 2), ("planks", 1)]),
-    "knife_wood": (1, [("wood_branch", 1), ("planks", 1)]),
-    "rake_wood": (1, [("wood_branch", 2), ("rope", 1)]),
+    ("hoe_wood_improv", 1, [("wood_branch", 3), ("rope", 1)]),
+    ("pick_wood_improv", 1, [("wood_branch", 3), ("rope", 1)]),
+    ("shovel_wood", 1, [("wood_branch", 2), ("planks", 1)]),
+    ("knife_wood", 1, [("wood_branch", 1), ("planks", 1)]),
+    ("rake_wood", 1, [("wood_branch", 2), ("rope", 1)]),
     
     # Herramientas de piedra
-    "knife_stone": (1, [("rock", 2), ("rope", 1)]),
-    "shovel_stone": (1, [("rock", 2), ("wood_branch", 1)]),
+    ("knife_stone", 1, [("rock", 2), ("rope", 1)]),
+    ("shovel_stone", 1, [("rock", 2), ("wood_branch", 1)]),
     
     # Recipientes
-    "bowl_wood": (1, [("planks", 2)]),
-    "bowl_stone": (1, [("rock", 3)]),
-    "jar_small": (1, [("glass", 2)]),
-    "jar_medium": (1, [("glass", 3)]),
-    "jar_large": (1, [("glass", 4)]),
+    ("bowl_wood", 1, [("planks", 2)]),
+    ("bowl_stone", 1, [("rock", 3)]),
+    ("jar_small", 1, [("glass", 2)]),
+    ("jar_medium", 1, [("glass", 3)]),
+    ("jar_large", 1, [("glass", 4)]),
     
     # Estructuras
-    "chest_wood": (1, [("planks", 8)]),
-    "workbench": (1, [("planks", 4), ("log", 2)]),
-    "bed": (1, [("planks", 6), ("leaves", 20)]),
+    ("chest_wood", 1, [("planks", 8)]),
+    ("workbench", 1, [("planks", 4), ("log", 2)]),
+    ("bed", 1, [("planks", 6), ("leaves", 20)]),
     
     # Fertilizantes
-    "bone_meal": (2, [("bone", 1)]),
-    "fert_1": (1, [("bone_meal", 2), ("leaves", 5)]),
+    ("bone_meal", 2, [("bone", 1)]),
+    ("fert_1", 1, [("bone_meal", 2), ("leaves", 5)]),
     
     # Iluminación
-    "candle": (2, [("honeycomb_fragment", 1), ("rope_fiber", 1)]),
+    ("candle", 2, [("honeycomb_fragment", 1), ("rope_fiber", 1)]),
     
     # Transporte
-    "basket": (1, [("wood_branch", 6), ("rope", 2)]),
-    "wheelbarrow": (1, [("planks", 4), ("iron_ingot", 2), ("rope", 1)]),
-}
+    ("basket", 1, [("wood_branch", 6), ("rope", 2)]),
+    ("wheelbarrow", 1, [("planks", 4), ("iron_ingot", 2), ("rope", 1)]),
+]
+
+# Registro compilado (ids enteros, validado contra items_registry)
+RECIPE_REGISTRY = RecipeRegistry(CRAFTING_RECIPES)
 
 
 class CraftingSystem:
     """Sistema de crafteo para mesa de trabajo"""
     
-    def __init__(self):
+    def __init__(self, registry: Optional[RecipeRegistry] = None):
         self.is_open = False
         self.selected_recipe: Optional[str] = None
         self.scroll_offset = 0
+        self.registry = registry if registry is not None else RECIPE_REGISTRY
+        self.planner = CraftingPlanner(self.registry)
     
     def toggle(self):
         """Abre/cierra el menú de crafteo"""
@@ -82,55 +93,96 @@ class CraftingSystem:
         if not self.is_open:
             self.selected_recipe = None
     
-    def can_craft(self, recipe_id: str, inventory: Inventory) -> bool:
+    def _counts(self, inventory: Inventory) -> List[int]:
+        return inventory.count_vector(self.registry.item_index)
+    
+    def can_craft(self, recipe_id: Union[str, int], inventory: Inventory) -> bool:
         """Verifica si se puede craftear una receta"""
-        if recipe_id not in CRAFTING_RECIPES:
+        r = self.registry.resolve(recipe_id)
+        if r is None:
             return False
-        
-        _, requirements = CRAFTING_RECIPES[recipe_id]
-        
-        for item_id, required_qty in requirements:
-            available = inventory.count_item(item_id)
-            if available < required_qty:
-                return False
-        
-        return True
+        return self.registry.max_crafts(r, self._counts(inventory)) >= 1
     
-    def craft_item(self, recipe_id: str, inventory: Inventory) -> bool:
+    def craft_item(self, recipe_id: Union[str, int], inventory: Inventory) -> bool:
         """Intenta craftear un item"""
-        if not self.can_craft(recipe_id, inventory):
+        reg = self.registry
+        r = reg.resolve(recipe_id)
+        if r is None or reg.max_crafts(r, self._counts(inventory)) < 1:
             return False
         
-        result_qty, requirements = CRAFTING_RECIPES[recipe_id]
-        
         # Consumir materiales
-        for item_id, required_qty in requirements:
-            inventory.remove_item(item_id, required_qty)
+        for idx, required_qty in zip(reg.req_items[r], reg.req_qty[r]):
+            inventory.remove_item(reg.item_ids[idx], required_qty)
         
         # Agregar resultado
-        inventory.add_item(recipe_id, result_qty)
+        inventory.add_item(reg.item_ids[reg.out_item[r]], reg.out_qty[r])
         return True
     
+    def craft_many(self, recipe_id: Union[str, int], n: int, inventory: Inventory) -> int:
+        """
+        Craftea hasta 'n' veces la receta en un solo paso: calcula una vez
+        cuántas veces alcanza (mín. de disponible // requerido), consume todo
+        en una pasada por el inventario y retorna las unidades producidas.
+        """
+        reg = self.registry
+        r = reg.resolve(recipe_id)
+        if r is None or n <= 0:
+            return 0
+        
+        times = min(n, reg.max_crafts(r, self._counts(inventory)))
+        if times <= 0:
+            return 0
+        
+        ids = reg.item_ids
+        inventory.remove_items({ids[idx]: qty * times for idx, qty in zip(reg.req_items[r], reg.req_qty[r])})
+        produced = reg.out_qty[r] * times
+        inventory.add_item(ids[reg.out_item[r]], produced)
+        return produced
+    
+    def craft_max(self, recipe_id: Union[str, int], inventory: Inventory) -> int:
+        """Craftea todas las veces que alcance (botón "craftear máximo")"""
+        return self.craft_many(recipe_id, 1 << 30, inventory)
+    
+    def max_craft_count(self, recipe_id: Union[str, int], inventory: Inventory) -> int:
+        """Veces que alcanza para la receta con los ingredientes directos"""
+        r = self.registry.resolve(recipe_id)
+        if r is None:
+            return 0
+        return self.registry.max_crafts(r, self._counts(inventory))
+    
     def get_available_recipes(self, inventory: Inventory) -> List[str]:
         """Retorna lista de recetas que se pueden craftear"""
-        available = []
-        for recipe_id in CRAFTING_RECIPES.keys():
-            if self.can_craft(recipe_id, inventory):
-                available.append(recipe_id)
-        return available
+        ids = self.registry.recipe_ids
+        counts = self.registry.max_counts(self._counts(inventory))
+        return [ids[r] for r, n in enumerate(counts) if n >= 1]
+    
+    def get_craft_counts(self, inventory: Inventory) -> Dict[str, int]:
+        """Cuántas veces se puede craftear cada receta ahora mismo (ingredientes directos)"""
+        counts = self.registry.max_counts(self._counts(inventory))
+        return dict(zip(self.registry.recipe_ids, (int(n) for n in counts)))
+    
+    def plan_craft(self, item_id: str, qty: int, inventory: Inventory) -> CraftPlan:
+        """Plan completo (árbol, faltantes y pasos) para obtener 'qty' unidades de un item"""
+        return self.planner.plan(item_id, qty, inventory)
+    
+    def get_max_craftable(self, inventory: Inventory) -> Dict[str, int]:
+        """Máximo de crafteos por receta contando intermedios (cacheado por inventario)"""
+        return self.planner.max_crafts_all(inventory)
     
-    def get_recipe_info(self, recipe_id: str) -> Optional[Dict]:
+    def get_recipe_info(self, recipe_id: Union[str, int]) -> Optional[Dict]:
         """Obtiene información de una receta"""
-        if recipe_id not in CRAFTING_RECIPES:
+        reg = self.registry
+        r = reg.resolve(recipe_id)
+        if r is None:
             return None
         
-        result_qty, requirements = CRAFTING_RECIPES[recipe_id]
         return {
-            "result": recipe_id,
-            "result_qty": result_qty,
-            "requirements": requirements
+            "recipe_id": reg.recipe_ids[r],
+            "result": reg.output_id(r),
+            "result_qty": reg.out_qty[r],
+            "requirements": reg.requirements(r)
         }
 
 
 # Exportar
-__all__ = ["CraftingSystem", "CRAFTING_RECIPES"]
\ No newline at end of file
+__all__ = ["CraftingSystem", "CRAFTING_RECIPES", "RECIPE_REGISTRY"]
\ No newline at end of file
@@ -0,0 +1,222 @@
+# crafting_ui.py
+# Lista de recetas virtualizada para el menú de crafteo: solo se arman y
+# dibujan las filas visibles, y cada fila se cachea hasta que cambian las
+# cantidades de sus ingredientes en el inventario. La entrada (búsqueda,
+# rueda y clic) llega desde Game._handle_input en cada tick; draw() solo dibuja.
+from __future__ import annotations
+from typing import Dict, List, NamedTuple, Optional, TYPE_CHECKING
+try:
+    from pyray import *  # solo para dibujar
+except ImportError:
+    pass
+
+import ui_helpers
+from sim_types import Vec2
+
+if TYPE_CHECKING:
+    from crafting_system import CraftingSystem
+    from inventory import Inventory
+
+
+class RecipeRow:
+    """Datos ya medidos de una fila (texto, ancho de la cantidad y cuántas veces alcanza)."""
+    __slots__ = ("key", "title", "summary", "count", "count_label", "count_w")
+
+    def __init__(self, key: tuple, title: str, summary: str,
+                 count: int, count_label: str, count_w: int) -> None:
+        self.key = key
+        self.title = title
+        self.summary = summary
+        self.count = count
+        self.count_label = count_label
+        self.count_w = count_w
+
+
+class ListLayout(NamedTuple):
+    """Geometría del panel para una resolución (la comparten input y dibujo)."""
+    px: int
+    py: int
+    panel_w: int
+    panel_h: int
+    title_fs: int
+    row_fs: int
+    sub_fs: int
+    footer_fs: int
+    search_y: int
+    search_h: int
+    list_x: int
+    list_y: int
+    list_w: int
+    list_h: int
+    row_h: int
+
+
+def list_layout(screen_w: int, screen_h: int) -> ListLayout:
+    panel_w = int(screen_w * 0.42)
+    panel_h = int(screen_h * 0.72)
+    px = screen_w - panel_w - int(screen_w * 0.04)
+    py = int(screen_h * 0.12)
+
+    title_fs = ui_helpers.calc_font(screen_h, 22)
+    row_fs = ui_helpers.calc_font(screen_h, 16)
+    sub_fs = max(10, int(row_fs * 0.8))
+    footer_fs = max(10, int(row_fs * 0.8))
+    row_h = row_fs + sub_fs + 14
+
+    search_y = py + 16 + title_fs
+    search_h = row_fs + 10
+    list_y = search_y + search_h + 8
+    list_h = py + panel_h - list_y - footer_fs - 16
+    return ListLayout(px, py, panel_w, panel_h, title_fs, row_fs, sub_fs, footer_fs,
+                      search_y, search_h, px + 14, list_y, panel_w - 28, list_h, row_h)
+
+
+class RecipeListView:
+    """Vista de la lista de recetas con búsqueda por nombre y scroll."""
+
+    def __init__(self, crafting: CraftingSystem) -> None:
+        self.crafting = crafting
+        self.query = ""
+        self._filtered: List[int] = []
+        self._filtered_query: Optional[str] = None
+        self._names: Dict[str, str] = {}
+        self._search_keys: List[str] = []
+        self._rows: Dict[int, RecipeRow] = {}
+
+    # ----- Búsqueda -----
+
+    def set_query(self, query: str) -> None:
+        if query != self.query:
+            self.query = query
+            self.crafting.scroll_offset = 0
+
+    def filtered(self, inventory: Inventory) -> List[int]:
+        """Índices de recetas que coinciden con la búsqueda (cacheado por texto)."""
+        if self._filtered_query == self.query:
+            return self._filtered
+        reg = self.crafting.registry
+        if not self._search_keys:
+            self._search_keys = [
+                f"{self._item_name(reg.output_id(r), inventory)} {reg.recipe_ids[r]}".lower()
+                for r in range(len(reg))
+            ]
+        q = self.query.strip().lower()
+        if q:
+            self._filtered = [r for r, k in enumerate(self._search_keys) if q in k]
+        else:
+            self._filtered = list(range(len(reg)))
+        self._filtered_query = self.query
+        return self._filtered
+
+    # ----- Input -----
+
+    def handle_input(self, inventory: Inventory, screen_w: int, screen_h: int, text: str,
+                     backspace: bool, wheel: float, click: Optional[Vec2]) -> None:
+        """
+        Texto de búsqueda, rueda del ratón y selección con clic de un tick
+        (los datos vienen de la fuente de entrada de Game, no de raylib).
+        """
+        query = self.query
+        for ch in text:
+            if 32 <= ord(ch) <= 125 and len(query) < 24:
+                query += ch
+        if backspace and query:
+            query = query[:-1]
+        self.set_query(query)
+
+        lay = list_layout(screen_w, screen_h)
+        x, y, w, h, row_h = lay.list_x, lay.list_y, lay.list_w, lay.list_h, lay.row_h
+        rows = self.filtered(inventory)
+        visible = max(1, h // row_h)
+        max_offset = max(0, len(rows) - visible)
+        if wheel:
+            self.crafting.scroll_offset -= int(wheel)
+        self.crafting.scroll_offset = max(0, min(max_offset, self.crafting.scroll_offset))
+
+        if click is not None and x <= click.x < x + w and y <= click.y < y + h:
+            i = self.crafting.scroll_offset + int((click.y - y) // row_h)
+            if 0 <= i < len(rows):
+                self.crafting.selected_recipe = self.crafting.registry.recipe_ids[rows[i]]
+
+    # ----- Dibujo -----
+
+    def draw(self, screen_w: int, screen_h: int, inventory: Inventory) -> None:
+        lay = list_layout(screen_w, screen_h)
+        px, py, panel_w, panel_h = lay.px, lay.py, lay.panel_w, lay.panel_h
+        title_fs, row_fs, sub_fs, row_h = lay.title_fs, lay.row_fs, lay.sub_fs, lay.row_h
+
+        draw_rectangle(px + 3, py + 3, panel_w, panel_h, Color(0, 0, 0, 80))
+        draw_rectangle(px, py, panel_w, panel_h, Color(45, 38, 32, 240))
+        draw_rectangle_lines(px, py, panel_w, panel_h, Color(15, 10, 8, 255))
+        draw_text("CRAFTEO", px + 14, py + 10, title_fs, Color(235, 220, 180, 255))
+
+        # Buscador
+        search_y, search_h = lay.search_y, lay.search_h
+        draw_rectangle(px + 14, search_y, panel_w - 28, search_h, Color(25, 20, 16, 255))
+        draw_rectangle_lines(px + 14, search_y, panel_w - 28, search_h, Color(200, 180, 140, 255))
+        hint = self.query if self.query else "Buscar..."
+        hint_col = RAYWHITE if self.query else Color(150, 140, 120, 255)
+        draw_text(hint, px + 20, search_y + 5, row_fs, hint_col)
+
+        list_x, list_y, list_w, list_h = lay.list_x, lay.list_y, lay.list_w, lay.list_h
+        footer_fs = lay.footer_fs
+
+        # Solo las filas visibles: el costo no depende del total de recetas
+        rows = self.filtered(inventory)
+        reg = self.crafting.registry
+        counts = inventory.count_vector(reg.item_index)
+        first = self.crafting.scroll_offset
+        visible = max(1, list_h // row_h)
+        selected = self.crafting.selected_recipe
+        for i in range(first, min(len(rows), first + visible)):
+            r = rows[i]
+            row = self._row(r, counts, inventory, row_fs)
+            ry = list_y + (i - first) * row_h
+            is_sel = reg.recipe_ids[r] == selected
+            bg = Color(90, 75, 50, 230) if is_sel else Color(60, 55, 50, 200)
+            draw_rectangle(list_x, ry, list_w, row_h - 4, bg)
+            fg = RAYWHITE if row.count > 0 else Color(150, 140, 130, 255)
+            draw_text(row.title, list_x + 8, ry + 4, row_fs, fg)
+            draw_text(row.summary, list_x + 8, ry + 6 + row_fs, sub_fs, Color(200, 190, 160, 255))
+            draw_text(row.count_label, list_x + list_w - row.count_w - 8, ry + 4, row_fs, fg)
+
+        if not rows:
+            draw_text("Sin resultados", list_x + 8, list_y + 4, row_fs, Color(200, 200, 200, 255))
+
+        footer = "[ENTER] craftear | [SHIFT+ENTER] craftear máx."
+        draw_text(footer, px + 14, py + panel_h - footer_fs - 8, footer_fs, Color(200, 200, 200, 255))
+
+    # ----- Internos -----
+
+    def _row(self, r: int, counts: List[int], inventory: Inventory, font_size: int) -> RecipeRow:
+        reg = self.crafting.registry
+        req_items = reg.req_items[r]
+        key = (font_size,) + tuple(counts[i] for i in req_items)
+        row = self._rows.get(r)
+        if row is not None and row.key == key:
+            return row
+
+        req_qty = reg.req_qty[r]
+        title = f"{self._item_name(reg.output_id(r), inventory)} x{reg.out_qty[r]}"
+        summary = "  ".join(
+            f"{self._item_name(reg.item_ids[i], inventory)} {counts[i]}/{q}"
+            for i, q in zip(req_items, req_qty)
+        )
+        count = reg.max_crafts(r, counts)
+        count_label = f"x{count}" if count > 0 else "-"
+        row = RecipeRow(key, title, summary, count, count_label,
+                        measure_text(count_label, font_size))
+        self._rows[r] = row
+        return row
+
+    def _item_name(self, item_id: str, inventory: Inventory) -> str:
+        name = self._names.get(item_id)
+        if name is None:
+            item = inventory.item_database.get(item_id)
+            name = item.name if item is not None else item_id
+            self._names[item_id] = name
+        return name
+
+
+# Exportar
+__all__ = ["RecipeListView", "RecipeRow", "ListLayout", "list_layout"]
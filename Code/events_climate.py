@@ -1,8 +1,16 @@
+# events_climate.py
+import math
+import random
+
+# Cuadros por segundo con los que se calibró 'probabilidad_cambio' (por ciclo)
+FPS_REFERENCIA = 60.0
+
+
 class ControladorClima:
     """
     Controlador global que gestiona la transición y viabilidad de los eventos.
     """
-    def __init__(self, zona_climatica: int, temp_inicial: float = 25.0):
+    def __init__(self, zona_climatica: int, temp_inicial: float = 25.0, clock=None):
         
         # --- Condiciones del Mundo (Restricción Geográfica) ---
         self.zona_climatica = zona_climatica # TipoClima.CALIDO, TEMPLADO, FRIO
@@ -14,6 +22,31 @@ class ControladorClima:
         self.evento_actual: EventoClimaticoBase = Soleado(duracion=180.0)
         self.posibles_eventos = [Soleado, Lluvia, Nieve, TormentaElectrica, Tornado]
 
+        # --- Agenda (si hay reloj el cambio se agenda y no se sortea por cuadro) ---
+        self.clock = clock
+        self._cambio_handle = None
+        if clock is not None:
+            self._agendar_cambio()
+
+    def _tasa_cambio(self) -> float:
+        """Cambios por segundo equivalentes a 'probabilidad_cambio' por ciclo a FPS_REFERENCIA."""
+        p = min(max(self.probabilidad_cambio, 0.0), 0.999999)
+        return -math.log1p(-p) * FPS_REFERENCIA
+
+    def _agendar_cambio(self) -> None:
+        """Agenda el próximo cambio aleatorio (proceso de Poisson, no depende del FPS)."""
+        self.clock.cancel(self._cambio_handle)
+        tasa = self._tasa_cambio()
+        if tasa <= 0.0:
+            self._cambio_handle = None
+            return
+        self._cambio_handle = self.clock.schedule(random.expovariate(tasa), self._on_cambio)
+
+    def _on_cambio(self) -> None:
+        self._cambio_handle = None
+        self._elegir_proximo_evento()
+        self._agendar_cambio()
+
     def _es_viable(self, evento_clase, temp: float, humedad: float, zona: int) -> bool:
         """Verifica si un evento es posible dadas las condiciones."""
         
@@ -87,13 +120,17 @@ class ControladorClima:
         self.evento_actual.update(delta_time, self.temperatura, self.humedad)
         
         # 3. Lógica de Transición de Evento
-        probabilidad = self.probabilidad_cambio # Probabilidad de cambio por ciclo
-        
         if not self.evento_actual.esta_activo:
-            probabilidad = 1.0 # Forzar cambio si el evento terminó
-            
-        if random.random() < probabilidad:
+            # Forzar cambio si el evento terminó
             self._elegir_proximo_evento()
+            if self.clock is not None:
+                self._agendar_cambio()
+            return
+
+        if self.clock is None:
+            # Sin reloj: misma tasa que la agenda, escalada por delta_time
+            if random.random() < -math.expm1(-self._tasa_cambio() * delta_time):
+                self._elegir_proximo_evento()
 
     def draw(self, ancho_mundo: int, alto_mundo: int):
         """Dibuja el evento y muestra la información de debug."""
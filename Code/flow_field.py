@@ -0,0 +1,123 @@
+# flow_field.py
+# Campo de flujo hacia el jugador sobre la rejilla de CollisionMap. Una sola
+# pasada de Dijkstra (8 vecinos, sin cortar esquinas) desde la celda del
+# jugador deja, para cada celda alcanzable, la celda siguiente del camino
+# más corto. Todos los animales que persiguen consultan su celda en O(1), y
+# el campo se recalcula solo cuando el jugador cambia de celda.
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+import heapq
+import math
+
+from collisions import CollisionMap
+
+Cell = Tuple[int, int]
+
+_DIAG = math.sqrt(2.0)
+# (dc, dr, costo)
+_NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _DIAG), (1, -1, _DIAG), (-1, 1, _DIAG), (-1, -1, _DIAG),
+)
+
+
+class FlowField:
+    """
+    Campo de flujo local: solo cubre un cuadrado de 'radius_cells' celdas
+    alrededor del jugador (los hostiles solo persiguen dentro de su
+    detect_range), así el recálculo cuesta unas cientos de celdas.
+    """
+
+    def __init__(self, collision_map: CollisionMap, cell_size: float, radius_cells: int = 10) -> None:
+        self.cm = collision_map
+        self.cell_size = float(cell_size)
+        self.radius = max(1, int(radius_cells))
+        self.cols = collision_map.cols or 0
+        self.rows = collision_map.rows or 0
+        self.target: Optional[Cell] = None
+        self.recomputes = 0
+        self._next: Dict[Cell, Cell] = {}
+        self._dist: Dict[Cell, float] = {}
+        self._dirty = True
+
+    # ----- Recalculo -----
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        cs = self.cell_size
+        return int(x // cs), int(y // cs)
+
+    def invalidate(self) -> None:
+        """Fuerza el recálculo (p. ej. si cambian las celdas bloqueadas)."""
+        self._dirty = True
+
+    def update(self, target_x: float, target_y: float) -> bool:
+        """Recalcula si el objetivo cambió de celda. Devuelve True si recalculó."""
+        cell = self.cell_of(target_x, target_y)
+        if cell == self.target and not self._dirty:
+            return False
+        self.target = cell
+        self._dirty = False
+        self._compute(cell)
+        self.recomputes += 1
+        return True
+
+    def _compute(self, target: Cell) -> None:
+        blocked = self.cm.blocked
+        cols, rows, rad = self.cols, self.rows, self.radius
+        tc, tr = target
+        c0, c1 = max(0, tc - rad), min(cols - 1, tc + rad)
+        r0, r1 = max(0, tr - rad), min(rows - 1, tr + rad)
+
+        dist: Dict[Cell, float] = {target: 0.0}
+        nxt: Dict[Cell, Cell] = {}
+        heap = [(0.0, tc, tr)]
+        while heap:
+            d, c, r = heapq.heappop(heap)
+            if d > dist[(c, r)]:
+                continue
+            for dc, dr, w in _NEIGHBOURS:
+                nc, nr = c + dc, r + dr
+                if nc < c0 or nc > c1 or nr < r0 or nr > r1:
+                    continue
+                if (nc, nr) in blocked:
+                    continue
+                if dc and dr and ((nc, r) in blocked or (c, nr) in blocked):
+                    continue  # sin cortar esquinas
+                nd = d + w
+                if nd < dist.get((nc, nr), math.inf):
+                    dist[(nc, nr)] = nd
+                    # Desde (nc, nr) el paso siguiente hacia el objetivo es (c, r)
+                    nxt[(nc, nr)] = (c, r)
+                    heapq.heappush(heap, (nd, nc, nr))
+        self._dist = dist
+        self._next = nxt
+
+    # ----- Consultas O(1) -----
+
+    def next_cell(self, x: float, y: float) -> Optional[Cell]:
+        return self._next.get(self.cell_of(x, y))
+
+    def distance(self, x: float, y: float) -> Optional[float]:
+        """Distancia de camino (en celdas) hasta el objetivo, o None si no se alcanza."""
+        return self._dist.get(self.cell_of(x, y))
+
+    def direction(self, x: float, y: float) -> Optional[Tuple[float, float]]:
+        """
+        Dirección unitaria hacia el centro de la celda siguiente. None si la
+        posición está en la celda del objetivo o fuera del campo (en ambos
+        casos conviene ir en línea recta).
+        """
+        nc = self._next.get(self.cell_of(x, y))
+        if nc is None:
+            return None
+        cs = self.cell_size
+        dx = (nc[0] + 0.5) * cs - x
+        dy = (nc[1] + 0.5) * cs - y
+        d = math.hypot(dx, dy)
+        if d <= 1e-6:
+            return None
+        return dx / d, dy / d
+
+
+# Exportar
+__all__ = ["FlowField"]
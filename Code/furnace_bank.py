@@ -0,0 +1,370 @@
+# furnace_bank.py
+# Banco de hornos: estado de N hornos en arreglos paralelos, avanzados todos
+# juntos con un paso vectorizado en forma cerrada (también los de escenas no
+# activas, y con cualquier dt).
+from __future__ import annotations
+from typing import List, Dict, Tuple, Optional, Hashable, TYPE_CHECKING
+
+from furnace_system import SMELTING_RECIPES, COMBUSTIBLES, fast_forward
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # NumPy es opcional: sin él se avanza horno por horno
+    np = None
+
+if TYPE_CHECKING:
+    from inventory import Inventory
+
+# Códigos de items (índices en las tablas de abajo); -1 = vacío
+INPUT_IDS: List[str] = list(SMELTING_RECIPES.keys())
+FUEL_IDS: List[str] = list(COMBUSTIBLES.keys())
+OUTPUT_IDS: List[str] = sorted({out for out, _, _ in SMELTING_RECIPES.values()})
+
+_INPUT_CODE: Dict[str, int] = {iid: i for i, iid in enumerate(INPUT_IDS)}
+_FUEL_CODE: Dict[str, int] = {iid: i for i, iid in enumerate(FUEL_IDS)}
+_OUTPUT_CODE: Dict[str, int] = {iid: i for i, iid in enumerate(OUTPUT_IDS)}
+
+# Tablas por código de entrada / combustible
+RECIPE_OUT: List[int] = [_OUTPUT_CODE[SMELTING_RECIPES[i][0]] for i in INPUT_IDS]
+RECIPE_QTY: List[int] = [SMELTING_RECIPES[i][1] for i in INPUT_IDS]
+RECIPE_TIME: List[float] = [SMELTING_RECIPES[i][2] for i in INPUT_IDS]
+FUEL_BURN: List[float] = [COMBUSTIBLES[i] for i in FUEL_IDS]
+
+# Columnas del estado: (nombre, tipo, valor vacío)
+_FIELDS: List[Tuple[str, str, object]] = [
+    ("alive", "bool", False),
+    ("processing", "bool", False),
+    ("fuel_left", "float", 0.0),     # combustible restante del item actual (s)
+    ("elapsed", "float", 0.0),       # tiempo procesando el item actual (s)
+    ("needed", "float", 0.0),        # tiempo total del item actual (s)
+    ("input_id", "int", -1),
+    ("input_qty", "int", 0),
+    ("fuel_id", "int", -1),
+    ("fuel_qty", "int", 0),
+    ("output_id", "int", -1),
+    ("output_qty", "int", 0),
+]
+
+
+class FurnaceBank:
+    """
+    Muchos hornos con la misma lógica que FurnaceSystem, guardados como
+    columnas (fuel_left, elapsed, input_id, input_qty, ...). Cada horno se
+    identifica por un handle entero; (scene_id, key) permite ubicarlo, p. ej.
+    key = índice del rectángulo en WorldManager.furnaces_pos[scene_id].
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        self.capacity = 0
+        self.count = 0                       # handles usados (incluye libres)
+        self._free: List[int] = []
+        self._by_key: Dict[Tuple[int, Hashable], int] = {}
+        self._keys: Dict[int, Tuple[int, Hashable]] = {}
+        if np is not None:
+            self._tbl_out = np.array(RECIPE_OUT, dtype=np.int64)
+            self._tbl_qty = np.array(RECIPE_QTY, dtype=np.int64)
+            self._tbl_time = np.array(RECIPE_TIME, dtype=np.float64)
+            self._tbl_burn = np.array(FUEL_BURN, dtype=np.float64)
+        self._grow(max(1, capacity))
+
+    # ----- Alta / baja -----
+
+    def add_furnace(self, scene_id: int, key: Hashable = None) -> int:
+        """Registra un horno (vacío) y devuelve su handle."""
+        if key is not None and (scene_id, key) in self._by_key:
+            return self._by_key[(scene_id, key)]
+        if self._free:
+            h = self._free.pop()
+        else:
+            if self.count >= self.capacity:
+                self._grow(self.capacity * 2)
+            h = self.count
+            self.count += 1
+        self._reset(h)
+        self.alive[h] = True
+        if key is not None:
+            self._by_key[(scene_id, key)] = h
+            self._keys[h] = (scene_id, key)
+        return h
+
+    def remove_furnace(self, h: int) -> None:
+        if not self._valid(h):
+            return
+        self._reset(h)
+        k = self._keys.pop(h, None)
+        if k is not None:
+            self._by_key.pop(k, None)
+        self._free.append(h)
+
+    def handle_at(self, scene_id: int, key: Hashable) -> Optional[int]:
+        return self._by_key.get((scene_id, key))
+
+    def handles_in_scene(self, scene_id: int) -> List[int]:
+        return [h for (sid, _), h in self._by_key.items() if sid == scene_id]
+
+    @property
+    def active_count(self) -> int:
+        return self.count - len(self._free)
+
+    # ----- Interacción (misma semántica que FurnaceSystem) -----
+
+    def add_input(self, h: int, item_id: str, inventory: Inventory) -> bool:
+        """Agrega un item para procesar"""
+        code = _INPUT_CODE.get(item_id)
+        if code is None or not self._valid(h):
+            return False
+        cur = int(self.input_id[h])
+        if cur >= 0 and cur != code:
+            return False  # Ya hay otro item
+        if inventory.count_item(item_id) <= 0:
+            return False
+        inventory.remove_item(item_id, 1)
+        if cur == code:
+            self.input_qty[h] += 1
+        else:
+            self.input_id[h] = code
+            self.input_qty[h] = 1
+        return True
+
+    def add_fuel(self, h: int, item_id: str, inventory: Inventory) -> bool:
+        """Agrega combustible al horno"""
+        code = _FUEL_CODE.get(item_id)
+        if code is None or not self._valid(h):
+            return False
+        cur = int(self.fuel_id[h])
+        if cur >= 0 and cur != code:
+            return False  # Ya hay otro combustible
+        if inventory.count_item(item_id) <= 0:
+            return False
+        inventory.remove_item(item_id, 1)
+        if cur == code:
+            self.fuel_qty[h] += 1
+        else:
+            self.fuel_id[h] = code
+            self.fuel_qty[h] = 1
+        return True
+
+    def remove_output(self, h: int, inventory: Inventory) -> bool:
+        """Remueve items procesados del horno"""
+        if not self._valid(h):
+            return False
+        code = int(self.output_id[h])
+        qty = int(self.output_qty[h])
+        if code < 0 or qty <= 0:
+            return False
+        inventory.add_item(OUTPUT_IDS[code], qty)
+        self.output_id[h] = -1
+        self.output_qty[h] = 0
+        return True
+
+    def get_progress(self, h: int) -> float:
+        """Progreso del procesamiento (0.0 a 1.0)"""
+        if not self._valid(h) or not self.processing[h] or self.needed[h] <= 0:
+            return 0.0
+        return min(1.0, float(self.elapsed[h]) / float(self.needed[h]))
+
+    def get_fuel_progress(self, h: int) -> float:
+        """Progreso del combustible actual (0.0 a 1.0)"""
+        if not self._valid(h) or self.fuel_id[h] < 0:
+            return 0.0
+        return min(1.0, float(self.fuel_left[h]) / FUEL_BURN[int(self.fuel_id[h])])
+
+    def get_state(self, h: int) -> Dict[str, object]:
+        """Contenido del horno con ids de texto (para UI)."""
+        def name(table: List[str], code) -> Optional[str]:
+            return table[int(code)] if code >= 0 else None
+        return {
+            "input_item": name(INPUT_IDS, self.input_id[h]), "input_qty": int(self.input_qty[h]),
+            "fuel_item": name(FUEL_IDS, self.fuel_id[h]), "fuel_qty": int(self.fuel_qty[h]),
+            "output_item": name(OUTPUT_IDS, self.output_id[h]), "output_qty": int(self.output_qty[h]),
+            "is_processing": bool(self.processing[h]),
+        }
+
+    # ----- Simulación -----
+
+    def update(self, dt: float) -> None:
+        """Avanza todos los hornos 'dt' segundos (cualquier dt, ver advance)."""
+        self.advance(dt)
+
+    def advance(self, seconds: float) -> None:
+        """
+        Avanza todos los hornos 'seconds' segundos en forma cerrada (misma
+        cuenta que furnace_system.fast_forward, pero sobre las columnas).
+        Sirve igual para un frame que para saltos de tiempo grandes.
+        """
+        if self.count == 0 or seconds <= 0.0:
+            return
+        if np is None:
+            for h in range(self.count):
+                if self.alive[h]:
+                    self._advance_one(h, seconds)
+            return
+
+        n = self.count
+        input_id = self.input_id[:n]
+        input_qty = self.input_qty[:n]
+        fuel_id = self.fuel_id[:n]
+        fuel_qty = self.fuel_qty[:n]
+        output_id = self.output_id[:n]
+        processing = self.processing[:n]
+
+        has_input = self.alive[:n] & (input_id >= 0) & (input_qty > 0)
+        processing &= has_input
+        safe_in = np.where(has_input, input_id, 0)
+        out_code = self._tbl_out[safe_in]
+        # Salida ocupada por otro item: el horno queda detenido
+        act = has_input & ~((output_id >= 0) & (output_id != out_code))
+        if not act.any():
+            return
+
+        idx = np.flatnonzero(act)
+        item_time = self._tbl_time[safe_in[idx]]
+        has_fuel = fuel_id[idx] >= 0
+        burn = np.where(has_fuel, self._tbl_burn[np.where(has_fuel, fuel_id[idx], 0)], 0.0)
+        qty_in = input_qty[idx]
+        fq = np.where(burn > 0.0, fuel_qty[idx], 0)
+        fl = np.maximum(self.fuel_left[idx], 0.0)
+        start = np.where(processing[idx], self.elapsed[idx], 0.0)
+
+        total_fuel = fl + fq * burn
+        avail = np.minimum(seconds, total_fuel)
+        first = np.maximum(item_time - start, 0.0)
+
+        reached = avail >= first
+        done = np.where(reached, np.minimum(qty_in, 1 + ((avail - first) // item_time).astype(np.int64)), 0)
+        finished = reached & (done == qty_in)
+        used = np.where(finished, first + (done - 1) * item_time, avail)
+        elapsed = np.where(reached, np.where(finished, 0.0, avail - first - (done - 1) * item_time), start + avail)
+
+        # Combustible: primero el encendido, luego unidades nuevas
+        extra = np.maximum(used - fl, 0.0)
+        units = np.minimum(fq, np.ceil(extra / np.where(burn > 0.0, burn, 1.0)).astype(np.int64))
+        fl = np.where(used <= fl, fl - used, units * burn - extra)
+        fq = fq - units
+
+        self.fuel_left[idx] = fl
+        self.fuel_qty[idx] = fq
+        fuel_id[idx[fq <= 0]] = -1
+        self.elapsed[idx] = elapsed
+        self.needed[idx] = item_time
+        processing[idx] = (done < qty_in) & (used < total_fuel)
+
+        got = done > 0
+        if got.any():
+            gi = idx[got]
+            output_id[gi] = out_code[gi]
+            self.output_qty[gi] += self._tbl_qty[safe_in[gi]] * done[got]
+            input_qty[gi] -= done[got]
+            input_id[gi[input_qty[gi] <= 0]] = -1
+
+    def next_completion(self) -> Optional[float]:
+        """
+        Segundos hasta el próximo item terminado en cualquier horno, o None
+        si ninguno puede avanzar. Si antes se acaba el combustible, advance()
+        lo resuelve igual en forma cerrada y la nueva consulta da None.
+        """
+        best: Optional[float] = None
+        for h in range(self.count):
+            code = int(self.input_id[h])
+            if not self.alive[h] or code < 0 or self.input_qty[h] <= 0:
+                continue
+            if self.output_id[h] >= 0 and self.output_id[h] != RECIPE_OUT[code]:
+                continue
+            if self.fuel_left[h] <= 0.0 and (self.fuel_id[h] < 0 or self.fuel_qty[h] <= 0):
+                continue
+            start = float(self.elapsed[h]) if self.processing[h] else 0.0
+            left = max(0.0, RECIPE_TIME[code] - start)
+            if best is None or left < best:
+                best = left
+        return best
+
+    def _advance_one(self, h: int, seconds: float) -> None:
+        code = self.input_id[h]
+        if code < 0 or self.input_qty[h] <= 0:
+            self.processing[h] = False
+            return
+        out_code = RECIPE_OUT[code]
+        if self.output_id[h] >= 0 and self.output_id[h] != out_code:
+            return  # salida ocupada por otro item
+
+        burn = FUEL_BURN[self.fuel_id[h]] if self.fuel_id[h] >= 0 else 0.0
+        done, fuel_left, fuel_qty, elapsed, processing = fast_forward(
+            seconds, RECIPE_TIME[code], burn, self.input_qty[h],
+            self.fuel_left[h], self.fuel_qty[h], self.elapsed[h], self.processing[h],
+        )
+        self.fuel_left[h] = fuel_left
+        self.fuel_qty[h] = fuel_qty
+        if fuel_qty <= 0:
+            self.fuel_id[h] = -1
+        self.elapsed[h] = elapsed
+        self.needed[h] = RECIPE_TIME[code]
+        self.processing[h] = processing
+        if done > 0:
+            self.output_id[h] = out_code
+            self.output_qty[h] += RECIPE_QTY[code] * done
+            self.input_qty[h] -= done
+            if self.input_qty[h] <= 0:
+                self.input_id[h] = -1
+
+    # ----- Persistencia -----
+
+    def export_state(self) -> List[dict]:
+        """Lista serializable con el contenido de los hornos registrados por clave."""
+        out = []
+        for (scene_id, key), h in self._by_key.items():
+            st = self.get_state(h)
+            st.update({
+                "scene": scene_id, "key": key,
+                "fuel_left": float(self.fuel_left[h]),
+                "elapsed": float(self.elapsed[h]),
+            })
+            out.append(st)
+        return out
+
+    def import_state(self, states: List[dict]) -> None:
+        """Restaura lo exportado por export_state() (hornos desconocidos se crean)."""
+        for st in states or []:
+            h = self.add_furnace(int(st.get("scene", 0)), st.get("key"))
+            self._reset(h)
+            self.alive[h] = True
+            for field, table, codes in (("input", INPUT_IDS, _INPUT_CODE),
+                                        ("fuel", FUEL_IDS, _FUEL_CODE),
+                                        ("output", OUTPUT_IDS, _OUTPUT_CODE)):
+                item_id = st.get(f"{field}_item")
+                qty = int(st.get(f"{field}_qty", 0))
+                if item_id in codes and qty > 0:
+                    getattr(self, f"{field}_id")[h] = codes[item_id]
+                    getattr(self, f"{field}_qty")[h] = qty
+            self.fuel_left[h] = float(st.get("fuel_left", 0.0))
+            self.elapsed[h] = float(st.get("elapsed", 0.0))
+            if bool(st.get("is_processing", False)) and self.input_id[h] >= 0:
+                self.processing[h] = True
+                self.needed[h] = RECIPE_TIME[int(self.input_id[h])]
+
+    # ----- Internos -----
+
+    def _valid(self, h: int) -> bool:
+        return 0 <= h < self.count and bool(self.alive[h])
+
+    def _reset(self, h: int) -> None:
+        for name, _, empty in _FIELDS:
+            getattr(self, name)[h] = empty
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name, kind, empty in _FIELDS:
+            if np is not None:
+                dtype = {"bool": np.bool_, "float": np.float64, "int": np.int64}[kind]
+                col = np.full(extra, empty, dtype=dtype)
+                old = getattr(self, name, None)
+                setattr(self, name, col if old is None else np.concatenate((old, col)))
+            else:
+                old = getattr(self, name, None) or []
+                setattr(self, name, old + [empty] * extra)
+        self.capacity = capacity
+
+
+# Exportar
+__all__ = ["FurnaceBank"]
@@ -58,6 +58,60 @@ SMELTING_RECIPES: Dict[str, Tuple[str, int, float]] = {
 }
 
 
+def fast_forward(
+    seconds: float,
+    item_time: float,
+    burn_time: float,
+    input_qty: int,
+    fuel_left: float,
+    fuel_qty: int,
+    elapsed: float,
+    processing: bool,
+) -> Tuple[int, float, int, float, bool]:
+    """
+    Avance en forma cerrada (O(1)) de un horno durante 'seconds' segundos.
+    Cuenta cuántos items se completan y cuánto combustible se quema, incluyendo
+    el encendido de nuevas unidades de combustible a medida que se agotan.
+    Retorna (items_completados, fuel_left, fuel_qty, elapsed, processing).
+    """
+    if seconds <= 0.0 or input_qty <= 0 or item_time <= 0.0:
+        return (0, fuel_left, fuel_qty, elapsed, processing and input_qty > 0)
+
+    fuel_left = max(0.0, fuel_left)
+    if burn_time <= 0.0:
+        fuel_qty = 0
+    total_fuel = fuel_left + fuel_qty * burn_time
+    avail = min(seconds, total_fuel)
+    start = elapsed if processing else 0.0
+    first = max(0.0, item_time - start)
+
+    if avail < first:
+        done = 0
+        used = avail
+        elapsed = start + used
+    else:
+        done = min(input_qty, 1 + int((avail - first) // item_time))
+        if done == input_qty:
+            used = first + (done - 1) * item_time
+            elapsed = 0.0
+        else:
+            used = avail
+            elapsed = avail - first - (done - 1) * item_time
+
+    # Quemar combustible: primero el encendido, luego unidades nuevas
+    if used <= fuel_left:
+        fuel_left -= used
+    else:
+        extra = used - fuel_left
+        units = min(fuel_qty, int(-(-extra // burn_time)))
+        fuel_qty -= units
+        fuel_left = units * burn_time - extra
+
+    # Sigue procesando si quedan items y no se quedó sin combustible
+    processing = done < input_qty and used < total_fuel
+    return (done, fuel_left, fuel_qty, elapsed, processing)
+
+
 class FurnaceSystem:
     """Sistema de horno con combustible"""
     
@@ -187,6 +241,65 @@ class FurnaceSystem:
                     self.is_processing = False
                     self.process_time_elapsed = 0.0
     
+    def advance(self, seconds: float) -> int:
+        """
+        Avanza el horno 'seconds' segundos de una vez (forma cerrada). A
+        diferencia de update(), no pierde producción con pasos grandes
+        (carga de partida, dormir, tirones). Retorna los items completados.
+        """
+        if seconds <= 0.0:
+            return 0  # paso nulo (pausa): se conserva el progreso
+        if not self.input_item or self.input_qty <= 0:
+            self.is_processing = False
+            return 0
+        recipe = SMELTING_RECIPES.get(self.input_item)
+        if not recipe:
+            return 0
+        output_id, output_qty, process_time = recipe
+        if self.output_item and self.output_item != output_id:
+            return 0  # Salida ocupada por otro item
+        
+        burn_time = COMBUSTIBLES.get(self.fuel_item, 0.0) if self.fuel_item else 0.0
+        done, fuel_left, fuel_qty, elapsed, processing = fast_forward(
+            seconds, process_time, burn_time, self.input_qty,
+            self.fuel_time_remaining, self.fuel_qty,
+            self.process_time_elapsed, self.is_processing,
+        )
+        
+        self.fuel_time_remaining = fuel_left
+        self.fuel_qty = fuel_qty
+        if self.fuel_qty <= 0:
+            self.fuel_item = None
+        self.process_time_elapsed = elapsed
+        self.process_time_needed = process_time
+        self.is_processing = processing
+        
+        if done > 0:
+            self.output_item = output_id
+            self.output_qty += output_qty * done
+            self.input_qty -= done
+            if self.input_qty <= 0:
+                self.input_item = None
+        return done
+    
+    def next_completion(self) -> Optional[float]:
+        """
+        Segundos de juego hasta que termine el item en curso, o None si el
+        horno no puede avanzar (vacío, sin combustible o salida ocupada).
+        Game agenda con esto el próximo advance() en el reloj.
+        """
+        if not self.input_item or self.input_qty <= 0:
+            return None
+        recipe = SMELTING_RECIPES.get(self.input_item)
+        if not recipe:
+            return None
+        if self.output_item and self.output_item != recipe[0]:
+            return None
+        if self.fuel_time_remaining <= 0.0 and not (self.fuel_item and self.fuel_qty > 0):
+            return None
+        start = self.process_time_elapsed if self.is_processing else 0.0
+        return max(0.0, recipe[2] - start)
+
     def get_progress(self) -> float:
         """Retorna el progreso del procesamiento (0.0 a 1.0)"""
         if not self.is_processing or self.process_time_needed <= 0:
@@ -202,4 +315,4 @@ class FurnaceSystem:
 
 
 # Exportar
-__all__ = ["FurnaceSystem", "SMELTING_RECIPES", "COMBUSTIBLES"]
\ No newline at end of file
+__all__ = ["FurnaceSystem", "SMELTING_RECIPES", "COMBUSTIBLES", "fast_forward"]
\ No newline at end of file
@@ -1,8 +1,18 @@
 # game.py (Motor Orquestador)
 
 from __future__ import annotations
-from typing import Optional, List, Tuple, Any
-from pyray import *
+from typing import Optional, List, Tuple, Any, Dict
+import math
+import random
+try:
+    from pyray import *  # ventana, dibujo y cámara
+except ImportError:
+    # Sin raylib (headless): códigos de tecla de input_handler y cámara de sim_types
+    from input_handler import (
+        KEY_SPACE, KEY_E, KEY_T, KEY_ESCAPE, KEY_ENTER, KEY_BACKSPACE,
+        KEY_DOWN, KEY_UP, KEY_KP_ENTER, KEY_LEFT_SHIFT, KEY_RIGHT_SHIFT,
+    )
+    from sim_types import Camera as Camera2D, Vec2 as Vector2
 
 # --- Importaciones de Módulos ---
 from player import Player
@@ -12,14 +22,24 @@ from inventory import Inventory # Asumimos Inventory o InventoryUIController
 from map_system import MapSystem
 from ground_spawns import SpawnManager
 from save_system import SaveManager
-from animal_spawns import AnimalManager
+from animal_spawns import AnimalManager, EnterPlan, MAX_DETECT_RANGE
+from animals import unload_label_textures, warm_label_textures
+from flow_field import FlowField
+from line_of_sight import LineOfSight
+from pathfinding import PathFinder, PathRequest, FOUND
 from crafting_system import CraftingSystem, CRAFTING_RECIPES
 from furnace_system import FurnaceSystem, SMELTING_RECIPES, COMBUSTIBLES
+from furnace_bank import FurnaceBank
+from sim_types import Vec2
+from input_replay import InputRecorder, InputReplayer
+from scene_loader import SceneLoader, SceneJob
 
 # --- Importaciones de Clases Refactorizadas ---
 from game_config import (
     RESOLUTIONS, STATE_MAIN_MENU, STATE_CONFIG, STATE_PLAY, 
-    STATE_LOADING, STATE_SAVE_SLOTS, PAUSE_TAB_MAIN
+    STATE_LOADING, STATE_SAVE_SLOTS, PAUSE_TAB_MAIN,
+    SIM_HZ, MAX_FRAME_TIME, MAX_SIM_STEPS, FADE_TIME, ANIMAL_ENGINE,
+    PATH_NODES_PER_TICK, RESPAWN_INTERVAL, FURNACE_REACH
 )
 from game_clock import GameClock
 from asset_manager import AssetManager
@@ -28,41 +48,95 @@ from ui_manager import UIManager
 
 
 class Game:
-    def __init__(self, initial_res_index: int) -> None:
-        # 1. Inicialización de Ventana (se mantiene)
+    def __init__(self, initial_res_index: int, sim_hz: int = SIM_HZ,
+                 headless: bool = False, script: Optional[Any] = None,
+                 seed: Optional[int] = None) -> None:
+        # 0. Semilla de la simulación (misma semilla + misma entrada = misma partida)
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        random.seed(self.seed)
+
+        # 1. Inicialización de Ventana (headless: sin ventana, sin texturas ni dibujo)
+        self.headless = headless
         self.res_index = initial_res_index
         self.screen_w, self.screen_h = RESOLUTIONS[self.res_index]
         self.scene_w, self.scene_h = self.screen_w * 5, self.screen_h * 5
-        init_window(self.screen_w, self.screen_h, "ASTRA - NASA Space Apps")
-        set_exit_key(0)
+        if not headless:
+            init_window(self.screen_w, self.screen_h, "ASTRA - NASA Space Apps")
+            set_exit_key(0)
+        # Fuente de entrada: teclado/ratón real, guion (headless) o replay
+        if script is not None:
+            self.input = script
+        elif headless:
+            self.input = input_handler.ScriptedInput()
+        else:
+            self.input = input_handler.RaylibInput()
+        self.recorder: Optional[InputRecorder] = None
+        self.tick = 0
         # ... otros estados y configuración de ventana ...
         
         # 2. Inicialización de Estados
         self.state = STATE_MAIN_MENU
         self.running = True
         self.ingame_menu_open = False
+        self.loading = False
+        self.trans_elapsed = 0.0
+        self.player_dead = False
+        # Transición de escena: fundido a negro, carga en segundo plano y
+        # fundido de vuelta apenas la escena está lista
+        self.scene_loader = SceneLoader(threaded=not headless)
+        self._scene_job: Optional[SceneJob] = None
+        self._scene_target: Optional[Vec2] = None
+        self.load_progress = 0.0
+        self.fade_in_at: Optional[float] = None  # trans_elapsed al empezar el fundido de vuelta
         # ...
+
+        # Paso fijo: la simulación corre a sim_hz sin importar los FPS
+        self.sim_hz = max(1, int(sim_hz))
+        self.sim_dt = 1.0 / self.sim_hz
+        self._accumulator = 0.0
+        self.render_alpha = 1.0  # interpolación entre el tick anterior y el actual
         
         # 3. Managers
-        self.assets = AssetManager()
+        self.assets = AssetManager(load=not headless)
         self.world_mgr = WorldManager(self.scene_w, self.scene_h)
         self.ui_mgr = UIManager(self.screen_w, self.screen_h, self.assets, self._get_initial_ui_state()) # Usa un helper
         
         # 4. Sistemas Centrales
         self.clock = GameClock(seconds_per_day=300.0)
         self.save_mgr = SaveManager("saves")
+        self.slot_id: Optional[str] = None
         
         # 5. Entidades de Juego (usando WorldManager para escenas)
         self.scenes = self.world_mgr.scenes
         self.active_scene_index = 0
-        self.player = Player(self.world_mgr.scene_center(self.scenes[self.active_scene_index]))
+        self.player = Player(self.world_mgr.scene_center(self.scenes[self.active_scene_index]),
+                             load_sprites=not headless)
         self.inventory = Inventory(rows=4, cols=10)
         self.map_system = MapSystem(total_scenes=len(self.scenes))
         # ... Resto de sistemas (spawns, animals, crafting, furnace) ...
         self.spawns = SpawnManager(self.inventory)
-        self.animals = AnimalManager()
+        self.animals = AnimalManager(use_engine=ANIMAL_ENGINE)
+        self._flows: Dict[int, FlowField] = {}   # scene_id -> campo de flujo de persecución
+        self._los: Dict[int, LineOfSight] = {}    # scene_id -> línea de visión de los hostiles
+        # Clic para mover con pathfinding (por escena) y búsqueda en curso
+        self._pathfinders: Dict[int, PathFinder] = {}
+        self._path_req: Optional[PathRequest] = None
+        self._path_goal: Optional[Tuple[float, float]] = None
         self.crafting = CraftingSystem()
         self.furnace = FurnaceSystem()
+        # Hornos colocados en el mundo (todas las escenas, simulados en bloque)
+        self.furnace_bank = FurnaceBank()
+        for scene_idx, rects in self.world_mgr.furnaces_pos.items():
+            for i in range(len(rects)):
+                self.furnace_bank.add_furnace(scene_idx, i)
+        # Horno abierto: handle del banco, o None para el horno propio (self.furnace)
+        self.furnace_handle: Optional[int] = None
+        # Los hornos avanzan por eventos del reloj (próximo item terminado),
+        # no por tick; _furnace_time es el tiempo de juego hasta el que están al día
+        self._furnace_time = self.clock.elapsed
+        self._furnace_timer = None
+        # Reposición de items de la escena activa, agendada en tiempo de juego
+        self.clock.schedule_every(RESPAWN_INTERVAL, self._on_respawn)
 
         # 6. Cámara (se mantiene)
         self.camera = Camera2D()
@@ -70,6 +144,10 @@ class Game:
         self.camera.target = Vector2(self.player.position.x, self.player.position.y)
         self.camera.zoom = 1.0
         
+    def _update_camera_offset(self) -> None:
+        # Jugador centrado en pantalla
+        self.camera.offset = Vector2(self.screen_w / 2, self.screen_h / 2)
+
     def _get_initial_ui_state(self) -> dict:
         # Mantiene el estado inicial de la UI en el motor
         return {
@@ -85,18 +163,18 @@ class Game:
         if self.state == STATE_MAIN_MENU:
             # Lógica de navegación principal (UP/DOWN/ENTER)
             labels = ["Jugar", "Configuración", "Créditos", "Salir"]
-            if is_key_pressed(KEY_UP):
+            if self.input.key_pressed(KEY_UP):
                 self.ui_mgr.main_menu["selected"] = (self.ui_mgr.main_menu["selected"] - 1) % len(labels)
-            if is_key_pressed(KEY_DOWN):
+            if self.input.key_pressed(KEY_DOWN):
                 self.ui_mgr.main_menu["selected"] = (self.ui_mgr.main_menu["selected"] + 1) % len(labels)
-            if is_key_pressed(KEY_ENTER) or is_key_pressed(KEY_KP_ENTER):
+            if self.input.key_pressed(KEY_ENTER) or self.input.key_pressed(KEY_KP_ENTER):
                 self._activate_main_menu_item(labels[self.ui_mgr.main_menu["selected"]])
-            if is_key_pressed(KEY_T):
+            if self.input.key_pressed(KEY_T):
                 self.ui_mgr.init_main_menu_theme() # Delega
         
         if self.state == STATE_SAVE_SLOTS:
             # Lógica de escape y manejo de input para el modal de nueva partida
-            if is_key_pressed(KEY_ESCAPE):
+            if self.input.key_pressed(KEY_ESCAPE):
                 if self.ui_mgr.rename_slot_id:
                     self.ui_mgr.rename_slot_id = None
                 elif self.ui_mgr.newgame_modal_open:
@@ -106,10 +184,33 @@ class Game:
                     self.ui_mgr.init_main_menu_theme()
             
             if self.ui_mgr.newgame_modal_open:
-                self.ui_mgr.handle_newgame_name_input() # Delega
+                self.ui_mgr.handle_newgame_name_input(self.input) # Delega
+
+        if self.state == STATE_PLAY and self.crafting.is_open:
+            self._handle_crafting_input()
+
+        if self.state == STATE_PLAY and self.furnace.is_open:
+            if self.input.key_pressed(KEY_ESCAPE) or self.input.key_pressed(KEY_E):
+                self.close_furnace()
 
         # ... Resto de la lógica de input (play state) se mantiene ...
 
+    def _handle_crafting_input(self) -> None:
+        # Búsqueda, rueda y clic de la lista de recetas (en el tick: van al replay y funcionan headless)
+        inp = self.input
+        self.ui_mgr.recipe_view(self.crafting).handle_input(
+            self.inventory, self.screen_w, self.screen_h, inp.text(),
+            inp.key_pressed(KEY_BACKSPACE), inp.wheel(), inp.ui_click())
+        # [ENTER] craftea una vez la receta seleccionada; [SHIFT]+[ENTER] craftea el máximo
+        recipe_id = self.crafting.selected_recipe
+        if recipe_id is None:
+            return
+        if self.input.key_pressed(KEY_ENTER) or self.input.key_pressed(KEY_KP_ENTER):
+            if self.input.key_down(KEY_LEFT_SHIFT) or self.input.key_down(KEY_RIGHT_SHIFT):
+                self.crafting.craft_max(recipe_id, self.inventory)
+            else:
+                self.crafting.craft_item(recipe_id, self.inventory)
+
     def _activate_main_menu_item(self, label: str) -> None:
         # Lógica de cambio de estado (se mantiene en el motor)
         if label == "Jugar":
@@ -127,21 +228,396 @@ class Game:
     def _update(self, dt: float) -> None:
         if self.state == STATE_MAIN_MENU:
             self.ui_mgr.update_menu_fx(dt) # Delega
+        if self.loading:
+            self._update_loading(dt)
 
         # Lógica en juego
-        if (self.state == STATE_PLAY and not self.loading and
+        if (self.state == STATE_PLAY and not self.loading and not self.player_dead and
             not self.ingame_menu_open and not self.inventory.is_open and not self.map_system.is_open
             and not self.crafting.is_open and not self.furnace.is_open):
-            
-            # ... Lógica de movimiento, colisiones, etc. ...
-            pass 
+            self._update_world(dt)
 
-        # Actualizar sistemas
-        if self.state == STATE_PLAY and not self.loading and not self.player_dead:
-            self.furnace.update(dt)
+        # Actualizar sistemas: el reloj dispara lo agendado (hornos, reposición)
         if not self.ingame_menu_open and not self.player_dead:
             self.clock.update(dt) # Delega
+            if self.furnace.is_open:
+                self.sync_furnaces()  # progreso visible mientras la UI está abierta
+
+
+    # ---------- Eventos del reloj ----------
+    def sync_furnaces(self) -> None:
+        """
+        Pone los hornos al día con el reloj (forma cerrada) y agenda el
+        próximo item terminado. Llamar también tras cambiar su contenido.
+        """
+        dt = self.clock.elapsed - self._furnace_time
+        self._furnace_time = self.clock.elapsed
+        if dt > 0.0:
+            self.furnace.advance(dt)
+            self.furnace_bank.advance(dt)
+        self.clock.cancel(self._furnace_timer)
+        waits = [w for w in (self.furnace.next_completion(), self.furnace_bank.next_completion())
+                 if w is not None]
+        self._furnace_timer = self.clock.schedule(min(waits), self._on_furnace_timer) if waits else None
+
+    # ---------- Horno abierto (banco o propio) ----------
+    def open_furnace(self, handle: Optional[int] = None) -> None:
+        """Abre el horno 'handle' de furnace_bank (None: el horno propio, self.furnace)."""
+        self.furnace_handle = handle
+        self.furnace.is_open = True
+        self.sync_furnaces()
+
+    def close_furnace(self) -> None:
+        self.furnace.is_open = False
+        self.furnace_handle = None
+
+    def furnace_add_input(self, item_id: str) -> bool:
+        """Pasa una unidad de 'item_id' del inventario al horno abierto."""
+        self.sync_furnaces()
+        h = self.furnace_handle
+        ok = (self.furnace_bank.add_input(h, item_id, self.inventory) if h is not None
+              else self.furnace.add_input(item_id, self.inventory))
+        self.sync_furnaces()
+        return ok
+
+    def furnace_add_fuel(self, item_id: str) -> bool:
+        """Pasa una unidad de combustible del inventario al horno abierto."""
+        self.sync_furnaces()
+        h = self.furnace_handle
+        ok = (self.furnace_bank.add_fuel(h, item_id, self.inventory) if h is not None
+              else self.furnace.add_fuel(item_id, self.inventory))
+        self.sync_furnaces()
+        return ok
+
+    def furnace_take_output(self) -> bool:
+        """Lleva al inventario lo producido por el horno abierto."""
+        self.sync_furnaces()
+        h = self.furnace_handle
+        ok = (self.furnace_bank.remove_output(h, self.inventory) if h is not None
+              else self.furnace.remove_output(self.inventory))
+        self.sync_furnaces()
+        return ok
+
+    def furnace_state(self) -> Dict[str, Any]:
+        """Contenido del horno abierto con ids de texto (para la UI)."""
+        h = self.furnace_handle
+        if h is not None:
+            return self.furnace_bank.get_state(h)
+        f = self.furnace
+        return {
+            "input_item": f.input_item, "input_qty": f.input_qty,
+            "fuel_item": f.fuel_item, "fuel_qty": f.fuel_qty,
+            "output_item": f.output_item, "output_qty": f.output_qty,
+            "is_processing": f.is_processing,
+        }
+
+    def _furnace_near(self, pos: Vec2) -> Optional[int]:
+        """Handle del horno de la escena activa al alcance de 'pos' (o None)."""
+        rects = self.world_mgr.furnaces_pos.get(self.active_scene_index, [])
+        for i, (x, y, w, h) in enumerate(rects):
+            if (x - FURNACE_REACH <= pos.x <= x + w + FURNACE_REACH
+                    and y - FURNACE_REACH <= pos.y <= y + h + FURNACE_REACH):
+                return self.furnace_bank.handle_at(self.active_scene_index, i)
+        return None
+
+    def _on_furnace_timer(self) -> None:
+        self._furnace_timer = None
+        self.sync_furnaces()
+
+    def _on_respawn(self) -> None:
+        if self.state != STATE_PLAY or self.loading:
+            return
+        scene = self.scenes[self.active_scene_index]
+        self.spawns.respawn(scene.scene_id, scene.size, scene.polygon_world)
+
+    def _update_world(self, dt: float) -> None:
+        """Jugador, colisiones, animales, combate y recolección (un tick)."""
+        scene = self.scenes[self.active_scene_index]
+        player = self.player
+
+        p_input = self.input.player_input(player.position, player.destination, self.camera)
+        p_input = self._route_player(scene, p_input)
+        player.update(p_input, dt)
+        if self._player_collides(scene):
+            # Bloqueado: vuelve a la posición previa y cancela el destino
+            player.position.x, player.position.y = player.prev_position.x, player.prev_position.y
+            player.destination = Vec2(player.position.x, player.position.y)
+            self._cancel_path()
+
+        view_radius = math.hypot(self.screen_w, self.screen_h) * 0.5 / max(0.01, self.camera.zoom)
+        flow = self._flow_for(scene)
+        if flow is not None:
+            flow.update(player.position.x, player.position.y)
+        los = self._los_for(scene)
+        if los is not None:
+            los.begin_tick()
+        for dmg in self.animals.update(scene.scene_id, dt, player.position, view_radius, flow, los):
+            player.apply_damage(dmg)
+        if player.hp <= 0.0:
+            self.player_dead = True
+
+        if self.input.key_pressed(KEY_SPACE) and player.try_attack(dt):
+            self.animals.damage_in_radius(scene.scene_id, player.position, player.attack_radius, player.attack_damage)
+
+        if self.input.key_pressed(KEY_E):
+            # [E]: recoge el item al alcance; si no hay, abre el horno cercano
+            idx = self.spawns.find_pickup(scene.scene_id, player.position)
+            if idx is not None:
+                self.spawns.pickup(scene.scene_id, idx)
+            else:
+                h = self._furnace_near(player.position)
+                if h is not None:
+                    self.open_furnace(h)
+
+    def _route_player(self, scene: Scene, p_input: input_handler.PlayerInput) -> input_handler.PlayerInput:
+        """
+        Convierte un destino nuevo en una búsqueda de camino (repartida en
+        ticks con PATH_NODES_PER_TICK nodos) y hace que el jugador siga los
+        puntos del camino. Sin rejilla de colisión se camina en línea recta.
+        """
+        pf = self._pathfinder_for(scene)
+        if pf is None:
+            return p_input
+        player = self.player
+        goal = p_input.destination_point
+        if (p_input.has_destination and (goal.x, goal.y) != self._path_goal
+                and not (goal.x == player.destination.x and goal.y == player.destination.y)):
+            self._path_req = pf.request(player.position, goal)
+            self._path_goal = (goal.x, goal.y)
+            player.clear_path()
+            player.path_pending = True
+            player.destination = Vec2(goal.x, goal.y)
+
+        req = self._path_req
+        if req is not None and pf.step(req, PATH_NODES_PER_TICK):
+            self._path_req = None
+            if req.status == FOUND:
+                player.set_path(req.waypoints)
+            else:
+                player.clear_path()
+                player.destination = Vec2(player.position.x, player.position.y)
+            self._path_goal = (player.destination.x, player.destination.y)
+        # El jugador va al destino del camino, no en línea recta al clic
+        return p_input._replace(destination_point=player.destination, move_vector=Vec2(0.0, 0.0))
+
+    def _cancel_path(self) -> None:
+        self._path_req = None
+        self._path_goal = None
+        self.player.clear_path()
 
+    def _pathfinder_for(self, scene: Scene) -> Optional[PathFinder]:
+        if scene.collision_map is None:
+            return None
+        pf = self._pathfinders.get(scene.scene_id)
+        if pf is None:
+            pf = self._pathfinders[scene.scene_id] = PathFinder(
+                scene.collision_map, scene.grid_cell_size, agent_radius=self.player.size / 2)
+        return pf
+
+    def _flow_for(self, scene: Scene) -> Optional[FlowField]:
+        """Campo de flujo de la escena (None si no tiene rejilla de colisión)."""
+        if scene.collision_map is None:
+            return None
+        flow = self._flows.get(scene.scene_id)
+        if flow is None:
+            cs = scene.grid_cell_size
+            radius = int(math.ceil(MAX_DETECT_RANGE / cs)) + 2
+            flow = self._flows[scene.scene_id] = FlowField(scene.collision_map, cs, radius)
+        return flow
+
+    def _los_for(self, scene: Scene) -> Optional[LineOfSight]:
+        """Línea de visión de la escena (None si no tiene rejilla de colisión)."""
+        if scene.collision_map is None:
+            return None
+        los = self._los.get(scene.scene_id)
+        if los is None:
+            los = self._los[scene.scene_id] = LineOfSight(scene.collision_map, scene.grid_cell_size)
+        return los
+
+    def _player_collides(self, scene: Scene) -> bool:
+        s = self.player.size
+        x = self.player.position.x - s / 2
+        y = self.player.position.y - s / 2
+        cm = scene.collision_map
+        if cm is None:
+            return x < 0 or y < 0 or x + s > scene.size.x or y + s > scene.size.y
+        cs = scene.grid_cell_size
+        return cm.rect_collides(x, y, s, s, cs, cs)
+
+    # ---------- Partida ----------
+    def enter_scene(self, index: int, position: Optional[Vec2] = None) -> None:
+        """Activa una escena al instante: repone spawns/animales y ubica al jugador."""
+        self._place_player(index, position)
+        scene = self.scenes[self.active_scene_index]
+        self.spawns.on_enter_scene(scene.scene_id, scene.size, scene.polygon_world)
+        self.animals.on_enter_scene(scene.scene_id, scene.size, scene.polygon_world,
+                                    now=self._world_days())
+
+    def _world_days(self) -> float:
+        """Tiempo de juego en días (unidad del modelo de población)."""
+        return self.clock.elapsed / self.clock.seconds_per_day
+
+    def _place_player(self, index: int, position: Optional[Vec2]) -> None:
+        index = max(0, min(len(self.scenes) - 1, index))
+        if index != self.active_scene_index:
+            # La escena que se deja pasa al modelo de población agregado
+            prev = self.scenes[self.active_scene_index]
+            self.animals.on_leave_scene(prev.scene_id, self._world_days())
+        self.active_scene_index = index
+        scene = self.scenes[self.active_scene_index]
+        pos = position if position is not None else self.world_mgr.scene_center(scene)
+        self.player.position = Vec2(pos.x, pos.y)
+        self.player.destination = Vec2(pos.x, pos.y)
+        self.player.sync_prev()
+        self._cancel_path()
+        self.camera.target = Vector2(pos.x, pos.y)
+        if not self.headless:
+            # Vecinas en el mapa: probable próximo viaje, se construyen en segundo plano
+            self.world_mgr.prewarm(self.map_system.neighbours(self.active_scene_index))
+
+    def change_scene(self, index: int, position: Optional[Vec2] = None) -> None:
+        """
+        Viaja a otra escena con transición: la preparación (spawns, animales)
+        corre en el hilo de carga mientras la pantalla funde a negro.
+        """
+        if self.loading:
+            return
+        index = max(0, min(len(self.scenes) - 1, index))
+        self.state = STATE_LOADING
+        self.loading = True
+        self.trans_elapsed = 0.0
+        self.fade_in_at = None
+        self.load_progress = 0.0
+        self.map_system.is_open = False
+        self._scene_target = position
+        self._scene_job = self.scene_loader.submit(index, self._scene_steps(index))
+
+    def _scene_steps(self, index: int) -> list:
+        # Generador propio sembrado desde el principal: el resultado no
+        # depende de cuándo corre el hilo de carga
+        rng = random.Random(random.getrandbits(64))
+        now = self._world_days()
+
+        def spawns(job: SceneJob) -> list:
+            scene = job.results["scene"]
+            return self.spawns.prepare_enter(scene.scene_id, scene.size, scene.polygon_world, rng)
+
+        def animals(job: SceneJob) -> EnterPlan:
+            scene = job.results["scene"]
+            if not self.headless:
+                # Las etiquetas de la escena se suben a la GPU en el hilo principal, durante el fundido
+                job.on_main(warm_label_textures, self.animals.species_for(scene.scene_id))
+            return self.animals.prepare_enter(scene.scene_id, scene.size, scene.polygon_world, rng, now)
+
+        # La escena misma (polígono y colisiones) se construye en el hilo si aún no existe
+        build_w = 0.0 if self.world_mgr.is_built(index) else 2.0
+        return [
+            ("scene", build_w, lambda job: self.world_mgr.get_scene(index)),
+            ("spawns", 1.0, spawns),
+            ("animals", 1.0, animals),
+        ]
+
+    def _update_loading(self, dt: float) -> None:
+        self.trans_elapsed += dt
+        job = self._scene_job
+        if job is not None:
+            self.scene_loader.pump()
+            self.load_progress = job.progress
+            # Se cambia de escena con la pantalla ya en negro y el trabajo listo
+            if self.trans_elapsed >= FADE_TIME and job.done:
+                self._finish_scene_change(job)
+        elif self.fade_in_at is not None and self.trans_elapsed - self.fade_in_at >= FADE_TIME:
+            self.loading = False
+            self.fade_in_at = None
+            self.state = STATE_PLAY
+
+    def _finish_scene_change(self, job: SceneJob) -> None:
+        self._scene_job = None
+        self.scene_loader.job = None
+        if job.error is not None or job.cancelled:
+            print("[game] Error preparando la escena, se carga en el hilo principal:", job.error)
+            self.enter_scene(job.scene_index, self._scene_target)
+        else:
+            self._place_player(job.scene_index, self._scene_target)
+            scene = self.scenes[self.active_scene_index]
+            self.spawns.commit_enter(scene.scene_id, job.results.get("spawns", []))
+            self.animals.commit_enter(scene.scene_id, job.results["animals"])
+        self._scene_target = None
+        self.load_progress = 1.0
+        self.fade_in_at = self.trans_elapsed
+
+    def start_game(self, scene_index: int = 0, position: Optional[Vec2] = None) -> None:
+        self.state = STATE_PLAY
+        self.loading = False
+        self.player_dead = False
+        self.scene_loader.cancel()
+        self._scene_job = None
+        self.enter_scene(scene_index, position)
+
+    def save_game(self, name: str = "Partida") -> str:
+        data: Dict[str, Any] = {
+            "name": name,
+            "scene_index": self.active_scene_index + 1,
+            "clock_elapsed": self.clock.elapsed,
+            "seconds_per_day": self.clock.seconds_per_day,
+            "player": {
+                "x": self.player.position.x, "y": self.player.position.y,
+                "hp": self.player.hp, "stamina": self.player.stamina,
+            },
+            "inventory": self.inventory.export_state(),
+            "furnaces": self._furnace_state(),
+        }
+        self.slot_id = self.save_mgr.save(self.slot_id or "", data)
+        return self.slot_id
+
+    def _furnace_state(self) -> list:
+        self.sync_furnaces()
+        return self.furnace_bank.export_state()
+
+    def load_game(self, slot_id: str) -> bool:
+        data = self.save_mgr.load(slot_id)
+        if data is None:
+            return False
+        self.slot_id = slot_id
+        self.clock.seconds_per_day = max(1.0, float(data.get("seconds_per_day", 300.0)))
+        self.clock.set_elapsed(float(data.get("clock_elapsed", 0.0)))
+        if "inventory" in data:
+            self.inventory.import_state(data["inventory"])
+        if "furnaces" in data:
+            self.furnace_bank.import_state(data["furnaces"])
+        # Lo cargado ya está al día con el reloj restaurado
+        self._furnace_time = self.clock.elapsed
+        self.sync_furnaces()
+        p = data.get("player", {})
+        pos = Vec2(float(p["x"]), float(p["y"])) if "x" in p and "y" in p else None
+        self.start_game(int(data.get("scene_index", 1)) - 1, pos)
+        self.player.hp = float(p.get("hp", self.player.max_hp))
+        self.player.stamina = float(p.get("stamina", self.player.max_stamina))
+        return True
+
+    def _step(self, frame_time: float) -> int:
+        """Acumula el tiempo real del cuadro y corre los ticks fijos que correspondan."""
+        self._accumulator += min(max(0.0, frame_time), MAX_FRAME_TIME)
+        steps = 0
+        while self._accumulator >= self.sim_dt and steps < MAX_SIM_STEPS:
+            self.input.begin_tick(self.tick)
+            self._handle_input()
+            self._update(self.sim_dt)
+            self.tick += 1
+            self._accumulator -= self.sim_dt
+            steps += 1
+        if self._accumulator >= self.sim_dt:
+            # Máquina lenta: se descarta el atraso en vez de acumularlo
+            self._accumulator %= self.sim_dt
+        self.render_alpha = self._accumulator / self.sim_dt
+        return steps
+
+    def skip_time(self, seconds: float) -> None:
+        """Salto de tiempo (dormir, progreso offline): reloj y hornos avanzan de una vez."""
+        if seconds <= 0.0:
+            return
+        self.clock.advance(seconds)
+        self.sync_furnaces()
 
     # ---------- _draw (Delega a UIManager) ----------
     def _draw(self) -> None:
@@ -155,23 +631,68 @@ class Game:
         elif self.state == STATE_SAVE_SLOTS:
             self.ui_mgr.draw_save_slots(self.save_mgr)
         elif self.state in (STATE_PLAY, STATE_LOADING):
+            # La cámara sigue la misma posición interpolada con la que se dibuja al jugador
+            self.camera.target.x, self.camera.target.y = self.player.render_position(self.render_alpha)
             # Dibuja el estado PLAY y la pantalla de carga (delegando los sistemas)
             self.ui_mgr.draw_play_state(
                 scene=self.scenes[self.active_scene_index], player=self.player, 
                 camera=self.camera, map_system=self.map_system, inventory=self.inventory, 
                 crafting=self.crafting, furnace=self.furnace, ingame_menu_open=self.ingame_menu_open, 
-                player_dead=self.player_dead, clock=self.clock
+                player_dead=self.player_dead, clock=self.clock, alpha=self.render_alpha,
+                animals=self.animals, spawns=self.spawns
             )
-            self.ui_mgr.draw_loading_overlay(self.loading, self.trans_elapsed) 
+            self.ui_mgr.draw_loading_overlay(self.loading, self.trans_elapsed,
+                                             self.load_progress, self.fade_in_at)
         
         end_drawing()
         
+    # ---------- Grabación / replay de entrada ----------
+    def start_recording(self, path: str) -> None:
+        """Graba la entrada de cada tick en 'path' (ver input_replay)."""
+        self.stop_recording()
+        self.recorder = InputRecorder(self.input, path, self.seed, self.sim_hz)
+        self.input = self.recorder
+
+    def stop_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.input = self.recorder.source
+            self.recorder = None
+
+    @classmethod
+    def from_replay(cls, path: str, initial_res_index: int = 5, headless: bool = True) -> "Game":
+        """Crea un Game que reproduce un log (misma semilla y Hz que la grabación)."""
+        replayer = InputReplayer(path)
+        return cls(initial_res_index, sim_hz=replayer.sim_hz, headless=headless,
+                   script=replayer, seed=replayer.seed)
+
+    def run_headless(self, ticks: int, autosave_every: int = 0) -> int:
+        """
+        Corre 'ticks' ticks de simulación sin ventana ni dibujo, tan rápido
+        como se pueda (soak tests, benchmarks, servidor). Retorna los ticks
+        ejecutados (se corta antes si el jugador muere o se pide salir).
+        """
+        if self.state not in (STATE_PLAY, STATE_LOADING):
+            self.start_game(self.active_scene_index)
+        done = 0
+        while done < ticks and self.running and not self.player_dead:
+            self.input.begin_tick(self.tick)
+            self._handle_input()
+            self._update(self.sim_dt)
+            self.tick += 1
+            done += 1
+            if autosave_every > 0 and self.tick % autosave_every == 0:
+                self.save_game()
+        return done
+
     def run(self) -> None:
         # Bucle principal (se mantiene en el motor)
         while self.running and not window_should_close():
-            dt = get_frame_time()
-            self._handle_input()
-            self._update(dt)
+            self.input.poll(self.camera)
+            self._step(get_frame_time())
             self._draw()
+        self.stop_recording()
+        self.scene_loader.cancel()
         self.assets.unload_assets() # Delega la limpieza
+        unload_label_textures()
         close_window()
\ No newline at end of file
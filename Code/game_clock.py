@@ -1,16 +1,122 @@
 # game_clock.py
 
-from typing import List, ClassVar
+from typing import Any, Callable, List, ClassVar, Optional, Tuple
+
+from timer_wheel import TimerWheel, TimerHandle
 
 class GameClock:
     SEASONS: ClassVar[List[str]] = ["Primavera", "Verano", "Otoño", "Invierno"]
-    
+    SEASON_LEN: ClassVar[int] = 30  # días por estación
+    # Velocidades disponibles: pausa, normal, rápida y de pruebas
+    TIME_SCALES: ClassVar[Tuple[float, ...]] = (0.0, 1.0, 10.0, 1000.0)
+
     def __init__(self, seconds_per_day: float = 300.0) -> None:
         self.seconds_per_day = max(1.0, seconds_per_day)
         self.elapsed = 0.0
+        self.time_scale = 1.0
+        # Eventos agendados en tiempo de juego (clima, reapariciones, ...)
+        self.timers = TimerWheel(tick_seconds=0.05)
+
+        # Callbacks de calendario: se llaman una vez por cada límite cruzado
+        self._on_hour: List[Callable[[int, int], Any]] = []      # (hora 0..23, día)
+        self._on_day: List[Callable[[int], Any]] = []            # (día)
+        self._on_season: List[Callable[[str, int], Any]] = []    # (estación, día)
+        self._hour_index = 0   # horas completas desde el inicio
+
+        # Caché de time_hhmm() (cambia una vez por minuto de juego)
+        self._hhmm_minute = -1
+        self._hhmm = "00:00"
+
+    # ----- Tiempo -----
 
     def update(self, dt: float) -> None:
-        self.elapsed += dt
+        """Avanza con el tiempo real del tick, escalado por time_scale."""
+        if self.time_scale > 0.0 and dt > 0.0:
+            self.advance(dt * self.time_scale)
+
+    def advance(self, seconds: float) -> None:
+        """Avanza 'seconds' de juego sin escalar (dormir, saltos de tiempo)."""
+        if seconds <= 0.0:
+            return
+        self.elapsed += seconds
+        self.timers.advance(self.elapsed)
+        self._fire_boundaries()
+
+    def set_elapsed(self, elapsed: float) -> None:
+        """
+        Fija el tiempo (al cargar partida) sin disparar callbacks de calendario
+        ni timers: la agenda se reubica en el tiempo nuevo (hacia atrás o
+        adelante) y cada evento conserva lo que le faltaba.
+        """
+        self.elapsed = max(0.0, elapsed)
+        self.timers.reset(self.elapsed)
+        self._hour_index = self._current_hour_index()
+        self._hhmm_minute = -1
+
+    def set_time_scale(self, scale: float) -> None:
+        self.time_scale = max(0.0, float(scale))
+
+    def cycle_time_scale(self) -> float:
+        """Pasa a la siguiente velocidad de TIME_SCALES y la retorna."""
+        scales = self.TIME_SCALES
+        nxt = next((s for s in scales if s > self.time_scale), scales[0])
+        self.time_scale = nxt
+        return nxt
+
+    @property
+    def paused(self) -> bool:
+        return self.time_scale <= 0.0
+
+    # ----- Agenda -----
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Llama callback(*args) dentro de 'delay' segundos de juego."""
+        return self.timers.schedule(delay, callback, *args)
+
+    def schedule_every(self, interval: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        return self.timers.schedule_every(interval, callback, *args)
+
+    def cancel(self, handle: Optional[TimerHandle]) -> None:
+        self.timers.cancel(handle)
+
+    # ----- Calendario -----
+
+    def on_hour(self, callback: Callable[[int, int], Any]) -> None:
+        """callback(hora, día) al empezar cada hora de juego."""
+        self._on_hour.append(callback)
+
+    def on_day(self, callback: Callable[[int], Any]) -> None:
+        """callback(día) al empezar cada día."""
+        self._on_day.append(callback)
+
+    def on_season(self, callback: Callable[[str, int], Any]) -> None:
+        """callback(estación, día) al empezar cada estación."""
+        self._on_season.append(callback)
+
+    def _current_hour_index(self) -> int:
+        return int(self.elapsed * 24.0 // self.seconds_per_day)
+
+    def _fire_boundaries(self) -> None:
+        new_index = self._current_hour_index()
+        if new_index <= self._hour_index:
+            return
+        old_index = self._hour_index
+        self._hour_index = new_index
+        if not (self._on_hour or self._on_day or self._on_season):
+            return
+        for h in range(old_index + 1, new_index + 1):
+            hour = h % 24
+            day = h // 24 + 1
+            for cb in self._on_hour:
+                cb(hour, day)
+            if hour != 0:
+                continue
+            for cb in self._on_day:
+                cb(day)
+            if (day - 1) % self.SEASON_LEN == 0:
+                season = self.SEASONS[((day - 1) // self.SEASON_LEN) % len(self.SEASONS)]
+                for cb in self._on_season:
+                    cb(season, day)
 
     @property
     def day_fraction(self) -> float:
@@ -20,13 +126,37 @@ class GameClock:
     def day(self) -> int:
         return int(self.elapsed // self.seconds_per_day) + 1
 
+    @property
+    def hour(self) -> int:
+        return int(self.day_fraction * 24)
+
     def time_hhmm(self) -> str:
         total_minutes = int(self.day_fraction * 24 * 60)
+        if total_minutes == self._hhmm_minute:
+            return self._hhmm
         hh = total_minutes // 60
         mm = total_minutes % 60
-        return f"{hh:02d}:{mm:02d}"
+        self._hhmm_minute = total_minutes
+        self._hhmm = f"{hh:02d}:{mm:02d}"
+        return self._hhmm
 
     def season_name(self) -> str:
-        season_len = 30
-        idx = ((self.day - 1) // season_len) % len(self.SEASONS)
-        return self.SEASONS[idx]
\ No newline at end of file
+        idx = ((self.day - 1) // self.SEASON_LEN) % len(self.SEASONS)
+        return self.SEASONS[idx]
+
+
+if __name__ == "__main__":
+    # Comprobación rápida: fijar el tiempo hacia atrás o adelante deja la
+    # agenda alineada con el reloj y sin disparos durante la carga.
+    clock = GameClock()
+    fired: List[float] = []
+    clock.schedule_every(150.0, lambda: fired.append(clock.elapsed))
+    for t in (5000.0, 100.0, 9000.0):
+        clock.set_elapsed(t)
+        assert abs(clock.timers.now - clock.elapsed) < clock.timers.tick_seconds, (t, clock.timers.now)
+    assert not fired, fired
+    clock.schedule(10.0, lambda: fired.append(clock.elapsed))
+    for _ in range(200):
+        clock.advance(0.5)
+    assert len(fired) == 1 and abs(fired[0] - 9010.0) < 0.1, fired
+    print("[game_clock] OK")
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 from typing import Optional, List, Tuple
-from pyray import Color, Vector2 # Solo por tipo
+try:
+    from pyray import Color, Vector2 # Solo por tipo
+except ImportError:
+    pass
 
 # ----------------- Configuración Global -----------------
 RESOLUTIONS: List[Tuple[int, int]] = [
@@ -11,11 +14,22 @@ RESOLUTIONS: List[Tuple[int, int]] = [
 ]
 
 MIN_ZOOM, MAX_ZOOM = 0.35, 3.0
+# La carga termina cuando la escena está lista; TRANSITION_TIME/HOLD_TIME
+# quedan solo como referencia de duración típica
 TRANSITION_TIME = 3.0
 FADE_TIME = 0.5
 HOLD_TIME = max(0.0, TRANSITION_TIME - 2.0 * FADE_TIME)
 LOADING_IMAGE_PATH: str | None = None
 
+# ----------------- Simulación (paso fijo) -----------------
+SIM_HZ = 60                # ticks de simulación por segundo
+MAX_FRAME_TIME = 0.25      # tope de tiempo real por cuadro (evita espiral tras un tirón)
+MAX_SIM_STEPS = 8          # ticks máximos por cuadro; el resto del atraso se descarta
+ANIMAL_ENGINE = False      # True: animales en arreglos NumPy (animal_engine), para escenas muy pobladas
+PATH_NODES_PER_TICK = 800  # nodos de A* por tick; las búsquedas largas siguen en el tick siguiente
+FURNACE_REACH = 36.0      # px alrededor del rectángulo de un horno para usarlo con [E]
+RESPAWN_INTERVAL = 150.0  # s de juego entre reposiciones de items en la escena activa (medio día)
+
 # ----------------- Estados del Juego -----------------
 STATE_MAIN_MENU   = "MAIN_MENU"
 STATE_CONFIG      = "CONFIG"
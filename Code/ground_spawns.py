@@ -1,8 +1,14 @@
 # ground_spawns.py
 from __future__ import annotations
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import random
-from pyray import *
+
+from sim_types import Vec2, RGBA, to_color
+
+try:
+    from pyray import *  # solo para dibujar / input en ventana
+except ImportError:
+    pass
 
 # --- Import robusto de SPAWN_TABLES ---
 try:
@@ -27,7 +33,7 @@ except Exception as e:
 
 class GroundItem:
     __slots__=("item_id","qty","pos","color","size")
-    def __init__(self, item_id: str, qty: int, pos: Vector2, color: Color, size: int = 14) -> None:
+    def __init__(self, item_id: str, qty: int, pos: Vec2, color: RGBA, size: int = 14) -> None:
         self.item_id = item_id
         self.qty = qty
         self.pos = pos
@@ -40,13 +46,20 @@ class SpawnManager:
         self.inventory = inventory
         self.items_by_scene: Dict[int, List[GroundItem]] = {}
         self.visited: Dict[int, int] = {}  # scene_id -> veces visitada
-        self._color_cache: Dict[str, Color] = {}
+        self._color_cache: Dict[str, RGBA] = {}
 
     # --- API ---
-    def on_enter_scene(self, scene_id: int, scene_size: Vector2, polygon: Optional[List[Vector2]] = None) -> None:
+    def on_enter_scene(self, scene_id: int, scene_size: Vec2, polygon: Optional[List[Vec2]] = None) -> None:
+        self.commit_enter(scene_id, self.prepare_enter(scene_id, scene_size, polygon))
+
+    def prepare_enter(self, scene_id: int, scene_size: Vec2, polygon: Optional[List[Vec2]] = None,
+                      rng: Any = random) -> List[GroundItem]:
+        """
+        Calcula los items a reponer sin modificar el estado (se puede llamar
+        desde el hilo de carga). 'rng' es un random.Random o el módulo random.
+        """
         count = self.visited.get(scene_id, 0)
         first_time = count == 0
-        self.visited[scene_id] = count + 1
 
         existing = len(self.items_by_scene.get(scene_id, []))
         target = 0
@@ -56,24 +69,52 @@ class SpawnManager:
 
         if first_time:
             a, b = first_rng
-            target = random.randint(a, b)
+            target = rng.randint(a, b)
         else:
             a, b = repeat_rng
             if existing < a:
-                target = random.randint(max(0, a - existing), max(0, b - existing))
+                target = rng.randint(max(0, a - existing), max(0, b - existing))
 
+        out: List[GroundItem] = []
         if target > 0:
-            batch = self._roll_items(scene_id, target)
-            lst = self.items_by_scene.setdefault(scene_id, [])
+            batch = self._roll_items(scene_id, target, rng)
             for item_id, qty in batch:
-                pos = self._random_position(scene_size, polygon)
+                pos = self._random_position(scene_size, polygon, rng)
                 color = self._get_color(item_id)
-                lst.append(GroundItem(item_id, qty, pos, color))
+                out.append(GroundItem(item_id, qty, pos, color))
+        return out
+
+    def commit_enter(self, scene_id: int, items: List[GroundItem]) -> None:
+        """Registra la visita y agrega lo calculado por prepare_enter."""
+        self.visited[scene_id] = self.visited.get(scene_id, 0) + 1
+        if items:
+            self.items_by_scene.setdefault(scene_id, []).extend(items)
+
+    def respawn(self, scene_id: int, scene_size: Vec2, polygon: Optional[List[Vec2]] = None,
+                rng: Any = random) -> int:
+        """
+        Reposición periódica en la escena activa (Game la agenda en el reloj).
+        Misma regla que al volver a una escena, sin contar como visita.
+        """
+        if self.visited.get(scene_id, 0) == 0:
+            return 0
+        items = self.prepare_enter(scene_id, scene_size, polygon, rng)
+        if items:
+            self.items_by_scene.setdefault(scene_id, []).extend(items)
+        return len(items)
+
+    def update(self, scene_id: int, player_pos: Vec2, pickup_radius: float = 22.0) -> None:
+        idx = self.find_pickup(scene_id, player_pos, pickup_radius)
+        if idx is not None:
+            self.draw_pickup_prompt(scene_id, idx)
+            if is_key_pressed(KEY_E):
+                self.pickup(scene_id, idx)
 
-    def update(self, scene_id: int, player_pos: Vector2, pickup_radius: float = 22.0) -> None:
+    def find_pickup(self, scene_id: int, player_pos: Vec2, pickup_radius: float = 22.0) -> Optional[int]:
+        """Índice del item más cercano dentro del radio (o None). No dibuja."""
         arr = self.items_by_scene.get(scene_id, [])
         if not arr:
-            return
+            return None
         # más cercano dentro del radio
         best_i = -1
         best_d2 = pickup_radius * pickup_radius
@@ -84,27 +125,39 @@ class SpawnManager:
             if d2 <= best_d2:
                 best_d2 = d2
                 best_i = i
-        if best_i >= 0:
-            gi = arr[best_i]
-            label = f"[E] Recoger {gi.item_id} x{gi.qty}"
-            fs = 18
-            tw = measure_text(label, fs)
-            draw_rectangle(int(gi.pos.x - tw/2) - 6, int(gi.pos.y - 32), tw + 12, fs + 8, Color(0,0,0,150))
-            draw_text(label, int(gi.pos.x - tw/2), int(gi.pos.y - 28), fs, Color(255,255,255,240))
-            if is_key_pressed(KEY_E):
-                self.inventory.add_item(gi.item_id, gi.qty)
-                arr.pop(best_i)
+        return best_i if best_i >= 0 else None
+
+    def pickup(self, scene_id: int, index: int) -> bool:
+        """Pasa el item del suelo al inventario."""
+        arr = self.items_by_scene.get(scene_id, [])
+        if not (0 <= index < len(arr)):
+            return False
+        gi = arr[index]
+        self.inventory.add_item(gi.item_id, gi.qty)
+        arr.pop(index)
+        return True
+
+    def draw_pickup_prompt(self, scene_id: int, index: int) -> None:
+        arr = self.items_by_scene.get(scene_id, [])
+        if not (0 <= index < len(arr)):
+            return
+        gi = arr[index]
+        label = f"[E] Recoger {gi.item_id} x{gi.qty}"
+        fs = 18
+        tw = measure_text(label, fs)
+        draw_rectangle(int(gi.pos.x - tw/2) - 6, int(gi.pos.y - 32), tw + 12, fs + 8, Color(0,0,0,150))
+        draw_text(label, int(gi.pos.x - tw/2), int(gi.pos.y - 28), fs, Color(255,255,255,240))
 
     def draw(self, scene_id: int) -> None:
         arr = self.items_by_scene.get(scene_id, [])
         for gi in arr:
             x = int(gi.pos.x - gi.size/2)
             y = int(gi.pos.y - gi.size/2)
-            draw_rectangle(x, y, gi.size, gi.size, gi.color)
+            draw_rectangle(x, y, gi.size, gi.size, to_color(gi.color))
             draw_rectangle_lines(x, y, gi.size, gi.size, Color(0,0,0,170))
 
     # --- Internos ---
-    def _roll_items(self, scene_id: int, n: int) -> List[Tuple[str,int]]:
+    def _roll_items(self, scene_id: int, n: int, rng: Any = random) -> List[Tuple[str,int]]:
         tbl = SPAWN_TABLES.get(scene_id, SPAWN_TABLES.get(1, {}))
         items = tbl.get("items", {})
         if not items:
@@ -113,7 +166,7 @@ class SpawnManager:
         total_w = sum(w for _, w, _ in pool) or 1
         out: List[Tuple[str,int]] = []
         for _ in range(n):
-            r = random.uniform(0, total_w)
+            r = rng.uniform(0, total_w)
             acc = 0.0
             pick = pool[-1]
             for entry in pool:
@@ -122,37 +175,37 @@ class SpawnManager:
                     pick = entry
                     break
             qmin, qmax = pick[2]
-            out.append((pick[0], random.randint(qmin, qmax)))
+            out.append((pick[0], rng.randint(qmin, qmax)))
         return out
 
-    def _get_color(self, item_id: str) -> Color:
+    def _get_color(self, item_id: str) -> RGBA:
         col = self._color_cache.get(item_id)
         if col is not None:
             return col
         try:
-            col = self.inventory.item_database[item_id].icon_color
+            col = RGBA.of(self.inventory.item_database[item_id].icon_color)
         except Exception:
-            col = Color(200,200,200,255)
+            col = RGBA(200,200,200,255)
         self._color_cache[item_id] = col
         return col
 
-    def _random_position(self, scene_size: Vector2, polygon: Optional[List[Vector2]]) -> Vector2:
+    def _random_position(self, scene_size: Vec2, polygon: Optional[List[Vec2]], rng: Any = random) -> Vec2:
         pad = 48
         if not polygon:
-            return Vector2(random.uniform(pad, scene_size.x - pad),
-                           random.uniform(pad, scene_size.y - pad))
+            return Vec2(rng.uniform(pad, scene_size.x - pad),
+                           rng.uniform(pad, scene_size.y - pad))
         # muestreo por rechazo dentro del polígono (si existe)
         min_x = min(p.x for p in polygon); max_x = max(p.x for p in polygon)
         min_y = min(p.y for p in polygon); max_y = max(p.y for p in polygon)
         for _ in range(50):
-            x = random.uniform(min_x + pad, max_x - pad)
-            y = random.uniform(min_y + pad, max_y - pad)
+            x = rng.uniform(min_x + pad, max_x - pad)
+            y = rng.uniform(min_y + pad, max_y - pad)
             if self._point_in_polygon(x, y, polygon):
-                return Vector2(x, y)
-        return Vector2(random.uniform(pad, scene_size.x - pad),
-                       random.uniform(pad, scene_size.y - pad))
+                return Vec2(x, y)
+        return Vec2(rng.uniform(pad, scene_size.x - pad),
+                       rng.uniform(pad, scene_size.y - pad))
 
-    def _point_in_polygon(self, x: float, y: float, pts: List[Vector2]) -> bool:
+    def _point_in_polygon(self, x: float, y: float, pts: List[Vec2]) -> bool:
         inside = False
         j = len(pts) - 1
         for i in range(len(pts)):
@@ -0,0 +1,122 @@
+# herding.py
+# Comportamiento de manada tipo boids para animales amistosos: cohesión
+# (ir hacia el centro de los vecinos), separación (no encimarse) y
+# alineación (copiar su rumbo), solo entre animales de la misma especie.
+# Se activa por especie con la clave "herd" de ANIMAL_TABLES; los vecinos
+# se buscan en una SpatialGrid por especie (celda = radio de la especie).
+from __future__ import annotations
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, List, Optional
+
+from animals import Animal
+from spatial_grid import SpatialGrid
+
+
+@dataclass
+class HerdParams:
+    radius: float = 90.0            # distancia a la que se ven los vecinos
+    separation_dist: float = 28.0   # por debajo de esto se empujan
+    cohesion: float = 0.6
+    separation: float = 1.4
+    alignment: float = 0.8
+    wander: float = 1.0             # peso del rumbo propio (deambular)
+    turn_rate: float = 3.0          # 1/s: qué tan rápido gira hacia el rumbo de manada
+    max_neighbours: int = 10        # tope de vecinos por animal (manadas densas)
+
+
+def herd_params(entry: Dict[str, Any]) -> Optional[HerdParams]:
+    """
+    Parámetros de manada de una entrada de ANIMAL_TABLES: "herd": True usa
+    los valores por defecto y un dict los sobrescribe ({"radius": 120, ...}).
+    """
+    h = entry.get("herd")
+    if not h:
+        return None
+    if h is True:
+        return HerdParams()
+    known = {f.name for f in fields(HerdParams)}
+    unknown = set(h) - known
+    if unknown:
+        print("[herding] Aviso: claves de manada desconocidas:", ", ".join(sorted(unknown)))
+    return replace(HerdParams(), **{k: v for k, v in h.items() if k in known})
+
+
+def herd_grids(params: Dict[int, HerdParams]) -> Dict[int, SpatialGrid]:
+    """Una rejilla por especie con manada, con celda igual a su radio."""
+    return {key: SpatialGrid(p.radius) for key, p in params.items()}
+
+
+def apply_herding(members: List[Animal], params: Dict[int, HerdParams],
+                  grids: Dict[int, SpatialGrid], dt: float, scratch: List[Animal],
+                  stride: int = 1, phase: int = 0) -> None:
+    """
+    Ajusta el rumbo de deambular ('heading') de 'members' hacia el de su
+    manada. 'params' y 'grids' van por id(spec); 'scratch' es una lista
+    reutilizable para los candidatos de cada consulta. Con 'stride' > 1 solo
+    giran los animales con a.phase % stride == phase % stride (con dt
+    escalado); todos siguen contando como vecinos.
+    """
+    for grid in grids.values():
+        if grid.count:
+            grid.clear()
+    for a in members:
+        grids[id(a.spec)].insert(a, a.pos.x, a.pos.y)
+
+    dt *= stride
+    phase %= stride
+    for a in members:
+        if stride > 1 and a.phase % stride != phase:
+            continue
+        key = id(a.spec)
+        p = params[key]
+        ax, ay = a.pos.x, a.pos.y
+        r2 = p.radius * p.radius
+        sep_d = p.separation_dist
+        sep2 = sep_d * sep_d
+        scratch.clear()
+        grids[key].query(ax, ay, p.radius, scratch)
+
+        n = 0
+        cx = cy = hx = hy = sx = sy = 0.0
+        for b in scratch:
+            if b is a:
+                continue
+            dx = b.pos.x - ax
+            dy = b.pos.y - ay
+            d2 = dx*dx + dy*dy
+            if d2 > r2:
+                continue
+            n += 1
+            cx += dx
+            cy += dy
+            bh = b.heading
+            hx += bh.x
+            hy += bh.y
+            if 1e-6 < d2 < sep2:
+                d = d2 ** 0.5
+                push = (sep_d - d) / (sep_d * d)   # más fuerte cuanto más cerca
+                sx -= dx * push
+                sy -= dy * push
+            if n >= p.max_neighbours:
+                break
+        if n == 0:
+            continue
+
+        inv_n = 1.0 / n
+        h = a.heading
+        tx = (h.x * p.wander + cx * inv_n / p.radius * p.cohesion
+              + hx * inv_n * p.alignment + sx * p.separation)
+        ty = (h.y * p.wander + cy * inv_n / p.radius * p.cohesion
+              + hy * inv_n * p.alignment + sy * p.separation)
+        m2 = tx*tx + ty*ty
+        if m2 > 1.0:   # mismo tope de velocidad que el deambular
+            m = m2 ** 0.5
+            tx /= m
+            ty /= m
+        k = min(1.0, p.turn_rate * dt)
+        h.x += (tx - h.x) * k
+        h.y += (ty - h.y) * k
+
+
+# Exportar
+__all__ = ["HerdParams", "herd_params", "herd_grids", "apply_herding"]
@@ -1,39 +1,220 @@
 # input_handler.py
 
-from pyray import *
-from typing import NamedTuple
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import math
+
+from sim_types import Vec2
+
+try:
+    from pyray import *  # teclado/ratón reales
+except ImportError:
+    # Códigos de raylib de las teclas que usa la simulación
+    KEY_SPACE, KEY_E, KEY_T = 32, 69, 84
+    KEY_ESCAPE, KEY_ENTER, KEY_BACKSPACE = 256, 257, 259
+    KEY_DOWN, KEY_UP = 264, 265
+    KEY_KP_ENTER, KEY_LEFT_SHIFT, KEY_RIGHT_SHIFT = 335, 340, 344
+
+# Teclas que consulta la simulación. El orden define el bit de cada una en
+# las máscaras de teclas (y en los logs de input_replay: no reordenar).
+TRACKED_KEYS: Tuple[int, ...] = (
+    KEY_SPACE, KEY_E, KEY_T, KEY_ESCAPE, KEY_ENTER, KEY_BACKSPACE,
+    KEY_DOWN, KEY_UP, KEY_KP_ENTER, KEY_LEFT_SHIFT, KEY_RIGHT_SHIFT,
+)
+_KEY_BIT: Dict[int, int] = {k: 1 << i for i, k in enumerate(TRACKED_KEYS)}
+
+
+def keys_to_mask(keys: Iterable[int]) -> int:
+    """Máscara de bits de las teclas (solo las de TRACKED_KEYS)."""
+    mask = 0
+    for k in keys:
+        mask |= _KEY_BIT.get(k, 0)
+    return mask
+
+
+def mask_has(mask: int, key: int) -> bool:
+    return bool(mask & _KEY_BIT.get(key, 0))
+
 
 class PlayerInput(NamedTuple):
-    move_vector: Vector2
+    move_vector: Vec2
     is_sprinting: bool
     has_destination: bool
-    destination_point: Vector2
+    destination_point: Vec2
+
+def build_player_input(position: Vec2, destination: Vec2, is_sprinting: bool) -> PlayerInput:
+    """PlayerInput a partir del destino (sin leer dispositivos)."""
+    dx = destination.x - position.x
+    dy = destination.y - position.y
+    distance_to_destination = math.hypot(dx, dy)
+    TOLERANCE = 5.0
 
-def get_player_input(current_player_position: Vector2, current_destination: Vector2, mouse_world_pos: Vector2) -> PlayerInput:
+    has_destination = distance_to_destination > TOLERANCE
+    if has_destination:
+        move_vec = Vec2(dx / distance_to_destination, dy / distance_to_destination)
+    else:
+        move_vec = Vec2(0.0, 0.0)
+        destination = position
+    return PlayerInput(move_vec, is_sprinting, has_destination, destination)
+
+def get_player_input(current_player_position: Vec2, current_destination: Vec2, mouse_world_pos: Any) -> PlayerInput:
     """
     Calcula la intención del jugador (clic para mover) en coordenadas de mundo.
     """
     destination = current_destination
-    
+
     # 1. Detección de clic derecho (para establecer un nuevo destino)
     if is_mouse_button_pressed(MOUSE_BUTTON_RIGHT):
-        destination = mouse_world_pos
-        
-    # 2. Determinar si hay un destino y calcular el vector
-    distance_to_destination = vector2_distance(current_player_position, destination)
-    TOLERANCE = 5.0
-    
-    has_destination = distance_to_destination > TOLERANCE
-    
-    move_vec = Vector2(0.0, 0.0)
-    
-    if has_destination:
-        move_vec = vector2_subtract(destination, current_player_position)
-        move_vec = vector2_normalize(move_vec)
-    else:
-        destination = current_player_position 
+        destination = Vec2(mouse_world_pos.x, mouse_world_pos.y)
+
+    # 2. Destino/vector y 3. Sprint
+    return build_player_input(current_player_position, destination, is_key_down(KEY_LEFT_SHIFT))
+
+
+class RaylibInput:
+    """
+    Fuente de entrada real (teclado y ratón de raylib). poll() se llama una
+    vez por cuadro y acumula lo ocurrido; cada tick de simulación consume lo
+    pendiente, así un cuadro con 0 o con varios ticks no pierde ni duplica
+    pulsaciones.
+    """
+
+    def __init__(self) -> None:
+        self._pending = 0      # máscara de teclas pulsadas aún no consumidas
+        self._pressed = 0
+        self._down = 0
+        self._pending_click: Optional[Vec2] = None
+        self._click: Optional[Vec2] = None
+        # Entrada de la UI (texto escrito, rueda, clic izquierdo en pantalla)
+        self._pending_text = ""
+        self._text = ""
+        self._pending_wheel = 0.0
+        self._wheel = 0.0
+        self._pending_ui_click: Optional[Vec2] = None
+        self._ui_click: Optional[Vec2] = None
+
+    def poll(self, camera: Any = None) -> None:
+        pressed = 0
+        down = 0
+        for k in TRACKED_KEYS:
+            if is_key_pressed(k):
+                pressed |= _KEY_BIT[k]
+            if is_key_down(k):
+                down |= _KEY_BIT[k]
+        self._pending |= pressed
+        self._down = down
+        if camera is not None and is_mouse_button_pressed(MOUSE_BUTTON_RIGHT):
+            m = get_screen_to_world_2d(get_mouse_position(), camera)
+            self._pending_click = Vec2(m.x, m.y)
+        ch = get_char_pressed()
+        while ch > 0:
+            self._pending_text += chr(ch)
+            ch = get_char_pressed()
+        self._pending_wheel += get_mouse_wheel_move()
+        if is_mouse_button_pressed(MOUSE_BUTTON_LEFT):
+            m = get_mouse_position()
+            self._pending_ui_click = Vec2(m.x, m.y)
+
+    def begin_tick(self, tick: int) -> None:
+        self._pressed, self._pending = self._pending, 0
+        self._click, self._pending_click = self._pending_click, None
+        self._text, self._pending_text = self._pending_text, ""
+        self._wheel, self._pending_wheel = self._pending_wheel, 0.0
+        self._ui_click, self._pending_ui_click = self._pending_ui_click, None
+
+    def key_pressed(self, key: int) -> bool:
+        bit = _KEY_BIT.get(key)
+        return bool(self._pressed & bit) if bit else is_key_pressed(key)
+
+    def key_down(self, key: int) -> bool:
+        bit = _KEY_BIT.get(key)
+        return bool(self._down & bit) if bit else is_key_down(key)
+
+    def text(self) -> str:
+        """Caracteres escritos en el tick."""
+        return self._text
+
+    def wheel(self) -> float:
+        """Movimiento de la rueda del ratón en el tick."""
+        return self._wheel
+
+    def ui_click(self) -> Optional[Vec2]:
+        """Clic izquierdo del tick en coordenadas de pantalla (None si no hubo)."""
+        return self._ui_click
+
+    def player_input(self, position: Vec2, destination: Vec2, camera: Any = None) -> PlayerInput:
+        if self._click is not None:
+            destination, self._click = self._click, None
+        return build_player_input(position, destination, self.key_down(KEY_LEFT_SHIFT))
+
+
+class ScriptedInput:
+    """
+    Entrada guionada para modo headless (pruebas, benchmarks, servidor).
+    Cada evento es (tick, acción, valor):
+      ("press", KEY)  -> is_key_pressed solo en ese tick
+      ("down", KEY) / ("up", KEY) -> tecla mantenida / soltada
+      ("move", (x, y)) -> destino del jugador en coordenadas de mundo
+      ("text", "abc") -> caracteres escritos en ese tick
+      ("wheel", n) -> movimiento de la rueda del ratón en ese tick
+      ("click", (x, y)) -> clic izquierdo en coordenadas de pantalla (UI)
+    """
+
+    def __init__(self, events: Optional[Iterable[Tuple[int, str, Any]]] = None) -> None:
+        self._events: Dict[int, List[Tuple[str, Any]]] = {}
+        self._pressed: Set[int] = set()
+        self._down: Set[int] = set()
+        self._destination: Optional[Tuple[float, float]] = None
+        self._text = ""
+        self._wheel = 0.0
+        self._ui_click: Optional[Vec2] = None
+        for tick, action, value in events or ():
+            self.at(tick, action, value)
+
+    def at(self, tick: int, action: str, value: Any) -> "ScriptedInput":
+        self._events.setdefault(int(tick), []).append((action, value))
+        return self
+
+    def poll(self, camera: Any = None) -> None:
+        pass
+
+    def begin_tick(self, tick: int) -> None:
+        self._pressed.clear()
+        self._text = ""
+        self._wheel = 0.0
+        self._ui_click = None
+        for action, value in self._events.pop(tick, ()):
+            if action == "press":
+                self._pressed.add(value)
+            elif action == "down":
+                self._down.add(value)
+            elif action == "up":
+                self._down.discard(value)
+            elif action == "move":
+                self._destination = (float(value[0]), float(value[1]))
+            elif action == "text":
+                self._text += str(value)
+            elif action == "wheel":
+                self._wheel += float(value)
+            elif action == "click":
+                self._ui_click = Vec2(float(value[0]), float(value[1]))
+
+    def key_pressed(self, key: int) -> bool:
+        return key in self._pressed
+
+    def key_down(self, key: int) -> bool:
+        return key in self._down
+
+    def text(self) -> str:
+        return self._text
+
+    def wheel(self) -> float:
+        return self._wheel
+
+    def ui_click(self) -> Optional[Vec2]:
+        return self._ui_click
 
-    # 3. Detección de Sprint
-    is_sprinting = is_key_down(KEY_LEFT_SHIFT)
-    
-    return PlayerInput(move_vec, is_sprinting, has_destination, destination)
\ No newline at end of file
+    def player_input(self, position: Vec2, destination: Vec2, camera: Any = None) -> PlayerInput:
+        if self._destination is not None:
+            destination = Vec2(self._destination[0], self._destination[1])
+            self._destination = None
+        return build_player_input(position, destination, KEY_LEFT_SHIFT in self._down)
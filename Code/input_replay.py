@@ -0,0 +1,240 @@
+# input_replay.py
+# Grabación y reproducción determinista de la entrada por tick de simulación.
+# El log es binario y compacto: una cabecera (versión, semilla, Hz) y solo
+# los ticks en que algo cambió (teclas pulsadas, teclas mantenidas, destino
+# del jugador o entrada de la UI: texto, rueda y clic izquierdo). Con la
+# misma semilla y Hz la partida se reproduce exacta.
+from __future__ import annotations
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+import struct
+
+from sim_types import Vec2
+from input_handler import (
+    TRACKED_KEYS, PlayerInput, build_player_input, keys_to_mask, mask_has,
+)
+
+LOG_MAGIC = b"FSIR"
+LOG_VERSION = 2
+
+# magic, versión, semilla, sim_hz, cantidad de teclas registradas
+_HEADER = struct.Struct("<4sHQHH")
+# tick, flags
+_RECORD = struct.Struct("<IB")
+_MASK = struct.Struct("<I")
+_DEST = struct.Struct("<dd")
+_TEXT_LEN = struct.Struct("<H")
+_WHEEL = struct.Struct("<d")
+
+_F_PRESSED = 0x01   # sigue máscara de teclas pulsadas en el tick
+_F_DOWN = 0x02      # sigue máscara de teclas mantenidas (cambió)
+_F_DEST = 0x04      # sigue destino del jugador (cambió)
+_F_SPRINT = 0x08    # sprint activo (válido junto con _F_DEST)
+_F_TEXT = 0x10      # sigue texto escrito en el tick (largo + UTF-8)
+_F_WHEEL = 0x20     # sigue movimiento de la rueda
+_F_UI_CLICK = 0x40  # sigue clic izquierdo en pantalla (x, y)
+_F_END = 0x80       # fin del log; 'tick' = ticks totales
+
+
+class InputRecorder:
+    """Envuelve una fuente de entrada (RaylibInput/ScriptedInput) y graba lo que entrega."""
+
+    def __init__(self, source: Any, path: str, seed: int, sim_hz: int) -> None:
+        self.source = source
+        self.path = path
+        self._f: Optional[BinaryIO] = open(path, "wb")
+        self._f.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, seed & (2**64 - 1), sim_hz, len(TRACKED_KEYS)))
+        self._tick: Optional[int] = None
+        self._pressed = 0
+        self._down = 0
+        self._last_down = 0
+        self._text = ""
+        self._wheel = 0.0
+        self._ui_click: Optional[Vec2] = None
+        self._input: Optional[PlayerInput] = None
+        self._last_dest: Optional[Tuple[float, float, bool]] = None
+
+    # ----- Interfaz de fuente de entrada -----
+
+    def poll(self, camera: Any = None) -> None:
+        self.source.poll(camera)
+
+    def begin_tick(self, tick: int) -> None:
+        self._flush()
+        self.source.begin_tick(tick)
+        self._tick = tick
+        src = self.source
+        self._pressed = keys_to_mask(k for k in TRACKED_KEYS if src.key_pressed(k))
+        self._down = keys_to_mask(k for k in TRACKED_KEYS if src.key_down(k))
+        self._text = src.text()
+        self._wheel = src.wheel()
+        self._ui_click = src.ui_click()
+
+    def key_pressed(self, key: int) -> bool:
+        return mask_has(self._pressed, key)
+
+    def key_down(self, key: int) -> bool:
+        return mask_has(self._down, key)
+
+    def text(self) -> str:
+        return self._text
+
+    def wheel(self) -> float:
+        return self._wheel
+
+    def ui_click(self) -> Optional[Vec2]:
+        return self._ui_click
+
+    def player_input(self, position: Vec2, destination: Vec2, camera: Any = None) -> PlayerInput:
+        self._input = self.source.player_input(position, destination, camera)
+        return self._input
+
+    # ----- Grabación -----
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self._flush()
+        end = 0 if self._tick is None else self._tick + 1
+        self._f.write(_RECORD.pack(end, _F_END))
+        self._f.close()
+        self._f = None
+
+    def _flush(self) -> None:
+        if self._tick is None or self._f is None:
+            return
+        flags = 0
+        payload = b""
+        if self._pressed:
+            flags |= _F_PRESSED
+            payload += _MASK.pack(self._pressed)
+        if self._down != self._last_down:
+            flags |= _F_DOWN
+            payload += _MASK.pack(self._down)
+            self._last_down = self._down
+        if self._input is not None:
+            d = self._input.destination_point
+            key = (float(d.x), float(d.y), bool(self._input.is_sprinting))
+            if key != self._last_dest:
+                flags |= _F_DEST | (_F_SPRINT if key[2] else 0)
+                payload += _DEST.pack(key[0], key[1])
+                self._last_dest = key
+            self._input = None
+        if self._text:
+            raw = self._text.encode("utf-8")[:0xFFFF]
+            flags |= _F_TEXT
+            payload += _TEXT_LEN.pack(len(raw)) + raw
+        if self._wheel:
+            flags |= _F_WHEEL
+            payload += _WHEEL.pack(self._wheel)
+        if self._ui_click is not None:
+            flags |= _F_UI_CLICK
+            payload += _DEST.pack(float(self._ui_click.x), float(self._ui_click.y))
+        if flags:
+            self._f.write(_RECORD.pack(self._tick, flags) + payload)
+
+
+class InputReplayer:
+    """Fuente de entrada que reproduce un log de InputRecorder."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"[input_replay] Log vacío o truncado: {path}")
+        magic, version, seed, sim_hz, n_keys = _HEADER.unpack_from(data, 0)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"[input_replay] No es un log de entrada: {path}")
+        if version != LOG_VERSION or n_keys != len(TRACKED_KEYS):
+            raise ValueError(f"[input_replay] Versión de log no soportada ({version}, {n_keys} teclas)")
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.length = 0
+        # tick -> (pressed, down | None, (x, y, sprint) | None, texto, rueda, clic | None)
+        self._records: Dict[int, Tuple[int, Optional[int], Optional[Tuple[float, float, bool]],
+                                       str, float, Optional[Vec2]]] = {}
+
+        off = _HEADER.size
+        while off + _RECORD.size <= len(data):
+            tick, flags = _RECORD.unpack_from(data, off)
+            off += _RECORD.size
+            if flags & _F_END:
+                self.length = tick
+                break
+            pressed = 0
+            down: Optional[int] = None
+            dest: Optional[Tuple[float, float, bool]] = None
+            text = ""
+            wheel = 0.0
+            click: Optional[Vec2] = None
+            if flags & _F_PRESSED:
+                (pressed,) = _MASK.unpack_from(data, off)
+                off += _MASK.size
+            if flags & _F_DOWN:
+                (down,) = _MASK.unpack_from(data, off)
+                off += _MASK.size
+            if flags & _F_DEST:
+                x, y = _DEST.unpack_from(data, off)
+                off += _DEST.size
+                dest = (x, y, bool(flags & _F_SPRINT))
+            if flags & _F_TEXT:
+                (n,) = _TEXT_LEN.unpack_from(data, off)
+                off += _TEXT_LEN.size
+                text = data[off:off + n].decode("utf-8", "replace")
+                off += n
+            if flags & _F_WHEEL:
+                (wheel,) = _WHEEL.unpack_from(data, off)
+                off += _WHEEL.size
+            if flags & _F_UI_CLICK:
+                x, y = _DEST.unpack_from(data, off)
+                off += _DEST.size
+                click = Vec2(x, y)
+            self._records[tick] = (pressed, down, dest, text, wheel, click)
+            self.length = max(self.length, tick + 1)
+
+        self._pressed = 0
+        self._down = 0
+        self._dest: Optional[Tuple[float, float, bool]] = None
+        self._text = ""
+        self._wheel = 0.0
+        self._ui_click: Optional[Vec2] = None
+
+    def poll(self, camera: Any = None) -> None:
+        pass
+
+    def begin_tick(self, tick: int) -> None:
+        rec = self._records.get(tick)
+        if rec is None:
+            self._pressed = 0
+            self._text, self._wheel, self._ui_click = "", 0.0, None
+            return
+        self._pressed = rec[0]
+        self._text, self._wheel, self._ui_click = rec[3], rec[4], rec[5]
+        if rec[1] is not None:
+            self._down = rec[1]
+        if rec[2] is not None:
+            self._dest = rec[2]
+
+    def key_pressed(self, key: int) -> bool:
+        return mask_has(self._pressed, key)
+
+    def key_down(self, key: int) -> bool:
+        return mask_has(self._down, key)
+
+    def text(self) -> str:
+        return self._text
+
+    def wheel(self) -> float:
+        return self._wheel
+
+    def ui_click(self) -> Optional[Vec2]:
+        return self._ui_click
+
+    def player_input(self, position: Vec2, destination: Vec2, camera: Any = None) -> PlayerInput:
+        if self._dest is None:
+            return build_player_input(position, destination, False)
+        x, y, sprint = self._dest
+        return build_player_input(position, Vec2(x, y), sprint)
+
+
+# Exportar
+__all__ = ["InputRecorder", "InputReplayer", "LOG_MAGIC", "LOG_VERSION"]
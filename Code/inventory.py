@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 from typing import Dict, Optional, Tuple, List
-from pyray import *
+
+from sim_types import RGBA, to_color
+
+try:
+    from pyray import *  # solo para dibujar / input de la UI
+except ImportError:
+    pass
 
 # ============ Modelo de datos ============
 
@@ -13,7 +19,7 @@ class Item:
         item_id: str,
         name: str,
         description: str,
-        icon_color: Color,
+        icon_color: RGBA,
         stackable: bool = True,
         max_stack: int = 99,
     ):
@@ -96,10 +102,10 @@ class Inventory:
 
         # Base mínima para que el juego arranque con lo que ya usabas
         self.item_database: Dict[str, Item] = {
-            "seed_corn": Item("seed_corn", "Semilla de Maíz", "Semilla para cultivar maíz", Color(240, 210, 100, 255)),
-            "seed_wheat": Item("seed_wheat", "Semilla de Trigo", "Semilla para cultivar trigo", Color(235, 215, 150, 255)),
-            "water": Item("water", "Agua", "Recurso básico", Color(120, 190, 255, 255), True, 99),
-            "fertilizer": Item("fertilizer", "Fertilizante", "Aporta nutrientes", Color(150, 160, 90, 255), True, 99),
+            "seed_corn": Item("seed_corn", "Semilla de Maíz", "Semilla para cultivar maíz", RGBA(240, 210, 100, 255)),
+            "seed_wheat": Item("seed_wheat", "Semilla de Trigo", "Semilla para cultivar trigo", RGBA(235, 215, 150, 255)),
+            "water": Item("water", "Agua", "Recurso básico", RGBA(120, 190, 255, 255), True, 99),
+            "fertilizer": Item("fertilizer", "Fertilizante", "Aporta nutrientes", RGBA(150, 160, 90, 255), True, 99),
         }
 
         # Catálogo extendido (items_registry.py)
@@ -194,6 +200,33 @@ class Inventory:
                 break
         return removed
 
+    def remove_items(self, amounts: Dict[str, int]) -> Dict[str, int]:
+        """
+        Elimina varias cantidades {item_id: cantidad} en una sola pasada por
+        los slots. Retorna cuántas unidades se eliminaron de cada item.
+        """
+        pending = {iid: qty for iid, qty in amounts.items() if qty > 0}
+        removed: Dict[str, int] = {iid: 0 for iid in pending}
+        for slot in self.slots:
+            if not pending:
+                break
+            if slot.is_empty():
+                continue
+            iid = slot.item.item_id
+            want = pending.get(iid)
+            if not want:
+                continue
+            take = min(slot.quantity, want)
+            slot.quantity -= take
+            removed[iid] += take
+            if slot.quantity <= 0:
+                slot.clear()
+            if take >= want:
+                del pending[iid]
+            else:
+                pending[iid] = want - take
+        return removed
+
     def count_item(self, item_id: str) -> int:
         """
         Cuenta cuántas unidades de un item específico hay en el inventario.
@@ -207,6 +240,33 @@ class Inventory:
                 total += slot.quantity
         return total
 
+    def count_all(self) -> Dict[str, int]:
+        """
+        Cuenta todas las unidades por item en una sola pasada por los slots.
+        Útil cuando hay que consultar muchos items (planificador de crafteo).
+        """
+        totals: Dict[str, int] = {}
+        for slot in self.slots:
+            if slot.is_empty():
+                continue
+            item_id = slot.item.item_id
+            totals[item_id] = totals.get(item_id, 0) + slot.quantity
+        return totals
+
+    def count_vector(self, item_index: Dict[str, int]) -> List[int]:
+        """
+        Cantidades por item como vector denso indexado por 'item_index'
+        (id -> posición). Items fuera del índice se ignoran.
+        """
+        counts = [0] * len(item_index)
+        for slot in self.slots:
+            if slot.is_empty():
+                continue
+            idx = item_index.get(slot.item.item_id)
+            if idx is not None:
+                counts[idx] += slot.quantity
+        return counts
+
     def has_item(self, item_id: str, amount: int = 1) -> bool:
         """
         Verifica si el inventario tiene al menos 'amount' unidades de un item.
@@ -353,7 +413,7 @@ class Inventory:
             ghost = int(slot_size * 0.72)
             gx = mx - ghost // 2
             gy = my - ghost // 2
-            draw_rectangle(gx, gy, ghost, ghost, self.dragging_item.icon_color)
+            draw_rectangle(gx, gy, ghost, ghost, to_color(self.dragging_item.icon_color))
             draw_rectangle_lines(gx, gy, ghost, ghost, Color(0, 0, 0, 170))
             if self.dragging_item.stackable and self.dragging_qty > 1:
                 txt = str(self.dragging_qty)
@@ -389,7 +449,7 @@ class Inventory:
             icon = int(size * 0.72)
             ix = x + (size - icon) // 2
             iy = y + (size - icon) // 2
-            draw_rectangle(ix, iy, icon, icon, slot.item.icon_color)
+            draw_rectangle(ix, iy, icon, icon, to_color(slot.item.icon_color))
             draw_rectangle_lines(ix, iy, icon, icon, Color(0, 0, 0, 160))
 
             if slot.item.stackable and slot.quantity > 1:
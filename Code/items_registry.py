@@ -1,16 +1,16 @@
 # items_registry.py
 # Catálogo de ítems del juego. No importamos Item aquí para evitar ciclos.
-# Devolvemos tuplas con: (item_id, name, description, Color, stackable, max_stack)
+# Devolvemos tuplas con: (item_id, name, description, RGBA, stackable, max_stack)
 
 from __future__ import annotations
 from typing import Iterable, List, Tuple
-from pyray import Color
+from sim_types import RGBA
 
 # ---------- Utilidades ----------
 
 def _mat(id_: str, name: str, desc: str, col: Tuple[int,int,int], stack: bool = True, maxs: int = 99):
     r,g,b = col
-    return (id_, name, desc, Color(r,g,b,255), stack, maxs)
+    return (id_, name, desc, RGBA(r,g,b,255), stack, maxs)
 
 def _tool(id_: str, name: str, desc: str, col: Tuple[int,int,int]):
     # Herramientas no apilables
@@ -187,7 +187,7 @@ SCI_TECH_ITEMS: List[Tuple] = [
 
 # ---------- Iterador público ----------
 
-def iter_all_items() -> Iterable[Tuple[str,str,str,Color,bool,int]]:
+def iter_all_items() -> Iterable[Tuple[str,str,str,RGBA,bool,int]]:
     # Base
     for it in EXTRA_BASE_ITEMS:
         yield it
@@ -0,0 +1,77 @@
+# line_of_sight.py
+# Línea de visión sobre la rejilla de CollisionMap para la detección de los
+# hostiles: un animal solo ve al jugador si el segmento entre ambos no cruza
+# celdas bloqueadas (agua, costa, obstáculos). El segmento se recorre con DDA
+# (pathfinding.grid_ray_free, entre centros de celda) y el resultado se
+# guarda por (celda del animal, celda del jugador) durante unos ticks; un
+# cambio de CollisionMap.version vacía la caché.
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+from collisions import CollisionMap
+from pathfinding import grid_ray_free
+
+Cell = Tuple[int, int]
+
+LOS_TTL_TICKS = 8        # ticks que vale un resultado cacheado
+LOS_MAX_ENTRIES = 4096   # al superarlo se purgan las entradas vencidas
+
+
+class LineOfSight:
+    """
+    Consultas de visibilidad de una escena. Llamar begin_tick() una vez por
+    tick de simulación; las consultas del mismo tick comparten la caché.
+    """
+
+    def __init__(self, collision_map: CollisionMap, cell_size: float,
+                 ttl_ticks: int = LOS_TTL_TICKS) -> None:
+        self.cm = collision_map
+        self.cell_size = float(cell_size)
+        self.ttl = max(1, int(ttl_ticks))
+        self.tick = 0
+        self.rays = 0       # recorridos DDA hechos (métrica)
+        self.hits = 0       # respuestas servidas desde la caché
+        self._version = collision_map.version
+        self._cache: Dict[Tuple[Cell, Cell], Tuple[bool, int]] = {}   # -> (visible, vence en tick)
+
+    def begin_tick(self) -> None:
+        self.tick += 1
+        if self.cm.version != self._version:
+            self._version = self.cm.version
+            self._cache.clear()
+        elif len(self._cache) > LOS_MAX_ENTRIES:
+            tick = self.tick
+            self._cache = {k: v for k, v in self._cache.items() if v[1] > tick}
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        cs = self.cell_size
+        return int(x // cs), int(y // cs)
+
+    def visible(self, ax: float, ay: float, bx: float, by: float) -> bool:
+        """¿Hay línea de visión de A (animal) a B (jugador)?"""
+        cs = self.cell_size
+        a = (int(ax // cs), int(ay // cs))
+        b = (int(bx // cs), int(by // cs))
+        if a == b:
+            return a not in self.cm.blocked
+        key = (a, b)
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > self.tick:
+            self.hits += 1
+            return entry[0]
+        half = cs * 0.5
+        seen = grid_ray_free(self.cm.blocked, cs, a[0] * cs + half, a[1] * cs + half,
+                             b[0] * cs + half, b[1] * cs + half)
+        self.rays += 1
+        self._cache[key] = (seen, self.tick + self.ttl)
+        return seen
+
+    def visible_many(self, xs: Sequence[float], ys: Sequence[float],
+                     tx: float, ty: float) -> List[bool]:
+        """Visibilidad hacia (tx, ty) de varios puntos (p. ej. todos los hostiles de la escena)."""
+        visible = self.visible
+        return [visible(x, y, tx, ty) for x, y in zip(xs, ys)]
+
+
+# Exportar
+__all__ = ["LineOfSight", "LOS_TTL_TICKS"]
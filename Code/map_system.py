@@ -1,8 +1,13 @@
 # map_system.py
 
 from __future__ import annotations
-from typing import List, Tuple
-from pyray import *
+from typing import Dict, List, Tuple
+try:
+    from pyray import *  # solo para dibujar / input del mapa
+except ImportError:
+    pass
+
+from sim_types import RGBA, to_color
 
 # Importa las siluetas (listas de puntos) de zonas 2-4
 # Pueden venir como tuplas (x, y), listas [x, y], Vector2 u objetos con .x/.y
@@ -33,27 +38,29 @@ class MapSystem:
 
         # Layout cacheado: (rect, idx)
         self._cards: List[Tuple[Rectangle, int]] = []
+        # Siluetas normalizadas por escena (se generan una sola vez)
+        self._poly_cache: Dict[int, List[Vector2]] = {}
 
-        # Paleta base por escena (tarjetas)
+        # Paleta base por escena (tarjetas); RGBA para no requerir raylib fuera del dibujo
         self.colors = [
-            Color(70, 130, 180, 255),   # 1 azul
-            Color(210, 140, 70, 255),   # 2 naranja
-            Color(80, 160, 120, 255),   # 3 verde
-            Color(160, 100, 170, 255),  # 4 violeta
+            RGBA(70, 130, 180, 255),   # 1 azul
+            RGBA(210, 140, 70, 255),   # 2 naranja
+            RGBA(80, 160, 120, 255),   # 3 verde
+            RGBA(160, 100, 170, 255),  # 4 violeta
         ]
 
         # Colores de silueta por bioma
         self.sil_fill = [
             None,                                 # 1 sin silueta
-            Color(120, 160, 145, 255),            # 2 Alaska
-            Color(165, 185, 100, 255),            # 3 PPR
-            Color(100, 165, 125, 255),            # 4 Michigan
+            RGBA(120, 160, 145, 255),            # 2 Alaska
+            RGBA(165, 185, 100, 255),            # 3 PPR
+            RGBA(100, 165, 125, 255),            # 4 Michigan
         ]
         self.sil_outline = [
             None,
-            Color(30, 60, 55, 220),
-            Color(60, 70, 25, 220),
-            Color(35, 70, 45, 220),
+            RGBA(30, 60, 55, 220),
+            RGBA(60, 70, 25, 220),
+            RGBA(35, 70, 45, 220),
         ]
 
     # =================== API pública ===================
@@ -84,7 +91,7 @@ class MapSystem:
         for rect, idx in self._cards:
             hovered = check_collision_point_rec(mouse, rect)
             selected = (idx == active_scene_index)
-            base_col = self.colors[idx % len(self.colors)]
+            base_col = to_color(self.colors[idx % len(self.colors)])
             name = self.scene_names[idx] if idx < len(self.scene_names) else f"Escenario {idx + 1}"
 
             self._draw_card(rect, base_col, name, idx + 1, idx, selected, hovered)
@@ -94,6 +101,18 @@ class MapSystem:
         fs2 = 18
         draw_text(foot, (screen_w - measure_text(foot, fs2)) // 2, int(screen_h * 0.90), fs2, Color(230, 230, 230, 220))
 
+    def neighbours(self, scene_idx: int) -> List[int]:
+        """Escenas vecinas de 'scene_idx' en la grilla 2x2 del mapa."""
+        cols = 2
+        r, c = divmod(scene_idx, cols)
+        out: List[int] = []
+        for dr, dc in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            rr, cc = r + dr, c + dc
+            idx = rr * cols + cc
+            if rr >= 0 and 0 <= cc < cols and 0 <= idx < self.total_scenes:
+                out.append(idx)
+        return out
+
     def handle_click(self, screen_w: int, screen_h: int) -> int:
         """Devuelve el índice de escena al hacer click; si no hay click válido, -1."""
         if not self.is_open:
@@ -180,8 +199,8 @@ class MapSystem:
         # Silueta (escenas 2–4) o rectángulo (escena 1)
         poly = self._get_scene_polygon_points(scene_idx)  # robusto a tuplas/Vector2
         if poly:
-            sil_fill = self.sil_fill[scene_idx] if scene_idx < len(self.sil_fill) else Color(180, 180, 180, 255)
-            sil_outline = self.sil_outline[scene_idx] if scene_idx < len(self.sil_outline) else Color(40, 40, 40, 255)
+            sil_fill = to_color(self.sil_fill[scene_idx]) if scene_idx < len(self.sil_fill) else Color(180, 180, 180, 255)
+            sil_outline = to_color(self.sil_outline[scene_idx]) if scene_idx < len(self.sil_outline) else Color(40, 40, 40, 255)
             self._draw_shape_silhouette(shape_area, poly, sil_fill, sil_outline)
         else:
             draw_rectangle(int(shape_area.x), int(shape_area.y), int(shape_area.width), int(shape_area.height), self._tint(base_col, 0.85))
@@ -197,6 +216,9 @@ class MapSystem:
 
     def _get_scene_polygon_points(self, scene_idx: int) -> List[Vector2]:
         """Convierte cualquier formato de puntos (tupla/list/Vector2/obj) en Vector2."""
+        cached = self._poly_cache.get(scene_idx)
+        if cached is not None:
+            return cached
         if scene_idx == 1:
             raw = zone2_alaska_polygon()
         elif scene_idx == 2:
@@ -216,6 +238,7 @@ class MapSystem:
             except Exception:
                 # Si algo raro, ignora ese vértice
                 continue
+        self._poly_cache[scene_idx] = pts
         return pts
 
     def _draw_shape_silhouette(self, area: Rectangle, polygon_pts: List[Vector2], fill: Color, outline: Color) -> None:
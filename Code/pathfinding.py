@@ -0,0 +1,332 @@
+# pathfinding.py
+# Búsqueda de caminos para el clic-para-mover: A* sobre la rejilla de
+# CollisionMap (8 vecinos, heurística octil, sin cortar esquinas), suavizado
+# del camino por línea de visión y caché LRU por (celda inicio, celda meta)
+# que se invalida cuando cambian las celdas bloqueadas (CollisionMap.version).
+# Las búsquedas largas se reparten en varios ticks con un presupuesto de
+# nodos por tick (determinista: no depende de la velocidad de la máquina).
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import heapq
+import math
+
+from collisions import CollisionMap
+from sim_types import Vec2
+
+Cell = Tuple[int, int]
+
+_DIAG = math.sqrt(2.0)
+_NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _DIAG), (1, -1, _DIAG), (-1, 1, _DIAG), (-1, -1, _DIAG),
+)
+
+PENDING, FOUND, FAILED = "pending", "found", "failed"
+
+
+def _octile(c: int, r: int, gc: int, gr: int) -> float:
+    dx = abs(c - gc)
+    dy = abs(r - gr)
+    return (dx + dy) + (_DIAG - 2.0) * min(dx, dy)
+
+
+def grid_ray_free(blocked: set, cell_size: float, ax: float, ay: float, bx: float, by: float) -> bool:
+    """
+    Recorre con DDA las celdas que toca el segmento A-B y devuelve False si
+    alguna está en 'blocked'. Si el segmento pasa justo por un vértice se
+    revisan las dos celdas vecinas (no se cuela en diagonal entre bloques).
+    """
+    cs = cell_size
+    c, r = int(ax // cs), int(ay // cs)
+    gc, gr = int(bx // cs), int(by // cs)
+    if (c, r) in blocked:
+        return False
+    dx, dy = bx - ax, by - ay
+    step_c = 1 if dx > 0 else -1
+    step_r = 1 if dy > 0 else -1
+    t_max_x = (((c + 1) * cs - ax) / dx if dx > 0 else (c * cs - ax) / dx) if dx != 0 else math.inf
+    t_max_y = (((r + 1) * cs - ay) / dy if dy > 0 else (r * cs - ay) / dy) if dy != 0 else math.inf
+    t_dx = cs / abs(dx) if dx != 0 else math.inf
+    t_dy = cs / abs(dy) if dy != 0 else math.inf
+    for _ in range(abs(gc - c) + abs(gr - r)):
+        if c == gc and r == gr:
+            break
+        if t_max_x < t_max_y:
+            c += step_c
+            t_max_x += t_dx
+        elif t_max_y < t_max_x:
+            r += step_r
+            t_max_y += t_dy
+        else:
+            if (c + step_c, r) in blocked or (c, r + step_r) in blocked:
+                return False
+            c += step_c
+            r += step_r
+            t_max_x += t_dx
+            t_max_y += t_dy
+        if (c, r) in blocked:
+            return False
+    return True
+
+
+class PathRequest:
+    """Búsqueda en curso (o resuelta). 'waypoints' queda listo cuando status == FOUND."""
+
+    def __init__(self, start: Vec2, goal: Vec2, start_cell: Cell, goal_cell: Cell, version: int) -> None:
+        self.start = start
+        self.goal = goal
+        self.start_cell = start_cell
+        self.goal_cell = goal_cell
+        self.version = version
+        self.status = PENDING
+        self.waypoints: List[Vec2] = []
+        self.expanded = 0
+        # Estado de A*
+        self._open: List[Tuple[float, float, int, int]] = []
+        self._g: Dict[Cell, float] = {}
+        self._came: Dict[Cell, Cell] = {}
+        self._closed: set = set()
+
+    @property
+    def done(self) -> bool:
+        return self.status != PENDING
+
+
+class PathFinder:
+    """
+    Caminos sobre una CollisionMap de rejilla. 'agent_radius' es el medio
+    ancho del que camina: el suavizado solo une puntos si su caja pasa libre.
+    """
+
+    def __init__(self, collision_map: CollisionMap, cell_size: float,
+                 agent_radius: float = 12.0, cache_size: int = 64) -> None:
+        self.cm = collision_map
+        self.cell_size = float(cell_size)
+        self.agent_radius = agent_radius
+        self.cols = collision_map.cols or 0
+        self.rows = collision_map.rows or 0
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Cell, Cell], List[Cell]]" = OrderedDict()
+        self._cache_version = collision_map.version
+        self.cache_hits = 0
+
+    # ----- API -----
+
+    def request(self, start: Vec2, goal: Vec2) -> PathRequest:
+        """Crea una búsqueda; si está en caché (o es trivial) sale resuelta."""
+        self._check_version()
+        sc = self.cell_of(start.x, start.y)
+        gc = self._nearest_free(self.cell_of(goal.x, goal.y))
+        req = PathRequest(Vec2(start.x, start.y), Vec2(goal.x, goal.y), sc, gc, self.cm.version)
+        if gc is None or not self._in_grid(sc):
+            req.status = FAILED
+            return req
+        cached = self._cache.get((sc, gc))
+        if cached is not None:
+            self._cache.move_to_end((sc, gc))
+            self.cache_hits += 1
+            self._finish(req, cached)
+            return req
+        if sc == gc:
+            self._finish(req, [sc])
+            return req
+        req._open = [(_octile(sc[0], sc[1], gc[0], gc[1]), 0.0, sc[0], sc[1])]
+        req._g = {sc: 0.0}
+        return req
+
+    def step(self, req: PathRequest, max_nodes: int = 2000) -> bool:
+        """Expande hasta 'max_nodes' nodos de la búsqueda. Devuelve True si terminó."""
+        if req.done:
+            return True
+        if req.version != self.cm.version:
+            # Cambió el mapa a mitad de búsqueda: se reinicia con el mapa nuevo
+            fresh = self.request(req.start, req.goal)
+            req.__dict__.update(fresh.__dict__)
+            if req.done:
+                return True
+
+        blocked = self.cm.blocked
+        cols, rows = self.cols, self.rows
+        gc, gr = req.goal_cell
+        open_, g, came, closed = req._open, req._g, req._came, req._closed
+        n = 0
+        while open_ and n < max_nodes:
+            _, gcost, c, r = heapq.heappop(open_)
+            if (c, r) in closed:
+                continue
+            closed.add((c, r))
+            n += 1
+            if c == gc and r == gr:
+                req.expanded += n
+                cells = self._reconstruct(came, (c, r))
+                self._store(req.start_cell, req.goal_cell, cells)
+                self._finish(req, cells)
+                return True
+            for dc, dr, w in _NEIGHBOURS:
+                nc, nr = c + dc, r + dr
+                if nc < 0 or nr < 0 or nc >= cols or nr >= rows:
+                    continue
+                if (nc, nr) in blocked or (nc, nr) in closed:
+                    continue
+                if dc and dr and ((nc, r) in blocked or (c, nr) in blocked):
+                    continue  # sin cortar esquinas
+                ng = gcost + w
+                if ng < g.get((nc, nr), math.inf):
+                    g[(nc, nr)] = ng
+                    came[(nc, nr)] = (c, r)
+                    heapq.heappush(open_, (ng + _octile(nc, nr, gc, gr), ng, nc, nr))
+        req.expanded += n
+        if not open_:
+            req.status = FAILED
+            req._g.clear(); req._came.clear(); req._closed.clear()
+            return True
+        return False
+
+    def find(self, start: Vec2, goal: Vec2) -> Optional[List[Vec2]]:
+        """Búsqueda completa en el acto (herramientas, pruebas). None si no hay camino."""
+        req = self.request(start, goal)
+        while not self.step(req, 1 << 30):
+            pass
+        return req.waypoints if req.status == FOUND else None
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    # ----- Geometría -----
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        cs = self.cell_size
+        return int(x // cs), int(y // cs)
+
+    def cell_center(self, cell: Cell) -> Vec2:
+        cs = self.cell_size
+        return Vec2((cell[0] + 0.5) * cs, (cell[1] + 0.5) * cs)
+
+    def box_free(self, x: float, y: float) -> bool:
+        """La caja del agente centrada en (x, y) no toca celdas bloqueadas."""
+        cs = self.cell_size
+        rad = self.agent_radius
+        c0, c1 = int((x - rad) // cs), int((x + rad) // cs)
+        r0, r1 = int((y - rad) // cs), int((y + rad) // cs)
+        if c0 < 0 or r0 < 0 or c1 >= self.cols or r1 >= self.rows:
+            return False
+        blocked = self.cm.blocked
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                if (c, r) in blocked:
+                    return False
+        return True
+
+    def segment_free(self, ax: float, ay: float, bx: float, by: float) -> bool:
+        """
+        La caja del agente puede ir de A a B en línea recta. Como la caja es
+        más chica que una celda, basta revisar la caja en ambos extremos y el
+        recorrido de sus cuatro esquinas (DDA por celdas).
+        """
+        if not (self.box_free(ax, ay) and self.box_free(bx, by)):
+            return False
+        rad = self.agent_radius * 0.999   # esquinas dentro de la caja (bordes exactos)
+        blocked = self.cm.blocked
+        cs = self.cell_size
+        for ox, oy in ((-rad, -rad), (rad, -rad), (-rad, rad), (rad, rad)):
+            if not grid_ray_free(blocked, cs, ax + ox, ay + oy, bx + ox, by + oy):
+                return False
+        return True
+
+    # ----- Internos -----
+
+    def _in_grid(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows
+
+    def _nearest_free(self, cell: Cell, max_ring: int = 6) -> Optional[Cell]:
+        """La celda o la libre más cercana (por anillos) si está bloqueada o fuera."""
+        c = min(max(cell[0], 0), self.cols - 1)
+        r = min(max(cell[1], 0), self.rows - 1)
+        blocked = self.cm.blocked
+        if (c, r) not in blocked:
+            return (c, r)
+        for ring in range(1, max_ring + 1):
+            best: Optional[Cell] = None
+            best_d = math.inf
+            for dr in range(-ring, ring + 1):
+                for dc in range(-ring, ring + 1):
+                    if max(abs(dc), abs(dr)) != ring:
+                        continue
+                    nc, nr = c + dc, r + dr
+                    if self._in_grid((nc, nr)) and (nc, nr) not in blocked:
+                        d = dc * dc + dr * dr
+                        if d < best_d:
+                            best, best_d = (nc, nr), d
+            if best is not None:
+                return best
+        return None
+
+    @staticmethod
+    def _reconstruct(came: Dict[Cell, Cell], end: Cell) -> List[Cell]:
+        out = [end]
+        while out[-1] in came:
+            out.append(came[out[-1]])
+        out.reverse()
+        return out
+
+    def _smooth(self, cells: List[Cell]) -> List[Cell]:
+        """Quita puntos intermedios mientras haya línea libre (string pulling)."""
+        if len(cells) <= 2:
+            return list(cells)
+        centers = [self.cell_center(c) for c in cells]
+        out = [cells[0]]
+        anchor = centers[0]
+        # Avanza mientras el punto siguiente se vea desde el ancla (O(n) pruebas)
+        for k in range(2, len(cells)):
+            p = centers[k]
+            if not self.segment_free(anchor.x, anchor.y, p.x, p.y):
+                out.append(cells[k - 1])
+                anchor = centers[k - 1]
+        out.append(cells[-1])
+        return out
+
+    def _store(self, sc: Cell, gc: Cell, cells: List[Cell]) -> None:
+        smooth = self._smooth(cells)
+        cells[:] = smooth
+        self._cache[(sc, gc)] = smooth
+        self._cache.move_to_end((sc, gc))
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _finish(self, req: PathRequest, cells: List[Cell]) -> None:
+        """Pasa las celdas (suavizadas) a puntos de mundo desde la posición real."""
+        pts = [self.cell_center(c) for c in cells[1:]]
+        s = req.start
+        # Si desde la posición real no se ve el primer punto, se pasa por el centro inicial
+        if pts and not self.segment_free(s.x, s.y, pts[0].x, pts[0].y):
+            pts.insert(0, self.cell_center(cells[0]))
+        # La meta exacta solo si la caja cabe y se llega en línea recta
+        g = req.goal
+        goal_center = self.cell_center(req.goal_cell)
+        if self.cell_of(g.x, g.y) == req.goal_cell and self.box_free(g.x, g.y):
+            if pts and pts[-1] == goal_center:
+                prev = pts[-2] if len(pts) >= 2 else s
+                if self.segment_free(prev.x, prev.y, g.x, g.y):
+                    pts[-1] = Vec2(g.x, g.y)
+                elif self.segment_free(goal_center.x, goal_center.y, g.x, g.y):
+                    pts.append(Vec2(g.x, g.y))
+            elif self.segment_free(s.x, s.y, g.x, g.y):
+                pts.append(Vec2(g.x, g.y))
+        if not pts:
+            pts.append(goal_center)
+        req.waypoints = pts
+        req.status = FOUND
+        req._open = []
+        req._g = {}
+        req._came = {}
+        req._closed = set()
+
+    def _check_version(self) -> None:
+        if self._cache_version != self.cm.version:
+            self._cache.clear()
+            self._cache_version = self.cm.version
+
+
+# Exportar
+__all__ = ["PathFinder", "PathRequest", "grid_ray_free", "PENDING", "FOUND", "FAILED"]
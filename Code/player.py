@@ -1,10 +1,16 @@
 # player.py
 from __future__ import annotations
-from typing import List, Optional, Any
-from pyray import *
+from typing import List, Optional, Any, Tuple
 import os
 from math import sqrt
 
+from sim_types import Vec2, RGBA, to_color
+
+try:
+    from pyray import *  # texturas y dibujo
+except ImportError:
+    pass
+
 def _paths_variants(filename: str) -> List[str]:
     here = os.path.dirname(__file__)
     cand = [
@@ -38,10 +44,15 @@ def _try_load_texture_many(candidates: List[str]) -> Optional[Texture2D]:
     return None
 
 class Player:
-    def __init__(self, start_pos: Vector2) -> None:
-        self.position: Vector2 = Vector2(start_pos.x, start_pos.y)
-        self.destination: Vector2 = Vector2(start_pos.x, start_pos.y)
+    def __init__(self, start_pos: Vec2, load_sprites: bool = True) -> None:
+        self.position: Vec2 = Vec2(start_pos.x, start_pos.y)
+        # Posición del tick anterior (para interpolar al dibujar)
+        self.prev_position: Vec2 = Vec2(start_pos.x, start_pos.y)
+        self.destination: Vec2 = Vec2(start_pos.x, start_pos.y)
         self.size: float = 24.0
+        # Camino (pathfinding): puntos intermedios hasta el destino
+        self.waypoints: List[Vec2] = []
+        self.path_pending: bool = False   # esperando a que termine la búsqueda
 
         # Stats
         self.max_hp: float = 100.0
@@ -83,8 +94,9 @@ class Player:
         self._last_move_vx: float = 0.0
         self._last_move_vy: float = 0.0
 
-        self._fallback_color = RED
-        self._load_sprites()
+        self._fallback_color = RGBA(230, 41, 55, 255)  # RED de raylib
+        if load_sprites:  # sin ventana (headless) no hay contexto para texturas
+            self._load_sprites()
 
     def _load_sprites(self) -> None:
         # Mantengo exactamente la misma lógica para derecha/izquierda
@@ -183,7 +195,19 @@ class Player:
     def apply_damage(self, dmg: float) -> None:
         self.hp = max(0.0, self.hp - max(0.0, dmg))
 
+    def sync_prev(self) -> None:
+        """Iguala la posición previa a la actual (tras teletransportes / cambio de escena)."""
+        self.prev_position.x = self.position.x
+        self.prev_position.y = self.position.y
+
+    def render_position(self, alpha: float) -> Tuple[float, float]:
+        """Posición interpolada entre el tick anterior y el actual (la que se dibuja)."""
+        return (self.prev_position.x + (self.position.x - self.prev_position.x) * alpha,
+                self.prev_position.y + (self.position.y - self.prev_position.y) * alpha)
+
     def update(self, p_input: Any, dt: float) -> None:
+        self.sync_prev()
+
         # cooldown de ataque
         if self._attack_cd > 0.0:
             self._attack_cd = max(0.0, self._attack_cd - dt)
@@ -197,9 +221,9 @@ class Player:
 
         if dest_field is not None:
             if hasattr(dest_field, "x") and hasattr(dest_field, "y"):
-                self.destination = Vector2(float(dest_field.x), float(dest_field.y))
+                self.destination = Vec2(float(dest_field.x), float(dest_field.y))
             elif isinstance(dest_field, (tuple, list)) and len(dest_field) == 2:
-                self.destination = Vector2(float(dest_field[0]), float(dest_field[1]))
+                self.destination = Vec2(float(dest_field[0]), float(dest_field[1]))
 
         # 2) sprint
         run_flag = False
@@ -215,19 +239,27 @@ class Player:
         else:
             self.stamina = min(self.max_stamina, self.stamina + 6.0 * dt)
 
-        # 3) mover hacia destino
-        dx = self.destination.x - self.position.x
-        dy = self.destination.y - self.position.y
+        # 3) mover hacia destino (o hacia el próximo punto del camino)
+        target = self.destination
+        if self.waypoints:
+            target = self.waypoints[0]
+            if abs(target.x - self.position.x) <= 1.0 and abs(target.y - self.position.y) <= 1.0:
+                self.waypoints.pop(0)
+                target = self.waypoints[0] if self.waypoints else self.destination
+        dx = target.x - self.position.x
+        dy = target.y - self.position.y
         dist = sqrt(dx*dx + dy*dy)
 
         moved = False
         moved_dist = 0.0
+        if self.path_pending:
+            dist = 0.0
         if dist > 1.0:
             vx, vy = dx / dist, dy / dist
             step = speed * dt
             if step >= dist:
-                self.position.x = self.destination.x
-                self.position.y = self.destination.y
+                self.position.x = target.x
+                self.position.y = target.y
                 moved_dist = dist
             else:
                 self.position.x += vx * step
@@ -271,21 +303,36 @@ class Player:
         self.hp = max(0.0, min(self.max_hp, self.hp))
         self.stamina = max(0.0, min(self.max_stamina, self.stamina))
 
-    def draw(self) -> None:
+    def set_path(self, waypoints: List[Vec2]) -> None:
+        """Sigue 'waypoints' en orden; el último es el destino."""
+        self.waypoints = [Vec2(p.x, p.y) for p in waypoints]
+        self.path_pending = False
+        if self.waypoints:
+            last = self.waypoints[-1]
+            self.destination = Vec2(last.x, last.y)
+
+    def clear_path(self) -> None:
+        self.waypoints = []
+        self.path_pending = False
+
+    def draw(self, alpha: float = 1.0) -> None:
+        # Interpola entre el tick anterior y el actual
+        px, py = self.render_position(alpha)
+
         tex = self._choose_texture()
         if tex is None or getattr(tex, "id", 0) == 0:
             s = int(self.size)
-            draw_rectangle(int(self.position.x - s/2), int(self.position.y - s/2), s, s, self._fallback_color)
-            draw_rectangle_lines(int(self.position.x - s/2), int(self.position.y - s/2), s, s, BLACK)
+            draw_rectangle(int(px - s/2), int(py - s/2), s, s, to_color(self._fallback_color))
+            draw_rectangle_lines(int(px - s/2), int(py - s/2), s, s, BLACK)
             return
 
         scale = self._visual_height / max(1, tex.height)
         draw_w = int(tex.width * scale)
         draw_h = int(tex.height * scale)
-        draw_x = int(self.position.x - draw_w / 2)
-        draw_y = int(self.position.y - draw_h + self._feet_offset)
+        draw_x = int(px - draw_w / 2)
+        draw_y = int(py - draw_h + self._feet_offset)
 
-        draw_ellipse(int(self.position.x), int(self.position.y - 1), int(self._visual_height * 0.24), int(self._visual_height * 0.07), Color(0, 0, 0, 58))
+        draw_ellipse(int(px), int(py - 1), int(self._visual_height * 0.24), int(self._visual_height * 0.07), Color(0, 0, 0, 58))
         draw_texture_ex(tex, Vector2(draw_x, draw_y), 0.0, scale, WHITE)
 
     def _choose_texture(self) -> Optional[Texture2D]:
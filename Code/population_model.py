@@ -0,0 +1,160 @@
+# population_model.py
+# Población agregada de las escenas donde no está el jugador. Al salir de
+# una escena se congelan sus conteos por especie; al volver se avanza el
+# modelo de una vez por el tiempo de juego transcurrido y AnimalManager
+# materializa la diferencia (nacen o desaparecen individuos). Las escenas
+# inactivas no cuestan nada por cuadro: solo hay cálculo al entrar.
+#
+# Modelo (tiempo en días de juego), presas N = amistosos, depredadores P = hostiles:
+#   dN/dt = r·N·(1 - N/K) - a·P·N
+#   dP/dt = (c·a·N - m)·P - b·P²
+# Con el otro grupo fijo durante un tramo, cada ecuación es de Bernoulli
+# (dx/dt = g·x - b·x²) y tiene solución cerrada; se encadenan tramos de
+# STEP_DAYS (a lo sumo MAX_STEPS) para ausencias largas.
+from __future__ import annotations
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional
+import math
+
+STEP_DAYS = 0.25   # largo de cada tramo de solución cerrada
+MAX_STEPS = 240    # tope de tramos (ausencias muy largas usan tramos más largos)
+
+
+@dataclass
+class PopulationParams:
+    prey_growth: float = 0.6        # r: natalidad neta de las presas (1/día)
+    capacity: float = 0.0           # K: capacidad de carga de presas (0 = según la tabla)
+    predation: float = 0.08         # a: fracción de presas que caza cada depredador por día
+    conversion: float = 0.4         # c: depredadores nuevos por presa cazada
+    predator_death: float = 0.2     # m: mortalidad de depredadores (1/día)
+    predator_capacity: float = 0.0  # tope de depredadores (0 = según la tabla)
+    prey_floor: float = 2.0         # mínimos (inmigración desde escenas vecinas)
+    predator_floor: float = 1.0
+
+
+@dataclass
+class ScenePopulation:
+    counts: Dict[str, float]   # especie -> individuos
+    since: float               # día de juego del último conteo
+
+
+def params_for(table: Dict[str, Any]) -> PopulationParams:
+    """
+    Parámetros de una tabla de ANIMAL_TABLES: la clave opcional "population"
+    sobrescribe los valores; las capacidades por defecto salen de
+    first_count y del peso de amistosos/hostiles.
+    """
+    overrides = table.get("population") or {}
+    known = {f.name for f in fields(PopulationParams)}
+    p = replace(PopulationParams(), **{k: v for k, v in overrides.items() if k in known})
+
+    species = table["species"].values()
+    total_w = float(sum(e["w"] for e in species)) or 1.0
+    prey_w = sum(e["w"] for e in species if e["spec"].friendly) / total_w
+    top = float(table["first_count"][1]) * 1.5
+    if p.capacity <= 0.0:
+        p.capacity = max(p.prey_floor, top * prey_w)
+    if p.predator_capacity <= 0.0:
+        p.predator_capacity = max(p.predator_floor, top * (1.0 - prey_w))
+    return p
+
+
+def _bernoulli(x0: float, g: float, b: float, t: float) -> float:
+    """Solución de dx/dt = g·x - b·x² en t, partiendo de x0 >= 0."""
+    if x0 <= 0.0 or t <= 0.0:
+        return max(0.0, x0)
+    if abs(g) < 1e-9:
+        return x0 / (1.0 + b * x0 * t)
+    e = math.exp(max(-50.0, min(50.0, g * t)))
+    return max(0.0, x0 * e / (1.0 + b * x0 * (e - 1.0) / g))
+
+
+class PopulationModel:
+    """Estado congelado por escena y proyección en forma cerrada."""
+
+    def __init__(self) -> None:
+        self.scenes: Dict[int, ScenePopulation] = {}
+
+    def has(self, scene_id: int) -> bool:
+        return scene_id in self.scenes
+
+    def freeze(self, scene_id: int, counts: Dict[str, int], now: float) -> None:
+        """Guarda los conteos al salir de la escena ('now' en días de juego)."""
+        self.scenes[scene_id] = ScenePopulation({k: float(v) for k, v in counts.items()}, now)
+
+    def discard(self, scene_id: int) -> None:
+        """La escena vuelve a simularse individuo por individuo."""
+        self.scenes.pop(scene_id, None)
+
+    def project(self, scene_id: int, now: float, table: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """
+        Individuos por especie en 'now' sin modificar el estado (apto para el
+        hilo de carga). None si la escena no tiene estado congelado.
+        """
+        state = self.scenes.get(scene_id)
+        if state is None:
+            return None
+        p = params_for(table)
+        species = table["species"]
+        prey_keys = [k for k, e in species.items() if e["spec"].friendly]
+        pred_keys = [k for k, e in species.items() if not e["spec"].friendly]
+        counts = {k: state.counts.get(k, 0.0) for k in species}
+
+        n0 = sum(counts[k] for k in prey_keys)
+        p0 = sum(counts[k] for k in pred_keys)
+        n, pr = self._advance(n0, p0, max(0.0, now - state.since), p)
+        n = max(n, p.prey_floor) if prey_keys else 0.0
+        pr = max(pr, p.predator_floor) if pred_keys else 0.0
+
+        self._rescale(counts, prey_keys, n0, n, species)
+        self._rescale(counts, pred_keys, p0, pr, species)
+        # Redondeo por grupo que respeta el total (un 0.5 + 0.5 de lobos y alces da un depredador)
+        result: Dict[str, int] = {}
+        result.update(self._round_group(counts, prey_keys, n))
+        result.update(self._round_group(counts, pred_keys, pr))
+        return result
+
+    def _advance(self, n: float, pr: float, days: float, p: PopulationParams):
+        if days <= 0.0:
+            return n, pr
+        steps = max(1, min(MAX_STEPS, int(math.ceil(days / STEP_DAYS))))
+        h = days / steps
+        r, a = p.prey_growth, p.predation
+        b_prey = r / max(1e-6, p.capacity)
+        # Hacinamiento de depredadores: equilibrio en predator_capacity con presas en K
+        b_pred = max(1e-3, p.conversion * a * p.capacity - p.predator_death) / max(1e-6, p.predator_capacity)
+        for _ in range(steps):
+            n1 = _bernoulli(n, r - a * pr, b_prey, h)
+            pr = _bernoulli(pr, p.conversion * a * 0.5 * (n + n1) - p.predator_death, b_pred, h)
+            n = n1
+        return n, pr
+
+    @staticmethod
+    def _round_group(counts: Dict[str, float], keys, total: float) -> Dict[str, int]:
+        """Mayor resto: enteros por especie que suman round(total)."""
+        out = {k: int(math.floor(counts[k])) for k in keys}
+        missing = int(round(total)) - sum(out.values())
+        by_remainder = sorted(keys, key=lambda k: counts[k] - out[k], reverse=True)
+        for k in by_remainder[:max(0, missing)]:
+            out[k] += 1
+        return out
+
+    @staticmethod
+    def _rescale(counts: Dict[str, float], keys, old: float, new: float,
+                 species: Dict[str, Any]) -> None:
+        """Reparte el total nuevo: las bajas en proporción a lo que hay, los nacimientos según 'w'."""
+        if not keys:
+            return
+        if new <= old and old > 0.0:
+            f = new / old
+            for k in keys:
+                counts[k] *= f
+            return
+        extra = new - old
+        total_w = float(sum(species[k]["w"] for k in keys)) or 1.0
+        for k in keys:
+            counts[k] += extra * species[k]["w"] / total_w
+
+
+# Exportar
+__all__ = ["PopulationParams", "ScenePopulation", "PopulationModel", "params_for"]
@@ -0,0 +1,176 @@
+# recipe_registry.py
+# Registro compilado de recetas: ids enteros de items, varias recetas por
+# resultado y arreglos densos de requisitos para chequeos rápidos.
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Tuple, Iterable, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # NumPy es opcional: sin él se recorre receta por receta
+    np = None
+
+# Entrada cruda: (item_resultado, cantidad_resultado, [(item_requerido, cantidad), ...])
+RawRecipe = Tuple[str, int, List[Tuple[str, int]]]
+
+
+def load_item_ids() -> List[str]:
+    """Ids de todos los items del catálogo (items_registry), en orden estable."""
+    try:
+        from items_registry import iter_all_items  # type: ignore
+        return [it[0] for it in iter_all_items()]
+    except Exception as e:
+        print("[recipe_registry] No se pudo cargar items_registry:", e)
+        return []
+
+
+class RecipeRegistry:
+    """
+    Compila la tabla de recetas a estructuras indexadas por entero:
+      - item_ids / item_index:      str <-> int de cada item del catálogo
+      - recipe_ids / recipe_index:  str <-> int de cada receta
+      - out_item / out_qty:         resultado de cada receta
+      - req_items / req_qty:        requisitos de cada receta (pares paralelos)
+      - by_output:                  recetas que producen cada item
+
+    Con NumPy, max_counts() evalúa todo el recetario con una sola división
+    entera sobre las celdas no nulas de la matriz (recetas x items) y una
+    reducción de mínimo por fila.
+
+    El primer resultado de un item conserva el id del item como id de receta
+    ("planks"); las alternativas se numeran ("planks#2", "planks#3", ...).
+    """
+
+    def __init__(self, recipes: Iterable[RawRecipe], item_ids: Optional[Sequence[str]] = None) -> None:
+        ids = list(item_ids) if item_ids is not None else load_item_ids()
+        self.item_ids: List[str] = []
+        self.item_index: Dict[str, int] = {}
+        for item_id in ids:
+            if item_id not in self.item_index:
+                self.item_index[item_id] = len(self.item_ids)
+                self.item_ids.append(item_id)
+
+        self.recipe_ids: List[str] = []
+        self.recipe_index: Dict[str, int] = {}
+        self.out_item = array("i")
+        self.out_qty = array("i")
+        self.req_items: List[array] = []
+        self.req_qty: List[array] = []
+        self.by_output: Dict[int, List[int]] = {}
+        self.errors: List[str] = []
+
+        # Requisitos aplanados para NumPy (se arman al primer uso)
+        self._flat_items = None
+        self._flat_qty = None
+        self._row_starts = None
+
+        for entry in recipes:
+            self._add(entry)
+
+        for msg in self.errors:
+            print("[recipe_registry]", msg)
+
+    # ----- Carga -----
+
+    def _add(self, entry: RawRecipe) -> None:
+        try:
+            out_id, out_qty, requirements = entry
+        except (TypeError, ValueError):
+            self.errors.append(f"Receta mal formada: {entry!r}")
+            return
+
+        unknown = [i for i in [out_id] + [r for r, _ in requirements] if i not in self.item_index]
+        if unknown:
+            self.errors.append(f"Receta '{out_id}' ignorada, items desconocidos: {', '.join(unknown)}")
+            return
+        if not requirements:
+            self.errors.append(f"Receta '{out_id}' ignorada, no tiene requisitos")
+            return
+        if int(out_qty) <= 0 or any(int(q) <= 0 for _, q in requirements):
+            self.errors.append(f"Receta '{out_id}' ignorada, cantidades no positivas")
+            return
+
+        out_idx = self.item_index[out_id]
+        alts = self.by_output.setdefault(out_idx, [])
+        recipe_id = out_id if not alts else f"{out_id}#{len(alts) + 1}"
+
+        # Agrupa requisitos repetidos del mismo item
+        merged: Dict[int, int] = {}
+        for req_id, qty in requirements:
+            idx = self.item_index[req_id]
+            merged[idx] = merged.get(idx, 0) + int(qty)
+
+        r = len(self.recipe_ids)
+        self.recipe_ids.append(recipe_id)
+        self.recipe_index[recipe_id] = r
+        self.out_item.append(out_idx)
+        self.out_qty.append(int(out_qty))
+        self.req_items.append(array("i", merged.keys()))
+        self.req_qty.append(array("i", merged.values()))
+        alts.append(r)
+
+    # ----- Consultas -----
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.item_ids)
+
+    def resolve(self, recipe) -> Optional[int]:
+        """Índice de receta a partir de su id (str) o del propio índice (int)."""
+        if isinstance(recipe, int):
+            return recipe if 0 <= recipe < len(self.recipe_ids) else None
+        return self.recipe_index.get(recipe)
+
+    def output_id(self, r: int) -> str:
+        return self.item_ids[self.out_item[r]]
+
+    def requirements(self, r: int) -> List[Tuple[str, int]]:
+        """Requisitos de la receta con ids de texto (para UI/planificador)."""
+        ids = self.item_ids
+        return [(ids[i], q) for i, q in zip(self.req_items[r], self.req_qty[r])]
+
+    def recipes_for(self, item_id: str) -> List[int]:
+        """Recetas (índices) que producen 'item_id', en orden de declaración."""
+        idx = self.item_index.get(item_id)
+        if idx is None:
+            return []
+        return self.by_output.get(idx, [])
+
+    def max_crafts(self, r: int, counts: Sequence[int]) -> int:
+        """Veces que puede ejecutarse la receta 'r' con el vector de cantidades 'counts'."""
+        best = -1
+        for idx, qty in zip(self.req_items[r], self.req_qty[r]):
+            n = counts[idx] // qty
+            if best < 0 or n < best:
+                best = n
+                if best == 0:
+                    break
+        return max(0, best)
+
+    def max_counts(self, counts: Sequence[int]) -> Sequence[int]:
+        """
+        Veces que puede ejecutarse cada receta (en orden de recipe_ids) con el
+        vector de cantidades 'counts'. Con NumPy retorna un ndarray.
+        """
+        if np is None or not self.recipe_ids:
+            return [self.max_crafts(r, counts) for r in range(len(self.recipe_ids))]
+        if self._flat_items is None:
+            self._build_flat()
+        avail = np.asarray(counts, dtype=np.int64)
+        per_req = avail[self._flat_items] // self._flat_qty
+        return np.minimum.reduceat(per_req, self._row_starts)
+
+    def _build_flat(self) -> None:
+        # Requisitos de todas las recetas aplanados (solo celdas no nulas de la
+        # matriz recetas x items); cada receta tiene al menos un requisito.
+        self._flat_items = np.fromiter((i for reqs in self.req_items for i in reqs), dtype=np.intp)
+        self._flat_qty = np.fromiter((q for qtys in self.req_qty for q in qtys), dtype=np.int64)
+        lengths = np.fromiter((len(reqs) for reqs in self.req_items), dtype=np.intp)
+        self._row_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+
+# Exportar
+__all__ = ["RecipeRegistry", "RawRecipe", "load_item_ids"]
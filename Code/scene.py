@@ -1,30 +1,33 @@
 # scene.py
 from __future__ import annotations
-from typing import Dict, Tuple, Optional, List
-from pyray import *
+from typing import Dict, Iterable, Tuple, Optional, List
 from collisions import CollisionMap  # tu CollisionMap
+from sim_types import Vec2, RGBA
+
+try:
+    from pyray import *  # texturas y dibujo
+except ImportError:
+    pass
 
 Point = Tuple[float, float]
 
-def _scale_color(c: Color, factor: float) -> Color:
+def _scale_color(c: RGBA, factor: float) -> RGBA:
     """Oscurece/aclarea un color multiplicando sus canales RGB por 'factor'."""
-    r = int(max(0, min(255, c.r * factor)))
-    g = int(max(0, min(255, c.g * factor)))
-    b = int(max(0, min(255, c.b * factor)))
-    return Color(r, g, b, c.a)
+    return RGBA.of(c).scaled(factor)
 
 class Scene:
     def __init__(
         self,
         scene_id: int,
-        size: Vector2,
-        color: Color,                        # compatibilidad: si no pasas land_color, usa este
-        spawn: Vector2,
+        size: Vec2,
+        color: RGBA,                         # compatibilidad: si no pasas land_color, usa este
+        spawn: Vec2,
         grid_cell_size: int = 64,
         grid_enabled: bool = True,
         polygon_norm: Optional[List[Point]] = None,  # Polígono normalizado (0..1)
-        land_color: Optional[Color] = None,          # Color interior (cesped)
-        outer_color: Optional[Color] = None,         # Color exterior (más oscuro)
+        land_color: Optional[RGBA] = None,           # Color interior (cesped)
+        outer_color: Optional[RGBA] = None,          # Color exterior (más oscuro)
+        blocked_cells: Optional[Iterable[Tuple[int, int]]] = None,  # celdas sólidas ya calculadas (caché)
     ) -> None:
         self.scene_id = scene_id
         self.size = size
@@ -34,18 +37,19 @@ class Scene:
         self.grid_enabled = grid_enabled
 
         # Interior y exterior (exterior claramente más oscuro para que se note)
-        self.land_color: Color = land_color if land_color is not None else color
-        self.outer_color: Color = outer_color if outer_color is not None else _scale_color(self.land_color, 0.70)
+        self.land_color: RGBA = RGBA.of(land_color if land_color is not None else color)
+        self.outer_color: RGBA = RGBA.of(outer_color) if outer_color is not None else _scale_color(self.land_color, 0.70)
 
         # Tiles/texturas (aseguramos su existencia)
         self._tiles: Dict[Tuple[int, int], Texture] = {}
 
         # Contorno y colisión
-        self.polygon_world: Optional[List[Vector2]] = None
+        self.polygon_world: Optional[List[Vec2]] = None
+        self._polygon_draw: Optional[list] = None  # mismo polígono como Vector2 (solo dibujo)
         self.collision_map: Optional[CollisionMap] = None
 
         if polygon_norm:
-            self._build_polygon_and_collisions(polygon_norm)
+            self._build_polygon_and_collisions(polygon_norm, blocked_cells)
 
         self.show_grid = True
 
@@ -68,30 +72,36 @@ class Scene:
         self._tiles.clear()
 
     # --- Conversión mundo↔celda ---
-    def world_to_cell(self, pos: Vector2) -> Tuple[int, int]:
+    def world_to_cell(self, pos: Vec2) -> Tuple[int, int]:
         cs = self.grid_cell_size
         return int(pos.x // cs), int(pos.y // cs)
 
-    def cell_to_world(self, cell: Tuple[int, int]) -> Vector2:
+    def cell_to_world(self, cell: Tuple[int, int]) -> Vec2:
         cs = self.grid_cell_size
-        return Vector2(cell[0] * cs, cell[1] * cs)
+        return Vec2(cell[0] * cs, cell[1] * cs)
 
     # ================= POLÍGONO + COLISIONES =================
 
-    def _build_polygon_and_collisions(self, polygon_norm: List[Point]) -> None:
+    def _build_polygon_and_collisions(self, polygon_norm: List[Point],
+                                      blocked_cells: Optional[Iterable[Tuple[int, int]]] = None) -> None:
         """
         Escala el polígono (0..1) al tamaño de escena y crea CollisionMap.
-        Todo lo que quede FUERA del polígono se marca como sólido.
+        Todo lo que quede FUERA del polígono se marca como sólido (o se toman
+        las celdas de 'blocked_cells' si vienen de la caché).
         """
         margin = 0.02  # mapas más amplios
         W, H = float(self.size.x), float(self.size.y)
         sx, sy = (1.0 - 2 * margin) * W, (1.0 - 2 * margin) * H
         ox, oy = margin * W, margin * H
-        self.polygon_world = [Vector2(ox + px * sx, oy + py * sy) for (px, py) in polygon_norm]
+        self.polygon_world = [Vec2(ox + px * sx, oy + py * sy) for (px, py) in polygon_norm]
 
         cols = max(1, int(W // self.grid_cell_size))
         rows = max(1, int(H // self.grid_cell_size))
         cm = CollisionMap(cols, rows)
+        if blocked_cells is not None:
+            cm.blocked = set(blocked_cells)
+            self.collision_map = cm
+            return
 
         # Marca sólido fuera del polígono
         for r in range(rows):
@@ -103,7 +113,7 @@ class Scene:
         self.collision_map = cm
 
     @staticmethod
-    def _point_in_polygon(x: float, y: float, poly: List[Vector2]) -> bool:
+    def _point_in_polygon(x: float, y: float, poly: List[Vec2]) -> bool:
         inside = False
         n = len(poly)
         for i in range(n):
@@ -123,21 +133,26 @@ class Scene:
         Si hay polígono: pinta el exterior con 'outer_color' y el interior con 'land_color'.
         Si NO hay polígono: pinta todo con 'land_color' (Escena 1 u otras rectangulares).
         """
+        land = self.land_color.to_color()
         if self.polygon_world:
+            if self._polygon_draw is None:
+                self._polygon_draw = [Vector2(p.x, p.y) for p in self.polygon_world]
+            pts = self._polygon_draw
+
             # Exterior (mismo tono, más oscuro) — esto cubre TODO el mundo
-            draw_rectangle(0, 0, int(self.size.x), int(self.size.y), self.outer_color)
+            draw_rectangle(0, 0, int(self.size.x), int(self.size.y), self.outer_color.to_color())
 
             # Masa terrestre (interior)
-            self._draw_filled_polygon(self.polygon_world, self.land_color)
+            self._draw_filled_polygon(pts, land)
 
             # “Repaso” del borde para evitar cualquier micro-grieta entre triángulos
-            self._draw_polygon_outline(self.polygon_world, self.land_color, 1)
+            self._draw_polygon_outline(pts, land, 1)
 
             # Borde sutil más oscuro para separar interior/exterior
-            edge_col = _scale_color(self.land_color, 0.55)
-            self._draw_polygon_outline(self.polygon_world, edge_col, 2)
+            edge_col = _scale_color(self.land_color, 0.55).to_color()
+            self._draw_polygon_outline(pts, edge_col, 2)
         else:
-            draw_rectangle(0, 0, int(self.size.x), int(self.size.y), self.land_color)
+            draw_rectangle(0, 0, int(self.size.x), int(self.size.y), land)
 
         # Rejilla opcional
         if self.grid_enabled and self.show_grid:
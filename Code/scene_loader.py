@@ -0,0 +1,138 @@
+# scene_loader.py
+# Preparación de escenas en segundo plano durante la transición de carga.
+# El trabajo de CPU (spawns, animales, colisiones) corre en un hilo de
+# trabajo mientras la pantalla hace el fundido. Lo que toca raylib (subir
+# texturas, crear recursos de GPU) solo puede correr en el hilo principal:
+# los pasos lo encolan con job.on_main(fn) y Game lo ejecuta en pump().
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+
+# (nombre, peso en la barra de progreso, función(job) -> resultado)
+SceneStep = Tuple[str, float, Callable[["SceneJob"], Any]]
+
+
+class SceneJob:
+    """Una preparación de escena: pasos con peso, progreso y resultados."""
+
+    def __init__(self, scene_index: int, steps: List[SceneStep]) -> None:
+        self.scene_index = scene_index
+        self.label = ""                       # paso en curso (para la UI)
+        self.results: Dict[str, Any] = {}     # nombre de paso -> resultado
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        self._steps = steps
+        self._total = sum(max(0.0, w) for _, w, _ in steps) or 1.0
+        self._done_w = 0.0
+        self._main: "queue.SimpleQueue[Tuple[Callable[..., Any], tuple]]" = queue.SimpleQueue()
+        self._main_pending = 0
+        self._lock = threading.Lock()
+        self._worker_done = threading.Event()
+
+    # ----- Hilo de trabajo -----
+
+    def run(self) -> None:
+        try:
+            for label, weight, fn in self._steps:
+                if self.cancelled:
+                    break
+                self.label = label
+                self.results[label] = fn(self)
+                self._done_w += max(0.0, weight)
+        except BaseException as e:  # se reporta al hilo principal
+            self.error = e
+        finally:
+            self._worker_done.set()
+
+    def on_main(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Encola fn(*args) para el hilo principal (subidas a GPU, raylib)."""
+        with self._lock:
+            self._main_pending += 1
+        self._main.put((fn, args))
+
+    # ----- Hilo principal -----
+
+    def pump(self, budget: float) -> int:
+        """Ejecuta tareas encoladas hasta agotar 'budget' segundos (al menos una)."""
+        ran = 0
+        deadline = time.perf_counter() + budget
+        while True:
+            try:
+                fn, args = self._main.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if not self.cancelled:
+                    fn(*args)
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+            with self._lock:
+                self._main_pending -= 1
+            ran += 1
+            if time.perf_counter() >= deadline:
+                break
+        return ran
+
+    @property
+    def progress(self) -> float:
+        """0..1 según los pasos terminados; no llega a 1 con tareas pendientes."""
+        p = min(1.0, self._done_w / self._total)
+        if not self.done:
+            p = min(p, 0.99)
+        return p
+
+    @property
+    def done(self) -> bool:
+        return self._worker_done.is_set() and self._main_pending == 0
+
+
+class SceneLoader:
+    """
+    Lanza SceneJobs en un hilo de trabajo. Con threaded=False (headless,
+    replays) el trabajo corre en el acto y el resultado es determinista.
+    """
+
+    def __init__(self, threaded: bool = True, main_budget: float = 0.004) -> None:
+        self.threaded = threaded
+        self.main_budget = main_budget   # segundos por tick para tareas de GPU
+        self.job: Optional[SceneJob] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, scene_index: int, steps: List[SceneStep]) -> SceneJob:
+        self.cancel()
+        job = SceneJob(scene_index, steps)
+        self.job = job
+        if self.threaded:
+            self._thread = threading.Thread(
+                target=job.run, name=f"scene-loader-{scene_index}", daemon=True
+            )
+            self._thread.start()
+        else:
+            job.run()
+        return job
+
+    def pump(self) -> Optional[SceneJob]:
+        """Corre tareas de hilo principal del trabajo activo (llamar cada tick)."""
+        if self.job is not None:
+            self.job.pump(self.main_budget)
+        return self.job
+
+    def cancel(self) -> None:
+        if self.job is not None:
+            self.job.cancelled = True
+            self.job = None
+        self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera al hilo de trabajo (al cerrar el juego o en pruebas)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+
+# Exportar
+__all__ = ["SceneLoader", "SceneJob", "SceneStep"]
@@ -0,0 +1,130 @@
+# sim_types.py
+# Tipos de valor livianos para la simulación (posiciones y colores). Son
+# objetos Python con __slots__: leerlos y escribirlos es bastante más rápido
+# que las structs cffi de pyray, y no requieren raylib. Se convierten a
+# Vector2 / Color solo en el borde de dibujo (to_vector2 / to_color).
+from __future__ import annotations
+from typing import Any, Iterator, Tuple
+import math
+
+try:
+    import pyray as _rl  # type: ignore
+except ImportError:
+    _rl = None  # sin raylib: la simulación funciona, solo no se puede dibujar
+
+# Rectángulo de simulación: (x, y, w, h)
+Rect = Tuple[float, float, float, float]
+
+
+class Vec2:
+    """Vector 2D mutable (posiciones, direcciones)."""
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0) -> None:
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def of(cls, v: Any) -> "Vec2":
+        """Copia desde Vec2, Vector2, tupla/lista (x, y) u objeto con .x/.y."""
+        if isinstance(v, (tuple, list)):
+            return cls(float(v[0]), float(v[1]))
+        return cls(float(v.x), float(v.y))
+
+    def copy(self) -> "Vec2":
+        return Vec2(self.x, self.y)
+
+    def set(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
+
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def distance_to(self, other: Any) -> float:
+        return math.hypot(other.x - self.x, other.y - self.y)
+
+    def to_vector2(self) -> Any:
+        return _rl.Vector2(self.x, self.y)
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Vec2) and self.x == other.x and self.y == other.y
+
+    def __repr__(self) -> str:
+        return f"Vec2({self.x:.2f}, {self.y:.2f})"
+
+
+class RGBA:
+    """Color inmutable (0..255). La Color de pyray se crea una vez y se cachea."""
+    __slots__ = ("r", "g", "b", "a", "_color")
+
+    def __init__(self, r: int, g: int, b: int, a: int = 255) -> None:
+        self.r = r
+        self.g = g
+        self.b = b
+        self.a = a
+        self._color: Any = None
+
+    @classmethod
+    def of(cls, c: Any) -> "RGBA":
+        """Desde RGBA, Color de pyray o tupla (r, g, b[, a])."""
+        if isinstance(c, RGBA):
+            return c
+        if isinstance(c, (tuple, list)):
+            return cls(int(c[0]), int(c[1]), int(c[2]), int(c[3]) if len(c) > 3 else 255)
+        return cls(int(c.r), int(c.g), int(c.b), int(c.a))
+
+    def scaled(self, factor: float) -> "RGBA":
+        """Oscurece/aclara los canales RGB multiplicando por 'factor'."""
+        return RGBA(
+            int(max(0, min(255, self.r * factor))),
+            int(max(0, min(255, self.g * factor))),
+            int(max(0, min(255, self.b * factor))),
+            self.a,
+        )
+
+    def as_tuple(self) -> Tuple[int, int, int, int]:
+        return (self.r, self.g, self.b, self.a)
+
+    def to_color(self) -> Any:
+        if self._color is None:
+            self._color = _rl.Color(self.r, self.g, self.b, self.a)
+        return self._color
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RGBA) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return f"RGBA({self.r}, {self.g}, {self.b}, {self.a})"
+
+
+class Camera:
+    """Cámara 2D con los campos de Camera2D, para correr headless sin raylib."""
+    __slots__ = ("offset", "target", "rotation", "zoom")
+
+    def __init__(self) -> None:
+        self.offset = Vec2()
+        self.target = Vec2()
+        self.rotation = 0.0
+        self.zoom = 1.0
+
+
+def to_color(c: Any) -> Any:
+    """Color de pyray para dibujar (acepta RGBA o una Color ya hecha)."""
+    return c.to_color() if isinstance(c, RGBA) else c
+
+
+def to_vector2(v: Any) -> Any:
+    """Vector2 de pyray para dibujar (acepta Vec2 o un Vector2 ya hecho)."""
+    return _rl.Vector2(v.x, v.y) if isinstance(v, Vec2) else v
+
+
+# Exportar
+__all__ = ["Vec2", "RGBA", "Rect", "Camera", "to_color", "to_vector2"]
@@ -0,0 +1,270 @@
+# smelting_optimizer.py
+# Cálculos de fundición para jugadores y balance: unidades de combustible,
+# tiempo real e items/segundo por horno, y la mezcla de combustible más
+# barata para fundir un lote. Todo es aritmética O(1) sobre datos cacheados
+# por par (receta, combustible), así que sirve para barridos de balance.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import math
+
+from furnace_system import SMELTING_RECIPES, COMBUSTIBLES
+
+# Costo relativo de una unidad de combustible (lo que "vale" quemarla).
+# Las tablas salen de un tronco (1 log = 4 planks); el resto es estimado.
+# Combustibles que no estén aquí cuestan 1.0.
+FUEL_COSTS: Dict[str, float] = {
+    "leaves": 0.5,
+    "wood_branch": 1.0,
+    "log_small": 2.0,
+    "log": 4.0,
+    "planks": 1.0,
+    "ore_coal": 6.0,
+    "carbon_element": 10.0,
+}
+
+_EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class SmeltPair:
+    """Datos precalculados de una receta con un combustible."""
+    input_id: str
+    fuel_id: str
+    output_id: str
+    output_qty: int
+    process_time: float      # segundos por item
+    burn_time: float         # segundos por unidad de combustible
+    items_per_fuel: float    # items procesados por unidad de combustible
+    items_per_second: float  # items de salida por segundo (un horno)
+
+
+@dataclass
+class SmeltEstimate:
+    """Resultado de estimar un lote con un solo tipo de combustible."""
+    pair: SmeltPair
+    qty: int                 # items de entrada pedidos
+    furnaces: int
+    fuel_units: int          # unidades necesarias para todo el lote
+    completed: int           # items que se llegan a procesar con el combustible dado
+    output: int              # items de salida obtenidos
+    wall_time: float         # segundos hasta terminar (o hasta agotar el combustible)
+    fuel_wasted: float       # segundos de combustible que sobran en la última unidad
+
+    @property
+    def feasible(self) -> bool:
+        return self.completed >= self.qty
+
+
+@dataclass
+class FuelMix:
+    """Mezcla de combustibles elegida para un lote."""
+    input_id: str
+    qty: int
+    units: Dict[str, int] = field(default_factory=dict)
+    burn_seconds: float = 0.0
+    needed_seconds: float = 0.0
+    cost: float = 0.0
+
+    @property
+    def feasible(self) -> bool:
+        return self.burn_seconds + _EPS >= self.needed_seconds
+
+
+class SmeltingOptimizer:
+    """
+    Estimador de fundición. Se puede construir con tablas propias para
+    probar balances sin tocar las globales.
+    """
+
+    def __init__(
+        self,
+        recipes: Optional[Dict[str, Tuple[str, int, float]]] = None,
+        fuels: Optional[Dict[str, float]] = None,
+        fuel_costs: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.recipes = recipes if recipes is not None else SMELTING_RECIPES
+        self.fuels = fuels if fuels is not None else COMBUSTIBLES
+        self.fuel_costs = fuel_costs if fuel_costs is not None else FUEL_COSTS
+        self._pairs: Dict[Tuple[str, str], Optional[SmeltPair]] = {}
+        self._by_value: Optional[List[Tuple[float, str]]] = None
+
+    # ----- Datos por par -----
+
+    def pair(self, input_id: str, fuel_id: str) -> Optional[SmeltPair]:
+        """Datos de (receta, combustible), cacheados. None si no existe alguno."""
+        key = (input_id, fuel_id)
+        if key in self._pairs:
+            return self._pairs[key]
+        recipe = self.recipes.get(input_id)
+        burn = self.fuels.get(fuel_id, 0.0)
+        result: Optional[SmeltPair] = None
+        if recipe is not None and burn > 0.0 and recipe[2] > 0.0:
+            output_id, output_qty, process_time = recipe
+            result = SmeltPair(
+                input_id, fuel_id, output_id, output_qty, process_time, burn,
+                burn / process_time, output_qty / process_time,
+            )
+        self._pairs[key] = result
+        return result
+
+    def clear_cache(self) -> None:
+        """Invalida la caché (llamar si cambian las tablas)."""
+        self._pairs.clear()
+        self._by_value = None
+
+    # ----- Estimaciones -----
+
+    def fuel_units(self, input_id: str, qty: int, fuel_id: str) -> int:
+        """Unidades de combustible para fundir 'qty' items en un horno."""
+        p = self.pair(input_id, fuel_id)
+        if p is None or qty <= 0:
+            return 0
+        return _ceil_div(qty * p.process_time, p.burn_time)
+
+    def estimate(
+        self,
+        input_id: str,
+        qty: int,
+        fuel_id: str,
+        fuel_available: Optional[int] = None,
+        furnaces: int = 1,
+    ) -> Optional[SmeltEstimate]:
+        """
+        Estima un lote repartido en 'furnaces' hornos iguales (cada uno quema
+        su propio combustible). Con 'fuel_available' se limita el combustible
+        total y se reporta cuánto se alcanza a procesar.
+        """
+        p = self.pair(input_id, fuel_id)
+        if p is None:
+            return None
+        qty = max(0, qty)
+        furnaces = max(1, min(furnaces, qty) if qty > 0 else 1)
+
+        # Reparto parejo: 'extra' hornos llevan un item más
+        base, extra = divmod(qty, furnaces)
+        units_big = _ceil_div((base + 1) * p.process_time, p.burn_time) if extra else 0
+        units_small = _ceil_div(base * p.process_time, p.burn_time)
+        units = extra * units_big + (furnaces - extra) * units_small
+
+        if fuel_available is None or fuel_available >= units:
+            completed = qty
+            wall = (base + (1 if extra else 0)) * p.process_time
+            wasted = units * p.burn_time - qty * p.process_time
+        else:
+            # Combustible corto: se reparte igual y cada horno procesa lo que alcance
+            fuel_available = max(0, fuel_available)
+            per_f, extra_f = divmod(fuel_available, furnaces)
+            completed = 0
+            wall = 0.0
+            for k in range(furnaces):
+                cap = base + (1 if k < extra else 0)
+                burn = (per_f + (1 if k < extra_f else 0)) * p.burn_time
+                completed += min(cap, int(burn / p.process_time + _EPS))
+                wall = max(wall, min(burn, cap * p.process_time))
+            units = fuel_available
+            wasted = 0.0
+
+        return SmeltEstimate(
+            pair=p,
+            qty=qty,
+            furnaces=furnaces,
+            fuel_units=units,
+            completed=completed,
+            output=completed * p.output_qty,
+            wall_time=wall,
+            fuel_wasted=max(0.0, wasted),
+        )
+
+    def best_fuel(self, input_id: str, fuel_inventory: Dict[str, int], qty: int) -> Optional[SmeltEstimate]:
+        """Combustible único más barato que alcanza para todo el lote (si hay)."""
+        best: Optional[SmeltEstimate] = None
+        best_cost = math.inf
+        for fuel_id, have in fuel_inventory.items():
+            units = self.fuel_units(input_id, qty, fuel_id)
+            if units <= 0 or units > have:
+                continue
+            cost = units * self.fuel_costs.get(fuel_id, 1.0)
+            if cost < best_cost:
+                best_cost = cost
+                best = self.estimate(input_id, qty, fuel_id)
+        return best
+
+    def cheapest_mix(self, input_id: str, qty: int, fuel_inventory: Dict[str, int]) -> FuelMix:
+        """
+        Mezcla más barata de combustibles del inventario para fundir 'qty'
+        items en un horno. Se llena con el combustible de menor costo por
+        segundo de quemado y el resto final se cubre con la unidad suelta
+        más barata que alcance (evita quemar una unidad cara para cubrir
+        unos pocos segundos).
+        """
+        recipe = self.recipes.get(input_id)
+        mix = FuelMix(input_id, max(0, qty))
+        if recipe is None or qty <= 0:
+            return mix
+        need = qty * recipe[2]
+        mix.needed_seconds = need
+
+        stock = {f: n for f, n in fuel_inventory.items() if n > 0 and self.fuels.get(f, 0.0) > 0.0}
+        remaining = need
+        for _, fuel_id in self._fuels_by_value():
+            if remaining <= _EPS:
+                break
+            have = stock.get(fuel_id, 0)
+            if have <= 0:
+                continue
+            burn = self.fuels[fuel_id]
+            # Unidades completas que caben sin pasarse
+            n = min(have, int(remaining / burn + _EPS))
+            if n > 0:
+                self._take(mix, stock, fuel_id, n)
+                remaining -= n * burn
+
+        if remaining > _EPS:
+            # Resto: la opción más barata entre todos los combustibles que queden
+            best: Optional[Tuple[float, str, int]] = None
+            for fuel_id, have in stock.items():
+                if have <= 0:
+                    continue
+                n = _ceil_div(remaining, self.fuels[fuel_id])
+                if n > have:
+                    continue
+                cost = n * self.fuel_costs.get(fuel_id, 1.0)
+                if best is None or cost < best[0]:
+                    best = (cost, fuel_id, n)
+            if best is not None:
+                self._take(mix, stock, best[1], best[2])
+            else:
+                # No alcanza: se quema todo lo que quede (mezcla infactible)
+                for fuel_id, have in list(stock.items()):
+                    if have > 0:
+                        self._take(mix, stock, fuel_id, have)
+        return mix
+
+    def throughput_table(self) -> Dict[str, float]:
+        """Items de salida por segundo (un horno) de cada receta."""
+        return {i: r[1] / r[2] for i, r in self.recipes.items() if r[2] > 0.0}
+
+    # ----- Internos -----
+
+    def _take(self, mix: FuelMix, stock: Dict[str, int], fuel_id: str, n: int) -> None:
+        stock[fuel_id] -= n
+        mix.units[fuel_id] = mix.units.get(fuel_id, 0) + n
+        mix.burn_seconds += n * self.fuels[fuel_id]
+        mix.cost += n * self.fuel_costs.get(fuel_id, 1.0)
+
+    def _fuels_by_value(self) -> List[Tuple[float, str]]:
+        # Costo por segundo de quemado, de menor a mayor
+        if self._by_value is None:
+            self._by_value = sorted(
+                (self.fuel_costs.get(f, 1.0) / b, f) for f, b in self.fuels.items() if b > 0.0
+            )
+        return self._by_value
+
+
+def _ceil_div(a: float, b: float) -> int:
+    return int(math.ceil(a / b - _EPS))
+
+
+# Exportar
+__all__ = ["SmeltingOptimizer", "SmeltPair", "SmeltEstimate", "FuelMix", "FUEL_COSTS"]
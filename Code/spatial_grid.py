@@ -0,0 +1,60 @@
+# spatial_grid.py
+# Rejilla uniforme para consultas de vecinos: cada objeto se inserta en la
+# celda de su posición y una consulta de radio r solo revisa las celdas que
+# cubren el cuadrado [x-r, x+r] x [y-r, y+r]. Con celda >= r son a lo sumo
+# 9 celdas, así que reconstruir y consultar todo cuesta ~O(n) en vez de O(n²).
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+
+
+class SpatialGrid:
+    """
+    Rejilla que se vacía y rellena cada tick. Las listas de las celdas se
+    reutilizan entre ticks (clear() solo las vacía) para no asignar memoria.
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size = max(1.0, float(cell_size))
+        self._cells: Dict[Tuple[int, int], List[Any]] = {}
+        self._used: List[List[Any]] = []   # celdas con contenido desde el último clear
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        for lst in self._used:
+            lst.clear()
+        self._used.clear()
+        self.count = 0
+
+    def insert(self, item: Any, x: float, y: float) -> None:
+        cs = self.cell_size
+        key = (int(x // cs), int(y // cs))
+        lst = self._cells.get(key)
+        if lst is None:
+            lst = self._cells[key] = []
+        if not lst:
+            self._used.append(lst)
+        lst.append(item)
+        self.count += 1
+
+    def query(self, x: float, y: float, radius: float, out: List[Any]) -> List[Any]:
+        """
+        Agrega a 'out' los objetos de las celdas que tocan el radio (candidatos:
+        quien llama filtra por distancia). Devuelve 'out'.
+        """
+        cs = self.cell_size
+        c0, c1 = int((x - radius) // cs), int((x + radius) // cs)
+        r0, r1 = int((y - radius) // cs), int((y + radius) // cs)
+        cells = self._cells
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                lst = cells.get((c, r))
+                if lst:
+                    out.extend(lst)
+        return out
+
+
+# Exportar
+__all__ = ["SpatialGrid"]
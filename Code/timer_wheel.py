@@ -0,0 +1,237 @@
+# timer_wheel.py
+# Rueda de temporizadores jerárquica para eventos de juego programados
+# (fin de cocción, cambio de clima, reapariciones...). Los sistemas agendan
+# un callback a futuro y solo cuestan algo cuando el evento se dispara.
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Tuple
+import heapq
+import math
+
+WHEEL_BITS = 6
+WHEEL_SLOTS = 1 << WHEEL_BITS      # 64 casillas por nivel
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4                   # 64^4 ticks; más allá va a 'overflow'
+
+
+class TimerHandle:
+    """Evento agendado. Se puede cancelar con TimerWheel.cancel()."""
+    __slots__ = ("tick", "when", "callback", "args", "interval", "cancelled")
+
+    def __init__(self, tick: int, when: float, callback: Callable[..., Any], args: tuple,
+                 interval: Optional[float]) -> None:
+        self.tick = tick
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+
+class TimerWheel:
+    """
+    Rueda jerárquica (4 niveles x 64 casillas) sobre un tiempo en segundos.
+    El nivel 0 tiene resolución de 'tick_seconds'; cada nivel superior cubre
+    64 veces más tiempo y se baja (cascada) al nivel inferior cuando le toca.
+    advance(now) procesa los ticks pendientes; si no hay timers, salta directo.
+    """
+
+    def __init__(self, tick_seconds: float = 0.05, now: float = 0.0) -> None:
+        self.tick_seconds = max(1e-4, float(tick_seconds))
+        self._tick = self._to_tick_floor(now)
+        self._wheels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)
+        ]
+        self._overflow: List[TimerHandle] = []
+        self._count = 0
+
+    # ----- API -----
+
+    @property
+    def now(self) -> float:
+        return self._tick * self.tick_seconds
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Llama callback(*args) dentro de 'delay' segundos."""
+        return self._add(self.now + max(0.0, delay), callback, args, None)
+
+    def schedule_at(self, when: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Llama callback(*args) cuando el tiempo llegue a 'when'."""
+        return self._add(when, callback, args, None)
+
+    def schedule_every(self, interval: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Llama callback(*args) cada 'interval' segundos hasta cancelarlo."""
+        interval = max(self.tick_seconds, interval)
+        return self._add(self.now + interval, callback, args, interval)
+
+    def cancel(self, handle: Optional[TimerHandle]) -> None:
+        if handle is None or handle.cancelled:
+            return
+        handle.cancelled = True
+        handle.callback = None  # type: ignore[assignment]
+        handle.args = ()
+        self._count -= 1
+
+    def advance(self, now: float) -> int:
+        """Avanza hasta el tiempo 'now' disparando lo vencido. Retorna cuántos se dispararon."""
+        target = self._to_tick_floor(now)
+        if target <= self._tick:
+            return 0
+        if self._count == 0:
+            self._tick = target
+            return 0
+        if target - self._tick > WHEEL_SLOTS:
+            return self._advance_bulk(target)
+        fired = 0
+        while self._tick < target:
+            self._tick += 1
+            self._cascade()
+            fired += self._fire_slot()
+        return fired
+
+    def reset(self, now: float) -> None:
+        """
+        Reubica la rueda en 'now' (hacia atrás o adelante) sin disparar nada:
+        cada timer pendiente conserva el tiempo que le faltaba.
+        """
+        pending = self._take_all()
+        old = self.now
+        self._tick = self._to_tick_floor(now)
+        base = self.now
+        for h in pending:
+            if h.cancelled:
+                continue
+            h.when = base + (h.when - old)
+            h.tick = max(self._tick + 1, int(math.ceil(h.when / self.tick_seconds - 1e-9)))
+            self._insert(h)
+
+    def clear(self) -> None:
+        for level in self._wheels:
+            for slot in level:
+                slot.clear()
+        self._overflow.clear()
+        self._count = 0
+
+    # ----- Internos -----
+
+    def _take_all(self) -> List[TimerHandle]:
+        # Saca todos los timers de las casillas y del desborde
+        pending: List[TimerHandle] = list(self._overflow)
+        self._overflow = []
+        for level in self._wheels:
+            for i, slot in enumerate(level):
+                if slot:
+                    pending.extend(slot)
+                    level[i] = []
+        return pending
+
+    def _to_tick_floor(self, t: float) -> int:
+        return int(math.floor(t / self.tick_seconds + 1e-9))
+
+    def _add(self, when: float, callback: Callable[..., Any], args: tuple,
+             interval: Optional[float]) -> TimerHandle:
+        tick = max(self._tick + 1, int(math.ceil(when / self.tick_seconds - 1e-9)))
+        h = TimerHandle(tick, when, callback, args, interval)
+        self._insert(h)
+        self._count += 1
+        return h
+
+    def _insert(self, h: TimerHandle) -> None:
+        delta = max(0, h.tick - self._tick)
+        for level in range(WHEEL_LEVELS):
+            if delta < (1 << (WHEEL_BITS * (level + 1))):
+                slot = (h.tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+                self._wheels[level][slot].append(h)
+                return
+        self._overflow.append(h)
+
+    def _cascade(self) -> None:
+        # Al completar una vuelta de un nivel se redistribuye la casilla del siguiente
+        tick = self._tick
+        for level in range(1, WHEEL_LEVELS):
+            if (tick >> (WHEEL_BITS * (level - 1))) & WHEEL_MASK:
+                return
+            slot = (tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+            bucket = self._wheels[level][slot]
+            if bucket:
+                self._wheels[level][slot] = []
+                for h in bucket:
+                    if not h.cancelled:
+                        self._insert(h)
+        if not (tick >> (WHEEL_BITS * (WHEEL_LEVELS - 1))) & WHEEL_MASK and self._overflow:
+            pending, self._overflow = self._overflow, []
+            for h in pending:
+                if not h.cancelled:
+                    self._insert(h)
+
+    def _fire_slot(self) -> int:
+        slot = self._tick & WHEEL_MASK
+        bucket = self._wheels[0][slot]
+        if not bucket:
+            return 0
+        self._wheels[0][slot] = []
+        fired = 0
+        for h in bucket:
+            if h.cancelled:
+                continue
+            if h.tick != self._tick:
+                self._insert(h)  # de una vuelta futura
+                continue
+            fired += self._run(h)
+        return fired
+
+    def _advance_bulk(self, target: int) -> int:
+        # Salto grande (carga de partida, dormir): se juntan todos los timers,
+        # se disparan los vencidos en orden (los periódicos se ponen al día)
+        # y el resto se vuelve a insertar.
+        pending = self._take_all()
+        self._tick = target
+        due: List[Tuple[int, int, TimerHandle]] = []
+        for seq, h in enumerate(pending):
+            if h.cancelled:
+                continue
+            if h.tick <= target:
+                due.append((h.tick, seq, h))
+            else:
+                self._insert(h)
+        heapq.heapify(due)
+        seq = len(pending)
+        fired = 0
+        while due:
+            _, _, h = heapq.heappop(due)
+            if h.cancelled:
+                continue
+            callback, args = h.callback, h.args
+            if h.interval is not None:
+                h.when += h.interval
+                h.tick = int(math.ceil(h.when / self.tick_seconds - 1e-9))
+                if h.tick <= target:
+                    seq += 1
+                    heapq.heappush(due, (h.tick, seq, h))
+                else:
+                    self._insert(h)
+            else:
+                h.cancelled = True
+                self._count -= 1
+            callback(*args)
+            fired += 1
+        return fired
+
+    def _run(self, h: TimerHandle) -> int:
+        callback, args = h.callback, h.args
+        if h.interval is not None:
+            # Periódico: se reagenda desde el momento teórico (sin deriva)
+            h.when += h.interval
+            h.tick = max(self._tick + 1, int(math.ceil(h.when / self.tick_seconds - 1e-9)))
+            self._insert(h)
+        else:
+            h.cancelled = True
+            self._count -= 1
+        callback(*args)
+        return 1
+
+
+# Exportar
+__all__ = ["TimerWheel", "TimerHandle"]
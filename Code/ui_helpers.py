@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 from typing import Tuple, Dict, Any
-from pyray import *
+try:
+    from pyray import *  # solo para dibujar / input de la UI
+except ImportError:
+    pass
 import math
 
 # Valores por defecto
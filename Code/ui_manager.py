@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 from typing import Optional, List, Any
-from pyray import *
 from math import sin
-from random import get_random_value
+import random
+try:
+    from pyray import *  # solo para dibujar
+except ImportError:
+    # Sin raylib (headless): teclas de input_handler y azar propio para los efectos del menú
+    from input_handler import KEY_BACKSPACE, KEY_SPACE
+    get_random_value = random.Random().randint
 
 # Importaciones de módulos auxiliares y de managers
 import ui_helpers
 from asset_manager import AssetManager
-from game_config import PAUSE_TAB_MAIN, TRANSITION_TIME, FADE_TIME 
+from crafting_ui import RecipeListView
+from game_config import PAUSE_TAB_MAIN, FADE_TIME
 
 # Definiciones de tipo para evitar dependencias circulares (solo para 'draw_play_state')
 class Scene: pass
@@ -42,6 +48,9 @@ class UIManager:
         self.rename_buffer: str = ""
         self.death_load_modal_open = False
 
+        # Lista de recetas (se crea al abrir el crafteo por primera vez)
+        self.crafting_view: Optional[RecipeListView] = None
+
         self._fsz = lambda base: ui_helpers.calc_font(self.screen_h, base)
         
     # --- MÉTODOS DE HELPERS Y LÓGICA DE UI ---
@@ -49,18 +58,22 @@ class UIManager:
     # Aquí irían los métodos: _draw_text_custom, _draw_text_shadow, _draw_panel, _menu_button (copiados de game.py)
     # y la lógica de input (handle_newgame_name_input) y efectos (init_main_menu_theme, update_menu_fx).
     
-    def handle_newgame_name_input(self) -> None:
-        # ... Lógica original de manejo de entrada de texto ...
-        key = get_char_pressed()
-        while key > 0:
-            if 32 <= key <= 125 and len(self.newgame_name) < 20:
-                self.newgame_name += chr(key)
-            key = get_char_pressed()
-        if is_key_pressed(KEY_BACKSPACE) and len(self.newgame_name) > 0:
+    def handle_newgame_name_input(self, source: Any) -> None:
+        # Texto del tick desde la fuente de entrada de Game (RaylibInput, guion o replay)
+        for ch in source.text():
+            if 32 <= ord(ch) <= 125 and len(self.newgame_name) < 20:
+                self.newgame_name += ch
+        if source.key_pressed(KEY_BACKSPACE) and len(self.newgame_name) > 0:
             self.newgame_name = self.newgame_name[:-1]
-        if is_key_pressed(KEY_SPACE) and len(self.newgame_name) < 20:
+        if source.key_pressed(KEY_SPACE) and len(self.newgame_name) < 20:
              self.newgame_name += " "
 
+    def recipe_view(self, crafting: CraftingSystem) -> RecipeListView:
+        """Lista de recetas del crafteo (se crea la primera vez que se usa)."""
+        if self.crafting_view is None or self.crafting_view.crafting is not crafting:
+            self.crafting_view = RecipeListView(crafting)
+        return self.crafting_view
+
     def init_main_menu_theme(self) -> None:
         # ... Lógica original de inicialización de partículas ...
         themes = ["Primavera", "Verano", "Otoño", "Invierno"]
@@ -99,20 +112,63 @@ class UIManager:
     def draw_play_state(self, scene: Scene, player: Player, camera: Camera2D, 
                         map_system: MapSystem, inventory: Inventory, crafting: CraftingSystem, 
                         furnace: FurnaceSystem, ingame_menu_open: bool, player_dead: bool, 
-                        clock: GameClock) -> None:
-        """Dibuja el HUD, Inventario, Menú de Pausa, Mapa, etc."""
-        # ... Lógica de dibujo del estado PLAY (delegando a los objetos de juego)
+                        clock: GameClock, alpha: float = 1.0, animals: Any = None,
+                        spawns: Any = None) -> None:
+        """
+        Dibuja el mundo (escena, items, animales y jugador) con la cámara y
+        encima el HUD, Inventario, Menú de Pausa, Mapa, etc.
+        'alpha' es la fracción entre ticks de simulación para interpolar
+        entidades (player.draw(alpha), animals.draw(scene_id, alpha)).
+        """
+        begin_mode_2d(camera)
+        scene.draw()
+        if spawns is not None:
+            spawns.draw(scene.scene_id)
+        if animals is not None:
+            animals.draw(scene.scene_id, alpha)
+        player.draw(alpha)
+        end_mode_2d()
+
+        # ... Resto del dibujo del estado PLAY (delegando a los objetos de juego)
         
         # Ejemplo: Dibujar el mapa y el inventario
         # map_system.draw_minimap(...)
         # inventory.draw(...) 
         # ...
-        pass
+        if crafting.is_open:
+            self.recipe_view(crafting).draw(self.screen_w, self.screen_h, inventory)
 
-    def draw_loading_overlay(self, loading: bool, trans_elapsed: float) -> None:
-        """Dibuja la pantalla de transición/carga."""
+    def draw_loading_overlay(self, loading: bool, trans_elapsed: float,
+                             progress: float = 1.0, fade_in_at: Optional[float] = None) -> None:
+        """
+        Dibuja la pantalla de transición/carga: fundido a negro (FADE_TIME),
+        barra con el progreso real mientras se prepara la escena y fundido de
+        vuelta desde 'fade_in_at' (no hay duración fija).
+        """
         if not loading: return
-        
-        # ... Lógica de fade in/out basada en trans_elapsed, TRANSITION_TIME, FADE_TIME ...
-        # ... Uso de self.assets.loading_texture ...
-        pass
\ No newline at end of file
+
+        if FADE_TIME <= 0:
+            a = 1.0 if fade_in_at is None else 0.0
+        elif fade_in_at is None:
+            a = min(1.0, trans_elapsed / FADE_TIME)
+        else:
+            a = 1.0 - min(1.0, (trans_elapsed - fade_in_at) / FADE_TIME)
+        draw_rectangle(0, 0, self.screen_w, self.screen_h, Color(0, 0, 0, int(255 * a)))
+        if fade_in_at is not None or a < 1.0:
+            return
+
+        tex = self.assets.loading_texture
+        if tex is not None:
+            draw_texture(tex, (self.screen_w - tex.width) // 2, (self.screen_h - tex.height) // 2, WHITE)
+
+        bar_w = int(self.screen_w * 0.4)
+        bar_h = 14
+        x = (self.screen_w - bar_w) // 2
+        y = int(self.screen_h * 0.82)
+        p = max(0.0, min(1.0, progress))
+        draw_rectangle(x, y, bar_w, bar_h, Color(60, 60, 60, 255))
+        draw_rectangle(x, y, int(bar_w * p), bar_h, Color(120, 200, 140, 255))
+        draw_rectangle_lines(x, y, bar_w, bar_h, Color(200, 200, 200, 255))
+        label = f"Cargando... {int(p * 100)}%"
+        fs = 20
+        draw_text(label, (self.screen_w - measure_text(label, fs)) // 2, y - fs - 8, fs, Color(235, 235, 235, 255))
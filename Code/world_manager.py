@@ -0,0 +1,241 @@
+# world_manager.py
+
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import base64
+import hashlib
+import json
+import os
+import threading
+
+from scene import Scene # Asumimos que Scene está definido en scene.py
+from sim_types import Vec2, RGBA, Rect
+# Importa la geometría estática de las zonas
+from zones_geometry import zone2_alaska_polygon, zone3_ppr_polygon, zone4_michigan_polygon
+
+# Versión del formato de la caché de escenas (subir si cambia el contenido)
+SCENE_CACHE_VERSION = 1
+
+# Archivos cuyo código define la geometría: si cambian, la caché se invalida
+_GEOMETRY_SOURCES = ("zones_geometry.py", "scene.py")
+
+
+class SceneList(Sequence):
+    """Lista de escenas que construye cada una en su primer acceso."""
+
+    def __init__(self, world: "WorldManager") -> None:
+        self._world = world
+
+    def __len__(self) -> int:
+        return self._world.scene_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._world.get_scene(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._world.get_scene(index)
+
+    def __iter__(self) -> Iterator[Scene]:
+        for i in range(len(self)):
+            yield self._world.get_scene(i)
+
+
+class WorldManager:
+    """
+    Encapsula la creación de escenas, las coordenadas de spawn y la geometría estática.
+    Las escenas se construyen al primer acceso (o en segundo plano con prewarm)
+    y su geometría derivada (polígono y celdas bloqueadas) se guarda en disco.
+    """
+
+    def __init__(self, scene_w: int, scene_h: int, cache_dir: Optional[str] = "cache") -> None:
+        self.scene_w = scene_w
+        self.scene_h = scene_h
+        self.cache_dir = cache_dir
+
+        # Geometría estática
+        self.cabins: dict[int, list[Rect]] = {}
+        self.workbenches: dict[int, list[Rect]] = {}
+        self.furnaces_pos: dict[int, list[Rect]] = {}
+
+        # Escenas perezosas: definición por índice, construidas bajo demanda
+        self._defs = self._scene_defs()
+        self._built: Dict[int, Scene] = {}
+        self._build_lock = threading.Lock()   # una construcción a la vez
+        self._lock = threading.Lock()         # cola de precarga
+        self._prewarm_queue: List[int] = []
+        self._prewarm_thread: Optional[threading.Thread] = None
+        self._fingerprint: Optional[str] = None
+        self.scenes = SceneList(self)
+
+        self._setup_cabins()
+        self._setup_crafting_stations()
+
+    def _make_scene(self, scene_id: int, land: RGBA) -> Scene:
+        size = Vec2(self.scene_w, self.scene_h)
+        spawn = Vec2(self.scene_w * 0.5, self.scene_h * 0.5)
+        return Scene(scene_id, size, land, spawn, land_color=land)
+
+    def scene_center(self, scene: Scene) -> Vec2:
+        return Vec2(scene.size.x * 0.5, scene.size.y * 0.5)
+
+    # ----- Escenas perezosas -----
+
+    @property
+    def scene_count(self) -> int:
+        return len(self._defs)
+
+    def get_scene(self, index: int) -> Scene:
+        """Escena 'index' (0-based); se construye la primera vez que se pide."""
+        scene = self._built.get(index)
+        if scene is not None:
+            return scene
+        if not 0 <= index < len(self._defs):
+            raise IndexError(f"[world_manager] Escena fuera de rango: {index}")
+        with self._build_lock:
+            scene = self._built.get(index)
+            if scene is None:
+                scene = self._build_scene(index)
+                self._built[index] = scene
+        return scene
+
+    def is_built(self, index: int) -> bool:
+        return index in self._built
+
+    def prewarm(self, indices: Iterable[int]) -> None:
+        """Construye en segundo plano las escenas indicadas que falten."""
+        with self._lock:
+            for i in indices:
+                if 0 <= i < len(self._defs) and i not in self._built and i not in self._prewarm_queue:
+                    self._prewarm_queue.append(i)
+            if not self._prewarm_queue:
+                return
+            if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+                return
+            self._prewarm_thread = threading.Thread(
+                target=self._prewarm_worker, name="scene-prewarm", daemon=True
+            )
+            self._prewarm_thread.start()
+
+    def _prewarm_worker(self) -> None:
+        while True:
+            with self._lock:
+                if not self._prewarm_queue:
+                    return
+                index = self._prewarm_queue.pop(0)
+            try:
+                self.get_scene(index)
+            except Exception as e:
+                print("[world_manager] Aviso: no se pudo precargar la escena", index + 1, e)
+
+    def _scene_defs(self) -> List[Tuple[int, RGBA, Optional[Callable[[], list]]]]:
+        LOCAL_LAND   = RGBA(128, 178, 112, 255)
+        ALASKA_LAND  = RGBA(100, 142, 120, 255)
+        PPR_LAND     = RGBA(160, 175,  90, 255)
+        MICH_LAND    = RGBA( 92, 150, 110, 255)
+
+        # (scene_id, color de tierra, generador del polígono normalizado)
+        return [
+            (1, LOCAL_LAND, None),
+            (2, ALASKA_LAND, zone2_alaska_polygon),
+            (3, PPR_LAND, zone3_ppr_polygon),
+            (4, MICH_LAND, zone4_michigan_polygon),
+        ]
+
+    def _build_scene(self, index: int) -> Scene:
+        scene_id, land, polygon_fn = self._defs[index]
+        if polygon_fn is None:
+            return self._make_scene(scene_id, land)
+
+        cell = 48
+        size = Vec2(self.scene_w, self.scene_h)
+        spawn = Vec2(self.scene_w * 0.5, self.scene_h * 0.5)
+        cached = self._load_cached(scene_id, cell)
+        if cached is not None:
+            polygon_norm, blocked = cached
+            return Scene(scene_id, size, land, spawn,
+                         grid_cell_size=cell, grid_enabled=True,
+                         polygon_norm=polygon_norm, land_color=land,
+                         blocked_cells=blocked)
+
+        polygon_norm = polygon_fn()
+        scene = Scene(scene_id, size, land, spawn,
+                      grid_cell_size=cell, grid_enabled=True,
+                      polygon_norm=polygon_norm, land_color=land)
+        self._store_cached(scene_id, cell, polygon_norm, scene)
+        return scene
+
+    # ----- Caché en disco -----
+
+    def _cache_path(self, scene_id: int, cell: int) -> str:
+        return os.path.join(self.cache_dir, f"scene{scene_id}_{self.scene_w}x{self.scene_h}_{cell}.json")
+
+    def _geometry_fingerprint(self) -> str:
+        if self._fingerprint is None:
+            h = hashlib.sha1(str(SCENE_CACHE_VERSION).encode())
+            here = os.path.dirname(os.path.abspath(__file__))
+            for name in _GEOMETRY_SOURCES:
+                try:
+                    with open(os.path.join(here, name), "rb") as f:
+                        h.update(f.read())
+                except OSError:
+                    h.update(name.encode())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def _load_cached(self, scene_id: int, cell: int) -> Optional[Tuple[list, Set[Tuple[int, int]]]]:
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(scene_id, cell)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") != self._geometry_fingerprint():
+                return None
+            cols, rows = int(data["cols"]), int(data["rows"])
+            bits = base64.b64decode(data["blocked"])
+            blocked: Set[Tuple[int, int]] = set()
+            for i in range(cols * rows):
+                if bits[i >> 3] & (1 << (i & 7)):
+                    blocked.add((i % cols, i // cols))
+            polygon_norm = [(float(x), float(y)) for x, y in data["polygon_norm"]]
+            return polygon_norm, blocked
+        except Exception as e:
+            print("[world_manager] Aviso: caché de escena inválida, se regenera:", e)
+            return None
+
+    def _store_cached(self, scene_id: int, cell: int, polygon_norm: list, scene: Scene) -> None:
+        cm = scene.collision_map
+        if not self.cache_dir or cm is None or cm.cols is None or cm.rows is None:
+            return
+        cols, rows = cm.cols, cm.rows
+        bits = bytearray((cols * rows + 7) // 8)
+        for c, r in cm.blocked:
+            i = r * cols + c
+            bits[i >> 3] |= 1 << (i & 7)
+        data = {
+            "fingerprint": self._geometry_fingerprint(),
+            "cols": cols,
+            "rows": rows,
+            "polygon_norm": [[float(p[0]), float(p[1])] for p in polygon_norm],
+            "blocked": base64.b64encode(bytes(bits)).decode("ascii"),
+        }
+        path = self._cache_path(scene_id, cell)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("[world_manager] Aviso: no se pudo guardar la caché de escena:", e)
+
+    def _setup_cabins(self) -> None:
+        # Lógica original para inicializar self.cabins
+        pass
+
+    def _setup_crafting_stations(self) -> None:
+        # Lógica original para inicializar workbenches y furnaces
+        pass
@@ -93,12 +93,12 @@ def _make_coast_shape(
     - Ventana direccional para enfatizar una región (fiordos, península)
     - Suavizado leve (Chaikin) y normalización 0..1
     """
-    random.seed(seed)
+    rng = random.Random(seed)  # propio: no toca el RNG global de la simulación
     twopi = 2.0 * math.pi
 
     # Fases aleatorias estables por seed
-    base_phases  = [random.uniform(0, twopi) for _ in base_freqs]
-    detail_phases= [random.uniform(0, twopi) for _ in detail_freqs]
+    base_phases  = [rng.uniform(0, twopi) for _ in base_freqs]
+    detail_phases= [rng.uniform(0, twopi) for _ in detail_freqs]
 
     # Amplitudes base (disminuyen con la frecuencia)
     base_amps   = [base_amp  / (i + 1) for i in range(len(base_freqs))]